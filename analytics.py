@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+채용 추세 집계: 공고 저장소(posting_store)의 변경 로그를 미리 집계해 둔 롤업 테이블 (/api/stats/*).
+
+- rollup_daily  (day, source):  added/changed/reopened/closed 건수, 그날 끝의 열린 공고 수(open)
+- rollup_weekly (week, source): 같은 건수 + 공고 기간(end_dt - start_dt) 합계/건수, 게시 기간(closed - first_seen) 합계/건수
+  week는 그 주 월요일 날짜(KST), day도 KST 날짜.
+- refresh(): changes.seq 커서 이후의 변경만 읽어 더한다 (같은 postings.db, 한 트랜잭션).
+  게시할 때마다(normalize_jobs.normalize_into) 부르고, 빠뜨린 게시가 있어도 다음 refresh가 이어서 센다.
+  open은 직전까지 센 값에서 added + reopened - closed 를 날짜 순으로 이어 더해 변경이 있던 날/주마다 채운다.
+  rebuild()는 롤업을 지우고 변경 로그 처음부터 다시 센다.
+- 조회는 롤업 테이블(사이트 × 날짜 수만큼의 행)만 읽는다. "이번 주 마감"은 열린 공고를 end_dt 인덱스로 센다.
+  서버는 결과를 jobs_api의 QueryCache에 데이터 버전별로 담는다.
+
+    python analytics.py refresh | rebuild
+    python analytics.py weekly
+"""
+import sys, json, time, threading
+from datetime import date, datetime, timezone, timedelta
+
+import posting_store
+
+KST = timezone(timedelta(hours=9))
+
+COUNTS = ("added", "changed", "reopened", "closed")
+WEEKLY_EXTRA = ("window_n", "window_days", "listed_n", "listed_days")
+DAY_SEC = 86400
+
+
+_local = threading.local()
+
+
+def connect():
+    """posting_store 연결 + 롤업 테이블 (연결마다 한 번만 만든다)"""
+    conn = posting_store.connect()
+    if getattr(_local, "conn", None) is conn:
+        return conn
+    counts = "".join(f" {c} INTEGER NOT NULL DEFAULT 0," for c in COUNTS)
+    conn.execute(f"CREATE TABLE IF NOT EXISTS rollup_daily (day TEXT NOT NULL, source TEXT NOT NULL,{counts}"
+                 " open INTEGER, PRIMARY KEY (day, source))")
+    conn.execute(f"CREATE TABLE IF NOT EXISTS rollup_weekly (week TEXT NOT NULL, source TEXT NOT NULL,{counts}"
+                 " open INTEGER, window_n INTEGER NOT NULL DEFAULT 0, window_days REAL NOT NULL DEFAULT 0,"
+                 " listed_n INTEGER NOT NULL DEFAULT 0, listed_days REAL NOT NULL DEFAULT 0,"
+                 " PRIMARY KEY (week, source))")
+    conn.execute("CREATE TABLE IF NOT EXISTS rollup_state (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+    _local.conn = conn
+    return conn
+
+
+def _day(ts):
+    return datetime.fromtimestamp(ts, KST).date()
+
+
+def _week(d):
+    return (d - timedelta(days=d.weekday())).isoformat()
+
+
+def _window_days(posting):
+    """정규화된 start_dt/end_dt(ISO, KST)로 공고 기간(일). 둘 중 하나라도 없으면 None"""
+    try:
+        start, end = datetime.fromisoformat(posting["start_dt"]), datetime.fromisoformat(posting["end_dt"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return (end - start).total_seconds() / DAY_SEC if end >= start else None
+
+
+# 🔹 갱신
+
+def refresh(batch=5000):
+    """커서 이후 변경을 롤업에 더한다 → 반영한 변경 수"""
+    conn = connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT value FROM rollup_state WHERE name = 'last_seq'").fetchone()
+        last_seq = row[0] if row else 0
+        daily, weekly, total = {}, {}, 0
+        while True:
+            rows = conn.execute(
+                "SELECT c.seq, c.ts, c.source, c.kind, c.data, p.first_seen FROM changes c"
+                " LEFT JOIN postings p ON p.id = c.posting_id WHERE c.seq > ? ORDER BY c.seq LIMIT ?",
+                (last_seq, batch)
+            ).fetchall()
+            for seq, ts, source, kind, data, first_seen in rows:
+                d = _day(ts)
+                day = daily.setdefault((d.isoformat(), source), dict.fromkeys(COUNTS, 0))
+                week = weekly.setdefault((_week(d), source), dict.fromkeys(COUNTS + WEEKLY_EXTRA, 0))
+                day[kind] += 1
+                week[kind] += 1
+                if kind == "added":
+                    days = _window_days(json.loads(data).get("posting") or {})
+                    if days is not None:
+                        week["window_n"] += 1
+                        week["window_days"] += days
+                elif kind == "closed" and first_seen is not None:
+                    week["listed_n"] += 1
+                    week["listed_days"] += max(0.0, ts - first_seen) / DAY_SEC
+                last_seq = seq
+            total += len(rows)
+            if len(rows) < batch:
+                break
+
+        conn.executemany(
+            f"INSERT INTO rollup_daily (day, source, {', '.join(COUNTS)}) VALUES (?, ?, {', '.join('?' * len(COUNTS))})"
+            f" ON CONFLICT(day, source) DO UPDATE SET {', '.join(f'{c} = {c} + excluded.{c}' for c in COUNTS)}",
+            [(day, source, *(v[c] for c in COUNTS)) for (day, source), v in daily.items()]
+        )
+        cols = COUNTS + WEEKLY_EXTRA
+        conn.executemany(
+            f"INSERT INTO rollup_weekly (week, source, {', '.join(cols)}) VALUES (?, ?, {', '.join('?' * len(cols))})"
+            f" ON CONFLICT(week, source) DO UPDATE SET {', '.join(f'{c} = {c} + excluded.{c}' for c in cols)}",
+            [(week, source, *(v[c] for c in cols)) for (week, source), v in weekly.items()]
+        )
+        # 열린 공고 수: 사이트마다 마지막으로 센 값(없으면 0)에서 날짜 순으로 added + reopened - closed 를 더해
+        # 변경이 있던 날/주마다 그날/그 주 끝의 값으로. 사이트의 마지막 날은 저장소에서 센 실제 값으로 맞춘다
+        open_daily, running, last_day = {}, {}, {}
+        for day, source in sorted(daily):
+            if source not in running:
+                row = conn.execute(
+                    "SELECT open FROM rollup_daily WHERE source = ? AND day <= ? AND open IS NOT NULL"
+                    " ORDER BY day DESC LIMIT 1", (source, day)
+                ).fetchone()
+                running[source] = row[0] if row else 0
+            v = daily[(day, source)]
+            running[source] += v["added"] + v["reopened"] - v["closed"]
+            open_daily[(day, source)] = running[source]
+            last_day[source] = day
+        for source, day in last_day.items():
+            open_daily[(day, source)] = conn.execute(
+                "SELECT COUNT(*) FROM postings WHERE source = ? AND closed_at IS NULL", (source,)
+            ).fetchone()[0]
+        open_weekly = {(_week(date.fromisoformat(day)), source): n for (day, source), n in sorted(open_daily.items())}
+        conn.executemany("UPDATE rollup_daily SET open = ? WHERE day = ? AND source = ?",
+                         [(n, day, source) for (day, source), n in open_daily.items()])
+        conn.executemany("UPDATE rollup_weekly SET open = ? WHERE week = ? AND source = ?",
+                         [(n, week, source) for (week, source), n in open_weekly.items()])
+        conn.execute(
+            "INSERT INTO rollup_state (name, value) VALUES ('last_seq', ?)"
+            " ON CONFLICT(name) DO UPDATE SET value = excluded.value", (last_seq,)
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return total
+
+
+def rebuild():
+    """롤업을 비우고 변경 로그 처음부터 다시 센다 → 반영한 변경 수"""
+    conn = connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM rollup_daily")
+        conn.execute("DELETE FROM rollup_weekly")
+        conn.execute("DELETE FROM rollup_state")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return refresh()
+
+
+# 🔹 조회 (/api/stats/<name>)
+
+def _where(sources, col, since):
+    sql, params = f" WHERE {col} >= ?", [since]
+    if sources:
+        sql += f" AND source IN ({','.join('?' * len(sources))})"
+        params += list(sources)
+    return sql, params
+
+
+def weekly(sources=None, weeks=12):
+    """사이트별 주간 새 공고/내려간 공고/열린 공고 수 (최근 weeks주)"""
+    since = _week(datetime.now(KST).date() - timedelta(weeks=weeks - 1))
+    where, params = _where(sources, "week", since)
+    rows = connect().execute(
+        f"SELECT week, source, added, reopened, closed, open FROM rollup_weekly{where} ORDER BY week, source", params
+    ).fetchall()
+    return [{"week": w, "source": s, "added": a, "reopened": r, "closed": c, "open": o} for w, s, a, r, c, o in rows]
+
+
+def daily(sources=None, days=30):
+    """사이트별 일간 새 공고/바뀐 공고/내려간 공고 수 (최근 days일)"""
+    since = (datetime.now(KST).date() - timedelta(days=days - 1)).isoformat()
+    where, params = _where(sources, "day", since)
+    rows = connect().execute(
+        f"SELECT day, source, added, changed, reopened, closed, open FROM rollup_daily{where} ORDER BY day, source",
+        params
+    ).fetchall()
+    return [{"day": d, "source": s, "added": a, "changed": ch, "reopened": r, "closed": c, "open": o}
+            for d, s, a, ch, r, c, o in rows]
+
+
+def windows(sources=None, weeks=12):
+    """사이트별 평균 공고 기간(시작~마감, 일)과 평균 게시 기간(처음 본 때~내려간 때, 일) (최근 weeks주에 올라온/내려간 공고)"""
+    since = _week(datetime.now(KST).date() - timedelta(weeks=weeks - 1))
+    where, params = _where(sources, "week", since)
+    rows = connect().execute(
+        f"SELECT source, SUM(window_n), SUM(window_days), SUM(listed_n), SUM(listed_days) FROM rollup_weekly{where}"
+        " GROUP BY source ORDER BY source", params
+    ).fetchall()
+    return [{"source": s, "window_n": wn, "avg_window_days": round(wd / wn, 1) if wn else None,
+             "listed_n": ln, "avg_listed_days": round(ld / ln, 1) if ln else None}
+            for s, wn, wd, ln, ld in rows]
+
+
+def closing(sources=None):
+    """이번 주(오늘 ~ 일요일) 마감하는 열린 공고 수 (사이트별)"""
+    today = datetime.now(KST).replace(hour=0, minute=0, second=0, microsecond=0)
+    end = today + timedelta(days=7 - today.weekday())
+    sql, params = ("SELECT source, COUNT(*) FROM postings WHERE closed_at IS NULL AND end_dt >= ? AND end_dt < ?",
+                   [today.isoformat(timespec="seconds"), end.isoformat(timespec="seconds")])
+    if sources:
+        sql += f" AND source IN ({','.join('?' * len(sources))})"
+        params += list(sources)
+    rows = connect().execute(sql + " GROUP BY source ORDER BY source", params).fetchall()
+    return {"from": today.date().isoformat(), "until": (end.date() - timedelta(days=1)).isoformat(),
+            "items": [{"source": s, "closing": n} for s, n in rows]}
+
+
+STATS = {"weekly": weekly, "daily": daily, "windows": windows, "closing": closing}
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "refresh"
+    if cmd in ("refresh", "rebuild"):
+        started = time.time()
+        n = refresh() if cmd == "refresh" else rebuild()
+        print(f"📊 변경 {n}건 반영 ({time.time() - started:.2f}초)")
+    elif cmd in STATS:
+        print(json.dumps(STATS[cmd](), ensure_ascii=False, indent=2))
+    else:
+        print(f"사용법: python analytics.py [refresh | rebuild | {' | '.join(STATS)}]")
+        sys.exit(1)
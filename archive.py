@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+공고 스냅샷 아카이브: 게시한 정규화 스냅샷을 월·사이트별 파티션의 압축 컬럼 파일로 쌓는다 (추세 분석용).
+
+    archive/
+      source=amc/month=2026-10/
+        2026-10-19.parquet        ← 그날 스냅샷에서 바뀐 행만 (하루에 여러 번 게시되면 같은 파일에 이어 쓴다)
+        2026-09.parquet           ← 지난 달은 compact()가 한 파일로 합친다 (month=2026-09 아래)
+      _state/amc.json             ← 마지막으로 기록한 공고별 내용 해시 (중복 제거용)
+
+- 행: date, source, id, title, start_dt, end_dt, detail_url, closed, hash.
+  새로 올라왔거나 내용(posting_store.CHANGE_FIELDS)이 바뀐 공고만 쓰고, 내려간 공고는 closed=True 한 행.
+  매달 첫 기록은 열린 공고 전체를 다시 쓴다 → 어느 날의 스냅샷이든 그 달 파티션 하나만 읽으면 복원된다
+  (그 달 첫 기록 전이면 그 이전 마지막 달 파티션의 마지막 상태).
+- pyarrow가 있으면 Parquet(zstd), 없으면 같은 컬럼 구조의 gzip JSON(.json.gz)으로 쓴다 (읽을 때는 둘 다 읽는다).
+- load()는 필요한 컬럼·사이트·기간의 파티션만 읽어 {컬럼: [값, ...]} 로, load_frame()은 pandas DataFrame으로.
+- ARCHIVE_KEEP_MONTHS(기본 36)개월보다 오래된 월 파티션은 prune()이 지운다.
+- 게시할 때(normalize_jobs.normalize_into) 사이트마다 append_site()를 부른다. 실패해도 게시는 계속한다.
+
+    python archive.py stats
+    python archive.py append normalized/              # 지금 게시된 파일로 채우기
+    python archive.py snapshot 2026-10-01 [사이트 ...]
+    python archive.py maintain                        # 지난 달 합치기 + 보존 기간 지난 파티션 삭제
+"""
+import os, sys, json, gzip, glob, time, shutil, hashlib
+from datetime import datetime, timezone, timedelta
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 선택 의존성: 없으면 gzip JSON으로 대체
+    pa = pq = None
+
+from posting_store import CHANGE_FIELDS
+
+KST = timezone(timedelta(hours=9))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+STATE_DIR = os.path.join(ARCHIVE_DIR, "_state")
+KEEP_MONTHS = int(os.getenv("ARCHIVE_KEEP_MONTHS", "36"))
+COLUMNS = ("date", "source", "id") + CHANGE_FIELDS + ("closed", "hash")
+EXT = ".parquet" if pq is not None else ".json.gz"
+
+
+# 🔹 파일 읽기/쓰기 (Parquet 또는 gzip JSON, 둘 다 {컬럼: [값, ...]})
+
+def _write(path, cols):
+    tmp = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    if path.endswith(".parquet"):
+        pq.write_table(pa.table(cols), tmp, compression="zstd")
+    else:
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(cols, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _read(path, columns=None):
+    if path.endswith(".parquet"):
+        if pq is None:
+            raise RuntimeError(f"pyarrow가 없어 읽을 수 없음: {path}")
+        return pq.read_table(path, columns=list(columns) if columns else None).to_pydict()
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        cols = json.load(f)
+    return {c: cols[c] for c in columns} if columns else cols
+
+
+def _concat(parts, columns):
+    out = {c: [] for c in columns}
+    for part in parts:
+        for c in columns:
+            out[c].extend(part[c])
+    return out
+
+
+def _partition(source, month):
+    return os.path.join(ARCHIVE_DIR, f"source={source}", f"month={month}")
+
+
+def _files(path):
+    return sorted(glob.glob(os.path.join(path, "*.parquet")) + glob.glob(os.path.join(path, "*.json.gz")))
+
+
+def _stem(path):
+    return os.path.basename(path).split(".", 1)[0]  # 2026-10-19 (하루) 또는 2026-10 (합친 달)
+
+
+# 🔹 쓰기
+
+def row_hash(rec):
+    text = json.dumps([rec.get(f) for f in CHANGE_FIELDS], ensure_ascii=False)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _load_state(site):
+    try:
+        with open(os.path.join(STATE_DIR, f"{site}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(site, state):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    path = os.path.join(STATE_DIR, f"{site}.json")
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def append_site(site, records, now=None):
+    """site 스냅샷(정규화 레코드 목록)에서 바뀐 행만 그날 파일에 덧붙인다 → 쓴 행 수"""
+    day = datetime.fromtimestamp(now or time.time(), KST).date().isoformat()
+    month = day[:7]
+    state = _load_state(site)
+    hashes = (state.get("hashes") or {}) if state.get("month") == month else {}  # 달이 바뀌면 전체를 다시 쓴다
+    cols = {c: [] for c in COLUMNS}
+
+    def add(pid, rec, closed, h):
+        for c, v in zip(COLUMNS, (day, site, pid) + tuple(rec.get(f) for f in CHANGE_FIELDS) + (closed, h)):
+            cols[c].append(v)
+
+    current = {}
+    for rec in records:
+        pid = rec.get("id")
+        if not pid or pid in current:
+            continue
+        current[pid] = h = row_hash(rec)
+        if hashes.get(pid) != h:
+            add(pid, rec, False, h)
+    for pid in hashes.keys() - current.keys():
+        add(pid, {}, True, None)
+
+    written = len(cols["id"])
+    if written:
+        path_dir = _partition(site, month)
+        os.makedirs(path_dir, exist_ok=True)
+        path = os.path.join(path_dir, f"{day}{EXT}")
+        if os.path.exists(path):  # 같은 날 다시 게시 → 이어 쓴다 (하루 파일은 작다)
+            cols = _concat([_read(path, COLUMNS), cols], COLUMNS)
+        _write(path, cols)
+    _save_state(site, {"month": month, "hashes": current})
+    return written
+
+
+# 🔹 읽기
+
+def sources():
+    return sorted(name[len("source="):] for name in os.listdir(ARCHIVE_DIR)
+                  if name.startswith("source=")) if os.path.isdir(ARCHIVE_DIR) else []
+
+
+def partition_files(sites=None, start=None, end=None):
+    """조건에 맞는 파일만 (사이트, 월 디렉터리 이름, 파일 이름 날짜로 거른다). start/end는 'YYYY-MM-DD'"""
+    files = []
+    for site in sites or sources():
+        for month_dir in sorted(glob.glob(os.path.join(ARCHIVE_DIR, f"source={site}", "month=*"))):
+            month = month_dir.rsplit("=", 1)[1]
+            if (start and month < start[:7]) or (end and month > end[:7]):
+                continue
+            for path in _files(month_dir):
+                stem = _stem(path)
+                if len(stem) == 10 and ((start and stem < start) or (end and stem > end)):
+                    continue
+                files.append(path)
+    return files
+
+
+def load(columns=None, sites=None, start=None, end=None):
+    """아카이브 행 {컬럼: [값, ...]} — 필요한 컬럼·파티션만 읽는다 (합친 달 파일은 행 단위로 기간을 다시 거른다)"""
+    columns = tuple(columns or COLUMNS)
+    wanted = columns + (("date",) if (start or end) and "date" not in columns else ())
+    parts = []
+    for path in partition_files(sites, start, end):
+        part = _read(path, wanted)
+        if (start or end) and len(_stem(path)) == 7:
+            keep = [i for i, d in enumerate(part["date"]) if (not start or d >= start) and (not end or d <= end)]
+            part = {c: [part[c][i] for i in keep] for c in wanted}
+        parts.append(part)
+    return _concat(parts, columns)
+
+
+def load_frame(columns=None, sites=None, start=None, end=None):
+    """load()와 같은 행을 pandas DataFrame으로 (pandas 필요)"""
+    import pandas as pd
+    columns = tuple(columns or COLUMNS)
+    return pd.DataFrame(load(columns, sites, start, end), columns=list(columns))
+
+
+def _months(site, until):
+    """site의 월 파티션 이름 (until 이하, 최근 달부터)"""
+    months = [d.rsplit("=", 1)[1] for d in glob.glob(os.path.join(ARCHIVE_DIR, f"source={site}", "month=*"))]
+    return sorted((m for m in months if m <= until), reverse=True)
+
+
+def snapshot(day, sites=None, columns=None):
+    """day('YYYY-MM-DD') 당시 열려 있던 공고 [dict, ...] — 사이트마다 그 달 파티션만 읽는다.
+    그 달에 day까지의 기록이 없으면(그 달 첫 게시 전) 그 이전 마지막 달의 마지막 상태를 이어 쓴다"""
+    columns = tuple(columns or ("source", "id") + CHANGE_FIELDS)
+    wanted = tuple(dict.fromkeys(("date", "id", "closed") + columns))
+    out = []
+    for site in sites or sources():
+        for month in _months(site, day[:7]):
+            rows = load(wanted, [site], start=f"{month}-01", end=min(day, f"{month}-31"))
+            if rows["id"]:
+                break
+        else:
+            continue  # day까지 기록이 없는 사이트
+        latest = {}
+        # 파일은 날짜 순, 같은 날 안에서는 쓴 순서 → 마지막 행이 그날의 상태
+        for i, pid in enumerate(rows["id"]):
+            latest[pid] = i
+        out.extend({c: rows[c][i] for c in columns} for i in latest.values() if not rows["closed"][i])
+    return out
+
+
+# 🔹 관리
+
+def compact(before_month=None):
+    """지난 달(before_month 이전) 파티션의 하루 파일들을 한 파일로 합친다 → 합친 파티션 수"""
+    before_month = before_month or datetime.now(KST).strftime("%Y-%m")
+    merged = 0
+    for site in sources():
+        for month_dir in glob.glob(os.path.join(ARCHIVE_DIR, f"source={site}", "month=*")):
+            month = month_dir.rsplit("=", 1)[1]
+            files = _files(month_dir)
+            if month >= before_month or len(files) < 2 and all(len(_stem(p)) == 7 for p in files):
+                continue
+            cols = _concat([_read(p, COLUMNS) for p in files], COLUMNS)
+            target = os.path.join(month_dir, f"{month}{EXT}")
+            _write(target, cols)
+            for p in files:
+                if p != target:
+                    os.remove(p)
+            merged += 1
+    return merged
+
+
+def prune(keep_months=KEEP_MONTHS):
+    """보존 기간보다 오래된 월 파티션 삭제 → 지운 파티션 수"""
+    now = datetime.now(KST)
+    y, m = divmod(now.year * 12 + now.month - 1 - keep_months, 12)
+    cutoff = f"{y:04d}-{m + 1:02d}"
+    removed = 0
+    for month_dir in glob.glob(os.path.join(ARCHIVE_DIR, "source=*", "month=*")):
+        if month_dir.rsplit("=", 1)[1] < cutoff:
+            shutil.rmtree(month_dir, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def stats():
+    """사이트별 {months, files, bytes}"""
+    out = {}
+    for site in sources():
+        files = partition_files([site])
+        months = {os.path.basename(os.path.dirname(p)).split("=", 1)[1] for p in files}
+        out[site] = {"months": len(months), "files": len(files), "bytes": sum(os.path.getsize(p) for p in files)}
+    return out
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if cmd == "stats":
+        print(f"📚 {ARCHIVE_DIR} ({'Parquet' if pq is not None else 'gzip JSON (pyarrow 없음)'})")
+        for site, s in stats().items():
+            print(f"  {site:<16} {s['months']:>3}개월  파일 {s['files']:>4}개  {s['bytes'] / 1024:.0f}KB")
+    elif cmd == "append" and len(sys.argv) > 2:
+        for fp in sorted(glob.glob(os.path.join(sys.argv[2], "*.json"))):
+            site = _stem(fp)
+            with open(fp, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, list):
+                print(f"✅ {site}: {append_site(site, data, os.path.getmtime(fp))}행")
+    elif cmd == "snapshot" and len(sys.argv) > 2:
+        rows = snapshot(sys.argv[2], sys.argv[3:] or None)
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        print(f"📅 {sys.argv[2]}: 열린 공고 {len(rows)}건")
+    elif cmd == "maintain":
+        print(f"🗜️ 합친 파티션 {compact()}개, 🧹 지운 파티션 {prune()}개")
+    else:
+        print("사용법: python archive.py [stats | append <폴더> | snapshot <YYYY-MM-DD> [사이트 ...] | maintain]")
+        sys.exit(1)
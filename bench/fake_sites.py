@@ -0,0 +1,373 @@
+# -*- coding: utf-8 -*-
+"""
+병원 채용 사이트 흉내 서버: 네트워크 없이 run_all.py 전체(Selenium 사이트 포함)를 돌려 보는 용도.
+
+    python bench/fake_sites.py --latency 0.3 --error-rate 0.05
+    SITE_BASE_OVERRIDE=state/fake_sites.json python src/run_all.py
+
+- 사이트마다 포트 하나씩(--port부터 차례로) 띄우고 {사이트 id: http://127.0.0.1:<포트>} 를
+  state/fake_sites.json 에 쓴다. 스크래퍼는 crawl_hooks.site_url()로 host만 바꿔 같은 경로로 요청한다.
+- 페이지는 각 스크래퍼의 선택자에 맞춘 HTML. 공고는 접수중 → 마감 순이라 '마감을 만나면 중단' 흐름도 그대로 탄다.
+  페이지 번호: cPage(samsung), pageIndex(seoul, mokdong, amc), p(cmcseoul), page(다음/번호 링크를 누르는 사이트).
+  recruiter.co.kr 계열은 #pageSize 셀렉트(바꾸면 ?pageSize= 로 다시 로드)도 흉내 낸다.
+- --fixtures 디렉터리에 기록해 둔 페이지(<사이트>/list-001.html ...)가 있으면 그 HTML을 대신 내보낸다.
+- 지연(--latency, --jitter, --site-latency amc=3), 오류 주입(--error-rate, --error-status),
+  사이트별 초당 요청 제한(--rate, 넘으면 429)을 줄 수 있다.
+"""
+import os, sys, json, time, random, signal, argparse, threading
+from collections import deque
+from datetime import datetime, timezone, timedelta
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+import crawl_state  # noqa: E402
+
+KST = timezone(timedelta(hours=9))
+MAP_PATH = os.path.join(crawl_state.STATE_DIR, "fake_sites.json")
+WEEKDAYS = "월화수목금토일"
+
+
+# 🔹 가짜 공고
+
+def make_postings(site, total, open_count, today):
+    """접수중 open_count건 → 마감 나머지 순서의 공고 목록"""
+    postings = []
+    for i in range(total):
+        is_open = i < open_count
+        if is_open:
+            start = today - timedelta(days=i % 7)
+            end = today + timedelta(days=3 + i % 20)
+        else:
+            end = today - timedelta(days=1 + i - open_count)
+            start = end - timedelta(days=14)
+        postings.append({
+            "n": i + 1, "sn": 100000 + i, "open": is_open, "start": start, "end": end,
+            "title": f"{site} 채용 공고 {i + 1:03d}",
+        })
+    return postings
+
+
+def ymd(d, sep="-"):
+    return d.strftime(f"%Y{sep}%m{sep}%d")
+
+
+def kdate(d):
+    """2026.10.01(수)"""
+    return f"{ymd(d, '.')}({WEEKDAYS[d.weekday()]})"
+
+
+def dday(p, today):
+    return f"D-{(p['end'] - today).days}" if p["open"] else "마감"
+
+
+def _doc(body):
+    return f'<!DOCTYPE html>\n<html lang="ko"><head><meta charset="utf-8"><title>채용</title></head><body>{body}</body></html>'
+
+
+# 🔹 사이트별 리스트 HTML (각 스크래퍼의 선택자 기준)
+
+def render_samsung(items, ctx):
+    rows = "".join(
+        f'<tr><td>{p["n"]}</td><td>일반</td><td class="text-left">'
+        f'<a href="/home/recruit/recruitInfo/recruitNoticeView.do?seq={p["sn"]}">{escape(p["title"])}</a></td>'
+        f'<td>정규직</td><td>{ymd(p["start"], ".")}<br>~ {ymd(p["end"], ".")}</td>'
+        f'<td class="deadline-today">{dday(p, ctx["today"])}</td><td>{"진행중" if p["open"] else "마감"}</td></tr>'
+        for p in items)
+    return _doc(f'<div id="contents"><table><tbody>{rows}</tbody></table></div>')
+
+
+def render_seoul(items, ctx):
+    rows = "".join(
+        f'<tr><td>{p["n"]}</td><td class="alignL"><a href="/about/news/recruit/recruView.do?seq={p["sn"]}">'
+        f'{escape(p["title"])}</a></td><td>{ymd(p["start"])} ~ {ymd(p["end"])}</td><td>정규직</td>'
+        f'<td>{"접수중" if p["open"] else "마감"}</td></tr>'
+        for p in items)
+    return _doc(f'<div id="content"><div class="boardTypeTbl"><table><tbody>{rows}</tbody></table></div></div>')
+
+
+def render_gunguk(items, ctx):
+    divs = "".join(
+        f'<div><a href="/m/recruit/apply/noticeView.do?seq={p["sn"]}">'
+        f'<strong class="color01">{"접수중" if p["open"] else "마감"}</strong>'
+        f'<strong class="title">{escape(p["title"])}</strong>'
+        f'<div>{ymd(p["start"])} 09:00 ~ {ymd(p["end"])} 23:59</div></a></div>'
+        for p in items)
+    return _doc(f'<div id="proceeding">{divs}</div>')
+
+
+def render_khmc(items, ctx):
+    lis = "".join(
+        f'<li><div><span class="state">{"모집중" if p["open"] else "마감"}</span>'
+        f'<span class="title">{escape(p["title"])}</span><em>{ymd(p["start"], ".")} ~ {ymd(p["end"], ".")}</em>'
+        f'<a href="/khmc/job/view?sn={p["sn"]}">상세</a></div></li>'
+        for p in items)
+    return _doc('<div><div class="tamplet_container"><div class="inner-layout"><div class="list-item-box">'
+                f'<ul>{lis}</ul></div></div></div></div>')
+
+
+def render_eumc(items, ctx):
+    lis = "".join(
+        f'<li><a href="/intro/recrut/view.do?no={p["sn"]}"><div><strong>{escape(p["title"])}</strong>'
+        f'<div>{ymd(p["start"])} ~ {ymd(p["end"])}</div></div><em>{dday(p, ctx["today"])}</em></a></li>'
+        for p in items)
+    return _doc(f'<div id="content"><div><ul class="card-list">{lis}</ul></div></div>')
+
+
+def render_amc(items, ctx):
+    lis = "".join(
+        f'<li><div class="dayListTitle"><a href="#" onclick="fnDetail(\'{p["sn"]}\', \'{p["n"]}\')">'
+        f'<span>{escape(p["title"])}</span></a></div>'
+        f'<div class="dayListTitle2"><span>{kdate(p["start"])} 09:00 ~ {kdate(p["end"])} 18:00</span></div>'
+        f'<div class="dayListBoxRight"><span>{dday(p, ctx["today"])}</span></div></li>'
+        for p in items)
+    return _doc(f'<ul class="dayListBox">{lis}</ul>')
+
+
+LOCATIONS = ("신촌", "강남", "용인")
+
+
+def render_recruiter(items, ctx):
+    """recruiter.co.kr 잡공고 목록 (snubh, sebrance, caumc)"""
+    size = ctx["page_size"]
+    options = "".join(f'<option value="{v}"{" selected" if v == size else ""}>{v}개씩</option>' for v in (10, 20, 50, 100))
+    lis = "".join(
+        f'<li><div class="list-bbs-type">{LOCATIONS[p["n"] % len(LOCATIONS)]}</div>'
+        f'<div class="list-bbs-content"><h2 class="list-bbs-title"><span class="list-bbs-notice-name">'
+        f'<a href="/app/jobnotice/view?systemKindCode=MRS2&amp;jobnoticeSn={p["sn"]}">{escape(p["title"])}</a></span></h2>'
+        f'<span class="list-bbs-date">{kdate(p["start"])} 09:00 ~ {kdate(p["end"])} 23:59</span>'
+        f'<span class="list-bbs-dday">{dday(p, ctx["today"])}</span></div>'
+        f'<div class="list-bbs-status"><span>{"접수중" if p["open"] else "접수마감"}</span></div></li>'
+        for p in items)
+    nxt = (f'<a class="next" href="?pageSize={size}&amp;page={ctx["page"] + 1}">다음</a>'
+           if ctx["page"] < ctx["pages"] else "")
+    return _doc(f'<select id="pageSize" onchange="location.search=\'?pageSize=\'+this.value">{options}</select>'
+                f'<div id="divJobnoticeList"><ul>{lis}</ul></div><div class="pagination">{nxt}</div>')
+
+
+def render_kbsmc(items, ctx):
+    links = "".join(
+        f'<a href="/jsp/recruit/recruitView.jsp?idx={p["sn"]}"><li><div class="tit_flex">'
+        f'<div class="flex1"><div><p>{"의료기사직" if p["n"] % 2 else "간호직"}</p></div></div>'
+        f'<div class="flex2"><p>{"NEW" if p["open"] else "마감"}</p></div></div>'
+        f'<p class="txt18 mt40 mb30">{escape(p["title"])}</p>'
+        f'<div class="bt_txt"><div class="flex3"><p>{ymd(p["start"], ".")} ~ {ymd(p["end"], ".")}</p></div></div></li></a>'
+        for p in items)
+    nxt = f'<a class="pNext" href="?page={ctx["page"] + 1}">다음</a>' if ctx["page"] < ctx["pages"] else ""
+    return _doc(f'<div class="sub_0101_list on"><ul>{links}</ul></div><div id="pageZone">{nxt}</div>')
+
+
+HOSPITALS = ("안암병원", "구로병원", "안산병원")
+
+
+def render_recruit_list(items, ctx):
+    """recruiter.co.kr 커리어 홈 (kumc는 번호 페이지, hyumc는 한 페이지)"""
+    lis = "".join(
+        f'<li><a class="RecruitList_list-item__PzVZf" href="/career/job/{p["sn"]}">'
+        f'<span class="RecruitList_submission-status-tag__IXUxc">{"접수중" if p["open"] else "접수마감"}</span>'
+        f'<p class="RecruitList_title__OqWa3">{escape(p["title"])}</p>'
+        f'<div class="RecruitList_date__AkCNU"><p>{ymd(p["start"], ".")} 09:00 ~</p><p>{ymd(p["end"], ".")} 23:59</p></div>'
+        f'<div class="RecruitList_filtered-list__QSYUA"><div class="RecruitList_filtered-item__OglnX">'
+        f'<p>{HOSPITALS[p["n"] % len(HOSPITALS)]}</p></div></div></a></li>'
+        for p in items)
+    nums = "".join(f'<li><a href="?page={i}">{i}</a></li>' for i in range(1, ctx["pages"] + 1))
+    return _doc(f'<div class="RecruitList_recruit-list__FlKk4 PC"><ul>{lis}</ul></div>'
+                f'<div class="RecruitViewList_pagination__Img3k"><div class="Pagination_middle__fDE1y"><ol>{nums}</ol></div></div>')
+
+
+def render_cmcseoul(items, ctx):
+    lis = "".join(
+        f'<li><a href="/page/board/recruit/{p["sn"]}"><div class="cont_wrap">'
+        f'<div><div><span><em>{"진행중" if p["open"] else "마감"}</em></span></div></div>'
+        f'<strong class="tit">{escape(p["title"])}</strong>'
+        f'<p>접수기간 : {ymd(p["start"], ".")} ~ {ymd(p["end"], ".")}</p></div>'
+        f'<div class="info_wrap"><em class="data">{ymd(p["start"], ".")}</em></div></a></li>'
+        for p in items)
+    return _doc(f'<div id="vue_board_list_content"><div class="list-type01"><ul>{lis}</ul></div></div>')
+
+
+# 사이트 id → (스크립트 이름, 페이지 번호 파라미터, 페이지당 건수(None이면 한 페이지), 렌더러)
+SITES = {
+    "kbsmc": ("gangbuk", "page", 10, render_kbsmc),
+    "kumc": ("goryu", "page", 12, render_recruit_list),
+    "gunguk": ("gunguk", None, None, render_gunguk),
+    "khmc": ("gyunghee", None, None, render_khmc),
+    "hyumc": ("hanyang", None, None, render_recruit_list),
+    "caumc": ("jungang", "page", 10, render_recruiter),
+    "mokdong": ("mokdong", "pageIndex", 10, render_eumc),
+    "samsung": ("samsung", "cPage", 10, render_samsung),
+    "sebrance": ("sebrance", "page", 10, render_recruiter),
+    "seoul": ("seoul", "pageIndex", 10, render_seoul),
+    "amc": ("seoul_asan", "pageIndex", 10, render_amc),
+    "cmcseoul": ("sungmo", "p", 12, render_cmcseoul),
+    "seoul_mokdong": ("seoul_mokdong", None, None, render_eumc),
+    "snubh": ("bundang", "page", 10, render_recruiter),
+}
+RECRUITER_SITES = {"caumc", "sebrance", "snubh"}
+
+
+def render_page(site, query, cfg):
+    """쿼리 → (페이지 번호, HTML)"""
+    _, param, per_page, render = SITES[site]
+    today = datetime.now(KST).date()
+    postings = make_postings(site, cfg.postings, cfg.open, today)
+    if site == "mokdong" and query.get("bid_status") == ["I"]:
+        postings = [p for p in postings if p["open"]]  # 진행중만 보기
+
+    try:
+        page = max(1, int((query.get(param) or ["1"])[0])) if param else 1
+    except ValueError:
+        page = 1
+    if site in RECRUITER_SITES:
+        try:
+            per_page = int((query.get("pageSize") or [per_page])[0])
+        except ValueError:
+            pass
+
+    fixture = os.path.join(cfg.fixtures, site, f"list-{page:03d}.html") if cfg.fixtures else None
+    if fixture and os.path.exists(fixture):
+        with open(fixture, "r", encoding="utf-8") as f:
+            return page, f.read()
+
+    if per_page:
+        pages = max(1, -(-len(postings) // per_page))
+        items = postings[(page - 1) * per_page:page * per_page]
+    else:
+        pages, items = 1, postings
+    ctx = {"today": today, "page": page, "pages": pages, "page_size": per_page}
+    return page, render(items, ctx)
+
+
+# 🔹 서버
+
+class RateLimiter:
+    """최근 1초 요청 수가 rate를 넘으면 거절"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.hits = deque()
+        self.lock = threading.Lock()
+
+    def allow(self):
+        if not self.rate:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            while self.hits and now - self.hits[0] > 1.0:
+                self.hits.popleft()
+            if len(self.hits) >= self.rate:
+                return False
+            self.hits.append(now)
+            return True
+
+
+def make_handler(site, cfg, stats):
+    limiter = RateLimiter(cfg.rate)
+    latency = cfg.site_latency.get(site, cfg.latency)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/favicon.ico":
+                self.send_error(404)
+                return
+            stats[site]["requests"] += 1
+            if not limiter.allow():
+                stats[site]["throttled"] += 1
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.end_headers()
+                return
+            delay = max(0.0, latency + random.uniform(-cfg.jitter, cfg.jitter))
+            if delay:
+                time.sleep(delay)
+            if random.random() < cfg.error_rate:
+                stats[site]["errors"] += 1
+                self.send_error(cfg.error_status)
+                return
+            page, html = render_page(site, parse_qs(url.query), cfg)
+            body = html.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            if cfg.verbose:
+                print(f"  {site:<14} page={page:<3} {len(body):>7}B  {delay:.2f}s")
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def serve(cfg):
+    servers, mapping = [], {}
+    stats = {site: {"requests": 0, "throttled": 0, "errors": 0} for site in SITES}
+    for i, (site, (script, *_)) in enumerate(SITES.items()):
+        server = ThreadingHTTPServer((cfg.host, cfg.port + i), make_handler(site, cfg, stats))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f"fake-{site}", daemon=True).start()
+        servers.append(server)
+        url = f"http://{cfg.host}:{cfg.port + i}"
+        mapping[site] = mapping[script] = url  # 단독 실행(사이트 id 대신 스크립트 이름)도 찾도록
+        print(f"🌐 {site:<14} {url}")
+
+    os.makedirs(os.path.dirname(cfg.map_path), exist_ok=True)
+    with open(cfg.map_path, "w", encoding="utf-8") as f:
+        json.dump(mapping, f, ensure_ascii=False, indent=2)
+    print(f"📝 {os.path.relpath(cfg.map_path, ROOT_DIR)} → "
+          f"SITE_BASE_OVERRIDE={os.path.relpath(cfg.map_path, ROOT_DIR)} python src/run_all.py")
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # kill 로 끝내도 요약 출력
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # shutdown()은 서버마다 poll 주기만큼 기다리므로 한꺼번에
+        closers = [threading.Thread(target=server.shutdown) for server in servers]
+        for t in closers:
+            t.start()
+        for t in closers:
+            t.join()
+        print("📊 요청 / 429 / 오류")
+        for site, s in stats.items():
+            print(f"  {site:<14} {s['requests']:>6} {s['throttled']:>6} {s['errors']:>6}")
+
+
+def parse_site_latency(values):
+    out = {}
+    for v in values or []:
+        site, _, sec = v.partition("=")
+        out[site] = float(sec)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="병원 채용 사이트 흉내 서버")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8801, help="첫 사이트 포트 (사이트마다 +1)")
+    ap.add_argument("--postings", type=int, default=40, help="사이트별 공고 수")
+    ap.add_argument("--open", type=int, default=25, help="그중 접수중 공고 수 (앞쪽부터)")
+    ap.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="지연 ± 흔들림(초)")
+    ap.add_argument("--site-latency", action="append", metavar="SITE=SEC", help="사이트별 지연 (여러 번 가능)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    ap.add_argument("--error-status", type=int, default=503)
+    ap.add_argument("--rate", type=float, default=0, help="사이트별 초당 요청 한도 (넘으면 429, 0=무제한)")
+    ap.add_argument("--fixtures", help="기록한 페이지가 있으면 대신 내보낼 디렉터리 (예: bench/fixtures)")
+    ap.add_argument("--map", dest="map_path", default=MAP_PATH, help="사이트 → 주소 JSON 경로")
+    ap.add_argument("-v", "--verbose", action="store_true", help="요청마다 출력")
+    cfg = ap.parse_args()
+    cfg.site_latency = parse_site_latency(cfg.site_latency)
+    cfg.map_path = os.path.abspath(cfg.map_path)
+    serve(cfg)
+
+
+if __name__ == "__main__":
+    main()
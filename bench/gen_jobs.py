@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+normalize_jobs.py 입력(json/<사이트>.json)과 같은 모양의 가짜 공고 생성기.
+
+    python bench/gen_jobs.py 1m -o bench/data/jobs-1m.json
+    python bench/gen_jobs.py 10k --seed 7 -o /tmp/jobs.json
+
+스크래퍼들이 실제로 내보내는 모양을 섞는다:
+- start_dt/end_dt ISO(초 단위 / 분 단위), 없으면 period_text · date_text · period · date 로만 기간 제공
+- 기간 표기: 2026-10-01 ~ 2026-10-31, 2026.10.01 ~ 2026.10.31 23:59, 2026/10/01~2026/10/31,
+  2026.10.01(수) 09:00 ~ 2026.10.31(금) 23:59, 줄바꿈 섞인 표기, 시작일만
+- dday: D-3, D+2, D-0, 오늘, 마감, 상시, 숫자, 없음
+- 제목 키(title/subject/name), 링크 키(detail_url/url/link)가 바뀌거나 빠진 레코드, 스크래퍼별 부가 필드
+레코드는 한 건씩 파일에 바로 쓰므로 1천만 건도 메모리 걱정 없이 만든다.
+"""
+import os, sys, json, random, argparse
+from datetime import date, timedelta
+
+WEEKDAYS = "월화수목금토일"
+HOSTS = (
+    "https://www.samsunghospital.com", "https://www.snuh.org", "https://recruit.amc.seoul.kr",
+    "https://yuhs.recruiter.co.kr", "https://kumc.recruiter.co.kr", "https://www.cmcseoul.or.kr",
+)
+JOBS = ("간호사", "방사선사", "임상병리사", "약사", "물리치료사", "행정직", "전공의", "연구원", "보안요원", "영양사")
+KINDS = ("정규직", "계약직", "기간제", "시간선택제", "인턴")
+DEPTS = ("응급의학과", "소아청소년과", "내과", "외과", "영상의학과", "진단검사의학과", "원무팀", "약제부")
+
+
+def parse_count(text):
+    """'10k', '1m', '2500' → 정수"""
+    t = str(text).strip().lower().replace("_", "")
+    mult = {"k": 1_000, "m": 1_000_000}.get(t[-1:], 1)
+    return int(float(t[:-1] if mult > 1 else t) * mult)
+
+
+def _ymd(d, sep):
+    return d.strftime(f"%Y{sep}%m{sep}%d")
+
+
+def _kday(d):
+    return f"{_ymd(d, '.')}({WEEKDAYS[d.weekday()]})"
+
+
+def period_text(rng, start, end):
+    """스크래퍼마다 다른 기간 표기 중 하나"""
+    shape = rng.randrange(7)
+    if shape == 0:
+        return f"{_ymd(start, '-')} ~ {_ymd(end, '-')}"
+    if shape == 1:
+        return f"{_ymd(start, '.')} ~ {_ymd(end, '.')} 23:59"
+    if shape == 2:
+        return f"{_ymd(start, '/')}~{_ymd(end, '/')}"
+    if shape == 3:
+        return f"{_kday(start)} 09:00 ~ {_kday(end)} 23:59"
+    if shape == 4:
+        return f"{_ymd(start, '.')}\n~ {_ymd(end, '.')}"
+    if shape == 5:
+        return f"{_ymd(start, '-')} 10:00:00 ~ {_ymd(end, '-')} 18:00:00"
+    return _ymd(start, "-")  # 시작일만 (상시 채용 등)
+
+
+def dday_value(rng, today, end):
+    shape = rng.randrange(8)
+    if shape < 3 or end is None:
+        return None
+    if shape == 3:
+        d = (end - today).days
+        return f"D-{d}" if d >= 0 else f"D+{-d}"
+    return ("오늘", "마감", "상시", "D-0", 3)[shape - 4]
+
+
+def make_record(rng, i, today):
+    start = today + timedelta(days=rng.randint(-60, 10))
+    end = start + timedelta(days=rng.randint(3, 45)) if rng.random() > 0.05 else None
+    title = f"[{rng.choice(DEPTS)}] {rng.choice(JOBS)} {rng.choice(KINDS)} 채용 ({i})"
+    rec = {}
+
+    # 제목/링크 키 변형
+    key = rng.random()
+    if key < 0.9:
+        rec["title"] = title
+    elif key < 0.95:
+        rec["subject"] = title
+    elif key < 0.98:
+        rec["name"] = title
+    url = f"{rng.choice(HOSTS)}/recruit/view.do?seq={100000 + i}"
+    key = rng.random()
+    if key < 0.85:
+        rec["detail_url"] = url
+    elif key < 0.92:
+        rec["url"] = url
+    elif key < 0.97:
+        rec["link"] = url
+
+    # 날짜: ISO 직접 / 기간 문자열만 / 둘 다
+    shape = rng.randrange(6)
+    text = period_text(rng, start, end or start)
+    if shape in (0, 1):
+        # 초 단위(samsung, seoul ...) / 분 단위(kumc, hyumc, caumc ...)
+        start_time, end_time = ("09:00:00", "23:59:00") if shape == 0 else ("09:00", "23:59")
+        rec["start_dt"] = f"{start.isoformat()}T{start_time}+09:00"
+        rec["end_dt"] = f"{end.isoformat()}T{end_time}+09:00" if end else None
+        rec["period_text"] = text
+    else:
+        rec[("period_text", "date_text", "period", "date")[shape - 2]] = text
+        if rng.random() < 0.1:
+            rec["start_dt"] = None  # 키는 있는데 값이 빈 경우
+
+    dday = dday_value(rng, today, end)
+    if dday is not None:
+        rec["dday"] = dday
+
+    # 스크래퍼별 부가 필드
+    extra = rng.randrange(4)
+    if extra == 0:
+        rec["status"] = rng.choice(("진행중", "접수중", "모집중"))
+    elif extra == 1:
+        rec["location"] = rng.choice(("신촌", "강남"))
+        rec["date_text"] = rec.get("date_text") or text
+    elif extra == 2:
+        rec["recu_idx"] = str(100000 + i)
+        rec["announce_sn"] = str(i)
+        rec["tags"] = [rng.choice(("안암병원", "구로병원"))]
+    return rec
+
+
+def iter_records(n, seed=0, today=None):
+    rng = random.Random(seed)
+    today = today or date.today()
+    for i in range(n):
+        yield make_record(rng, i, today)
+
+
+def write_records(path, n, seed=0):
+    """레코드를 한 건씩 JSON 배열로 쓴다 → 파일 크기(bytes)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i, rec in enumerate(iter_records(n, seed)):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(rec, ensure_ascii=False))
+        f.write("\n]\n")
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="normalize_jobs.py용 가짜 공고 생성")
+    ap.add_argument("count", help="건수 (예: 1000, 10k, 1m)")
+    ap.add_argument("-o", "--output", help="출력 경로 (기본: bench/data/jobs-<건수>.json)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    n = parse_count(args.count)
+    path = args.output or os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", f"jobs-{args.count}.json")
+    size = write_records(path, n, args.seed)
+    print(f"✅ {n:,}건 → {path} ({size / 1024 / 1024:.1f}MB)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
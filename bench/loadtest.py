@@ -0,0 +1,677 @@
+# -*- coding: utf-8 -*-
+"""
+server.py 부하 테스트 (asyncio HTTP/1.1 클라이언트, 표준 라이브러리만 사용).
+
+    python bench/loadtest.py                                      # 가짜 데이터로 로컬 서버를 띄워서 30초
+    python bench/loadtest.py --server gunicorn --workers 4 --threads 8 --users cold=50,search=20
+    python bench/loadtest.py --crawl sim --users admin=20,cold=10  # 크롤링 중 관리자 폴링 비용
+    python bench/loadtest.py --url http://127.0.0.1:5000 --duration 60
+    python bench/loadtest.py --save-baseline                      # 이번 결과를 기준선으로 저장
+
+시나리오 (--users 이름=가상 사용자 수, 쉼표로 구분):
+- cold:      처음 온 방문자. 새 연결로 index.html → releases/current/manifest.json → 그 버전의 데이터 파일
+             (게시된 버전이 없으면 index.html SOURCES의 normalized/*.json) 전부를 브라우저처럼 연결 최대 6개로
+             동시에 받는다. page_load = 화면 하나를 다 받기까지 걸린 시간
+- returning: 다시 온 방문자. 연결을 유지하고 ETag/Last-Modified로 조건부 요청(304 기대).
+             버전 경로 파일은 immutable이라 버전이 바뀌었을 때만 받는다
+- admin:     admin.html 을 열어 둔 관리자. /api/status/stream(SSE)을 붙잡고 /api/status,
+             /api/can-update 를 --poll 초마다 폴링. sse_lag = 크롤 이벤트가 기록된 뒤 받기까지 걸린 시간
+- search:    /api/jobs 검색 (q, source, sort, filter, page 무작위)
+
+--url 이 없으면 임시 디렉터리에 서버 파일을 심볼릭 링크하고 bench/gen_jobs.py 공고를 정규화해서
+publish.py로 게시한 뒤(--postings) 그 디렉터리에서 서버를 띄운다 (STATE_DIR도 따로 → 실제 상태/데이터는 안 건드림).
+--crawl sim 은 크롤링 락을 잡고 크롤러처럼 진행 이벤트/상태를 초당 --crawl-rate 건 기록한다 (브라우저 없이).
+--crawl real 은 시작할 때 POST /api/update (bench/fake_sites.py + SITE_BASE_OVERRIDE 와 같이 쓰면 오프라인).
+
+결과: 시나리오 × 엔드포인트별 p50/p95/p99 지연, 초당 처리량, 오류율. bench/results/loadtest-<시각>.json 에 남기고
+기준선(loadtest-baseline.json)보다 p95가 --tolerance 이상 늘었거나 오류율이 올라간 항목을 ⚠️ 로 표시한다 (종료 코드 1).
+"""
+import os, re, sys, json, math, time, random, signal, shutil, asyncio, argparse, tempfile, subprocess, multiprocessing
+import importlib.util
+import urllib.request
+from collections import Counter
+from urllib.parse import urlencode, urlparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+RESULT_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE = os.path.join(RESULT_DIR, "loadtest-baseline.json")
+
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+import gen_jobs  # noqa: E402
+
+DEFAULT_USERS = "cold=10,returning=20,admin=2,search=10"
+BROWSER_CONNS = 6  # 브라우저의 호스트당 동시 연결 수
+SEARCH_TERMS = gen_jobs.JOBS + gen_jobs.DEPTS + gen_jobs.KINDS
+SORTS = ("deadline", "recent")
+FILTERS = ("all", "urgent", "soon", "normal")
+
+
+def data_paths():
+    """index.html이 받아 가는 데이터 파일 (SOURCES의 path)"""
+    with open(os.path.join(ROOT_DIR, "index.html"), "r", encoding="utf-8") as f:
+        return re.findall(r"path:\s*'\./(normalized/[\w-]+\.json)'", f.read())
+
+
+def parse_users(spec):
+    """'cold=10,search=5' → {'cold': 10, 'search': 5}"""
+    users = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        name, _, count = part.partition("=")
+        users[name.strip()] = int(count or 1)
+    return users
+
+
+# 🔹 HTTP/1.1 클라이언트 (keep-alive, Content-Length / chunked)
+
+class Conn:
+    def __init__(self, host, port, timeout):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (OSError, asyncio.CancelledError):
+                pass
+        self.reader = self.writer = None
+
+    async def _send(self, method, path, headers):
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}",
+                 "User-Agent: loadtest", "Accept-Encoding: identity"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        if method == "POST":
+            lines.append("Content-Length: 0")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+    async def _read_head(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("서버가 연결을 닫음")
+        version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        return version, int(status), headers
+
+    async def _read_chunked(self):
+        body = bytearray()
+        while True:
+            size = int((await self.reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass  # trailer
+                return bytes(body)
+            body += await self.reader.readexactly(size)
+            await self.reader.readexactly(2)
+
+    async def _exchange(self, method, path, headers):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, limit=1 << 20)
+        await self._send(method, path, headers)
+        version, status, resp_headers = await self._read_head()
+        keep = resp_headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+        if method == "HEAD" or status in (204, 304) or status < 200:
+            body = b""
+        elif "chunked" in resp_headers.get("transfer-encoding", "").lower():
+            body = await self._read_chunked()
+        elif "content-length" in resp_headers:
+            body = await self.reader.readexactly(int(resp_headers["content-length"]))
+        else:
+            body, keep = await self.reader.read(), False
+        if not keep:
+            await self.close()
+        return status, resp_headers, body
+
+    async def request(self, method, path, headers=None):
+        """(status, headers, body). 유지하던 연결이 서버 쪽에서 닫혔으면 한 번 다시 연결해서 보낸다"""
+        reused = self.writer is not None
+        try:
+            return await asyncio.wait_for(self._exchange(method, path, headers), self.timeout)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            await self.close()
+            if not reused:
+                raise
+        except BaseException:
+            await self.close()
+            raise
+        try:
+            return await asyncio.wait_for(self._exchange(method, path, headers), self.timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+
+# 🔹 집계
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = math.ceil(pct / 100 * len(sorted_values)) - 1  # nearest-rank
+    return sorted_values[max(0, min(len(sorted_values) - 1, k))]
+
+
+class Stats:
+    def __init__(self):
+        self.rows = {}
+
+    def _row(self, scenario, endpoint):
+        return self.rows.setdefault((scenario, endpoint), {
+            "latencies": [], "failed": 0, "errors": Counter(), "statuses": Counter(), "bytes": 0,
+        })
+
+    def add(self, scenario, endpoint, sec, status=None, nbytes=0, error=None):
+        row = self._row(scenario, endpoint)
+        if sec is not None:
+            row["latencies"].append(sec)
+        else:
+            row["failed"] += 1  # 응답을 못 받음 (연결 실패, 타임아웃 ...)
+        if status is not None:
+            row["statuses"][status] += 1
+        if error:
+            row["errors"][error] += 1
+        row["bytes"] += nbytes
+
+    def summary(self, elapsed):
+        out = []
+        for (scenario, endpoint), row in sorted(self.rows.items()):
+            lat = sorted(row["latencies"])
+            errors = sum(row["errors"].values())
+            requests = len(lat) + row["failed"]
+
+            def ms(v):
+                return round(v * 1000, 2) if v is not None else None
+
+            out.append({
+                "scenario": scenario, "endpoint": endpoint, "requests": requests, "errors": errors,
+                "error_rate": round(errors / requests, 4) if requests else 0.0,
+                "rps": round(len(lat) / elapsed, 1) if elapsed else None,
+                "p50_ms": ms(percentile(lat, 50)), "p95_ms": ms(percentile(lat, 95)),
+                "p99_ms": ms(percentile(lat, 99)), "max_ms": ms(lat[-1] if lat else None),
+                "mb": round(row["bytes"] / 1024 / 1024, 2),
+                "statuses": {str(k): v for k, v in sorted(row["statuses"].items())},
+                "error_kinds": dict(row["errors"]),
+            })
+        return out
+
+
+class Ctx:
+    """가상 사용자들이 같이 쓰는 설정 + 집계"""
+
+    def __init__(self, url, args, paths):
+        parsed = urlparse(url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.prefix = parsed.path.rstrip("/")
+        self.args = args
+        self.paths = paths
+        self.stats = Stats()
+
+    def connection(self):
+        return Conn(self.host, self.port, self.args.timeout)
+
+    async def get(self, conn, scenario, endpoint, path, headers=None, ok=(200,), method="GET"):
+        """요청 하나를 재서 기록 → (status, headers, body), 실패면 None"""
+        started = time.perf_counter()
+        try:
+            status, resp_headers, body = await conn.request(method, self.prefix + path, headers)
+        except asyncio.TimeoutError:
+            self.stats.add(scenario, endpoint, None, error="timeout")
+            return None
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            self.stats.add(scenario, endpoint, None, error=type(e).__name__)
+            return None
+        self.stats.add(scenario, endpoint, time.perf_counter() - started, status=status, nbytes=len(body),
+                       error=None if status in ok else str(status))
+        return (status, resp_headers, body) if status in ok else None
+
+
+async def pause(sec, deadline, rng=None):
+    """생각 시간 (rng가 있으면 지수분포로 흔든다). 종료 시각은 넘기지 않는다"""
+    if sec <= 0:
+        return
+    if rng is not None:
+        sec = rng.expovariate(1 / sec)
+    await asyncio.sleep(max(0.0, min(sec, deadline - time.monotonic())))
+
+
+# 🔹 시나리오
+
+async def load_page(ctx, scenario, conns, cache=None):
+    """index.html과 같은 순서: index.html → releases/current/manifest.json → 데이터 파일 전부
+    (게시된 버전이 없으면 normalized/). 하나라도 실패하면 False.
+    cache(다시 온 방문자)가 있으면 조건부 요청을 보내고, 이미 받은 버전 경로 파일은 브라우저 캐시(immutable)로 치고 건너뛴다"""
+    failed = False
+
+    async def fetch(conn, endpoint, path, ok=(200,)):
+        nonlocal failed
+        headers = {}
+        if cache is not None:
+            ok += (304,)
+            etag, modified = cache["validators"].get(path, (None, None))
+            if etag:
+                headers["If-None-Match"] = etag
+            if modified:
+                headers["If-Modified-Since"] = modified
+        resp = await ctx.get(conn, scenario, endpoint, path, headers, ok=ok)
+        if resp is None:
+            failed = True
+        elif cache is not None and resp[0] == 200:
+            cache["validators"][path] = (resp[1].get("etag"), resp[1].get("last-modified"))
+        return resp
+
+    await fetch(conns[0], "index.html", "/")
+    resp = await fetch(conns[0], "manifest.json", "/releases/current/manifest.json", ok=(200, 404))
+    version = None
+    if resp and resp[0] == 200:
+        try:
+            version = json.loads(resp[2]).get("version")
+        except ValueError:
+            pass
+    elif resp and resp[0] == 304:
+        version = cache.get("version")
+    if version:
+        endpoint = "releases/*.json"
+        queue = [f"/releases/{version}/{os.path.basename(p)}" for p in ctx.paths]
+    else:
+        endpoint = "normalized/*.json"
+        queue = ["/" + p for p in ctx.paths]
+    if cache is not None:
+        cache["version"] = version
+        queue = [p for p in queue if p not in cache["immutable"]]
+
+    async def worker(conn):
+        while queue:
+            path = queue.pop(0)
+            if await fetch(conn, endpoint, path) and version and cache is not None:
+                cache["immutable"].add(path)
+
+    await asyncio.gather(*(worker(c) for c in conns))
+    return not failed
+
+
+async def cold_user(ctx, rng, deadline):
+    while time.monotonic() < deadline:
+        conns = [ctx.connection() for _ in range(BROWSER_CONNS)]
+        started = time.perf_counter()
+        try:
+            ok = await load_page(ctx, "cold", conns)
+        finally:
+            for c in conns:
+                await c.close()
+        ctx.stats.add("cold", "page_load", time.perf_counter() - started, error=None if ok else "page")
+        await pause(ctx.args.think, deadline, rng)
+
+
+async def returning_user(ctx, rng, deadline):
+    conns = [ctx.connection() for _ in range(BROWSER_CONNS)]
+    cache = {"validators": {}, "immutable": set(), "version": None}
+    try:
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            ok = await load_page(ctx, "returning", conns, cache)
+            ctx.stats.add("returning", "page_load", time.perf_counter() - started, error=None if ok else "page")
+            await pause(ctx.args.think, deadline, rng)
+    finally:
+        for c in conns:
+            await c.close()
+
+
+async def watch_stream(ctx, deadline):
+    """/api/status/stream 을 끝까지 붙잡고 첫 응답 시간과 크롤 이벤트 도착 지연을 잰다"""
+    conn = ctx.connection()
+    started = time.perf_counter()
+    try:
+        conn.reader, conn.writer = await asyncio.wait_for(
+            asyncio.open_connection(conn.host, conn.port), ctx.args.timeout)
+        await conn._send("GET", ctx.prefix + "/api/status/stream", {"Accept": "text/event-stream"})
+        _, status, _ = await asyncio.wait_for(conn._read_head(), ctx.args.timeout)
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+        ctx.stats.add("admin", "api/status/stream", None, error=type(e).__name__)
+        await conn.close()
+        return
+    ctx.stats.add("admin", "api/status/stream", time.perf_counter() - started, status=status,
+                  error=None if status == 200 else str(status))
+    event = None
+    try:
+        while time.monotonic() < deadline:
+            try:
+                line = await asyncio.wait_for(conn.reader.readline(), max(0.1, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            text = line.decode("utf-8", "replace").strip()
+            if text.startswith("event:"):
+                event = text[6:].strip()
+            elif text.startswith("data:") and event == "crawl":
+                try:
+                    ts = json.loads(text[5:]).get("ts")
+                except ValueError:
+                    ts = None
+                if ts:
+                    ctx.stats.add("admin", "sse_lag", max(0.0, time.time() - ts))
+    except (OSError, asyncio.IncompleteReadError):
+        ctx.stats.add("admin", "api/status/stream", None, error="disconnected")
+    finally:
+        await conn.close()
+
+
+async def admin_user(ctx, rng, deadline):
+    stream = asyncio.ensure_future(watch_stream(ctx, deadline)) if ctx.args.sse else None
+    conn = ctx.connection()
+    try:
+        await ctx.get(conn, "admin", "admin.html", "/admin.html")
+        await ctx.get(conn, "admin", "api/schedule", "/api/schedule")
+        while time.monotonic() < deadline:
+            await ctx.get(conn, "admin", "api/status", "/api/status")
+            await ctx.get(conn, "admin", "api/can-update", "/api/can-update")
+            await pause(ctx.args.poll, deadline)
+    finally:
+        await conn.close()
+        if stream is not None:
+            await stream
+
+
+def search_params(rng, site_ids):
+    params = {}
+    if rng.random() < 0.6:
+        params["q"] = rng.choice(SEARCH_TERMS)
+    if site_ids and rng.random() < 0.4:
+        params["source"] = ",".join(rng.sample(site_ids, rng.randint(1, min(3, len(site_ids)))))
+    if rng.random() < 0.5:
+        params["sort"] = rng.choice(SORTS)
+    if rng.random() < 0.4:
+        params["filter"] = rng.choice(FILTERS)
+    if rng.random() < 0.3:
+        params["page"] = rng.randint(2, 4)
+    return params
+
+
+async def search_user(ctx, rng, deadline):
+    site_ids = [os.path.splitext(os.path.basename(p))[0] for p in ctx.paths]
+    conn = ctx.connection()
+    try:
+        while time.monotonic() < deadline:
+            query = urlencode(search_params(rng, site_ids))
+            await ctx.get(conn, "search", "api/jobs", "/api/jobs" + (f"?{query}" if query else ""))
+            await pause(ctx.args.think, deadline, rng)
+    finally:
+        await conn.close()
+
+
+SCENARIOS = {"cold": cold_user, "returning": returning_user, "admin": admin_user, "search": search_user}
+
+
+async def run_load(ctx, users):
+    started = time.monotonic()
+    deadline = started + ctx.args.duration
+
+    async def user(name, idx):
+        rng = random.Random(f"{ctx.args.seed}-{name}-{idx}")
+        await asyncio.sleep(rng.uniform(0, ctx.args.ramp))  # 한꺼번에 몰리지 않게 나눠서 시작
+        if time.monotonic() < deadline:
+            await SCENARIOS[name](ctx, rng, deadline)
+
+    if ctx.args.crawl == "real":
+        conn = ctx.connection()
+        await ctx.get(conn, "crawl", "api/update", "/api/update", method="POST")
+        await conn.close()
+    await asyncio.gather(*(user(name, i) for name, count in users.items() for i in range(count)))
+    return time.monotonic() - started
+
+
+# 🔹 크롤링 흉내 (별도 프로세스: 락 + 진행 이벤트/상태 기록, server.stream_process와 같은 모양)
+
+def simulate_crawl(stop, rate, site_ids):
+    import crawl_state  # STATE_DIR 환경 변수를 정한 뒤에 불러온다
+    lock_fd = crawl_state.acquire_lock()
+    if lock_fd is None:
+        print("⚠️ 이미 크롤링 중 → 흉내 내지 않음")
+        return
+    try:
+        crawl_state.update_status(progress="📡 병원 데이터 크롤링 중...", error=None)
+        i = 0
+        while not stop.wait(1 / rate):
+            site, page = site_ids[(i // 10) % len(site_ids)], i % 10 + 1
+            if page == 1:
+                crawl_state.append_event({"event": "site_started", "site": site, "name": site,
+                                          "ts": round(time.time(), 3)})
+            crawl_state.append_event({"event": "page", "site": site, "page": page, "items": 10,
+                                      "ts": round(time.time(), 3)})
+            crawl_state.update_status(progress=f"📡 {site} {page}페이지 수집 중...")
+            i += 1
+        crawl_state.update_status(progress="✅ 업데이트 완료!")
+    finally:
+        crawl_state.release_lock(lock_fd)
+
+
+# 🔹 로컬 서버 (임시 디렉터리 + 가짜 데이터)
+
+def make_sandbox(path, paths, postings, seed):
+    """서버 파일 심볼릭 링크 + 가짜 공고를 publish.py로 게시 (releases/ + normalized/). 반환: 디렉터리
+    STATE_DIR 환경 변수를 정한 뒤에 부른다 (게시하면서 데이터 버전을 올린다)"""
+    import publish, normalize_jobs  # 둘 다 crawl_state를 불러오므로 STATE_DIR을 정한 뒤에
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(ROOT_DIR):
+        if name.endswith((".py", ".html")) or name == "src":
+            link = os.path.join(path, name)
+            if not os.path.lexists(link):
+                os.symlink(os.path.join(ROOT_DIR, name), link)
+    for sub in ("normalized", "json", "state"):
+        os.makedirs(os.path.join(path, sub), exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(path)  # publish.py는 작업 디렉터리 기준
+    try:
+        with publish.release() as staging:
+            for i, rel in enumerate(paths):
+                records = [normalize_jobs.normalize_record(r) for r in gen_jobs.iter_records(postings, seed + i)]
+                with open(os.path.join(staging, os.path.basename(rel)), "w", encoding="utf-8") as f:
+                    json.dump(records, f, ensure_ascii=False, indent=2)
+    finally:
+        os.chdir(cwd)
+    return path
+
+
+def start_server(sandbox, args, log):
+    env = {
+        **os.environ, "STATE_DIR": os.path.join(sandbox, "state"), "PYTHONUNBUFFERED": "1",
+        "BIND": f"127.0.0.1:{args.port}", "WEB_CONCURRENCY": str(args.workers), "THREADS": str(args.threads),
+    }
+    if args.server == "gunicorn":
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "server:app"]
+    else:
+        cmd = [sys.executable, "-c",
+               f"import server; server.app.run(host='127.0.0.1', port={args.port}, threaded=True)"]
+    return subprocess.Popen(cmd, cwd=sandbox, env=env, stdout=log, stderr=subprocess.STDOUT,
+                            start_new_session=True)
+
+
+def wait_ready(url, proc, timeout=30):
+    until = time.monotonic() + timeout
+    while time.monotonic() < until:
+        if proc is not None and proc.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(f"{url}/api/status", timeout=2):
+                return True
+        except OSError:
+            time.sleep(0.3)
+    return False
+
+
+def stop_server(proc):
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.wait()
+    except ProcessLookupError:
+        pass
+
+
+# 🔹 기준선 비교 (normalize_bench.py와 같은 방식)
+
+def load_results(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("config", {}), {(r["scenario"], r["endpoint"]): r for r in data["rows"]}
+    except (OSError, ValueError, KeyError):
+        return {}, {}
+
+
+def compare(rows, baseline, tolerance):
+    """p95가 tolerance 이상 늘었거나 오류율이 1%p 이상 오른 항목 수"""
+    regressions = 0
+    for r in rows:
+        base = baseline.get((r["scenario"], r["endpoint"]))
+        if not base:
+            continue
+        if base.get("p95_ms") and r.get("p95_ms"):
+            r["p95_vs_baseline"] = round((r["p95_ms"] / base["p95_ms"] - 1) * 100, 1)
+        if r.get("p95_vs_baseline", 0) > tolerance * 100 or r["error_rate"] > base.get("error_rate", 0) + 0.01:
+            r["regression"] = True
+            regressions += 1
+    return regressions
+
+
+def save_results(config, rows, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created_at": time.time(), "config": config, "rows": rows}, f, ensure_ascii=False, indent=2)
+
+
+def print_report(rows, elapsed):
+    print(f"\n{'시나리오':<11}{'엔드포인트':<20}{'요청':>8}{'오류율':>8}{'초당':>8}"
+          f"{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}{'최대ms':>9}")
+    for r in rows:
+        def f(v):
+            return f"{v:>9.1f}" if v is not None else f"{'-':>9}"
+        print(f"{r['scenario']:<11}{r['endpoint']:<20}{r['requests']:>8}{r['error_rate'] * 100:>7.1f}%"
+              f"{r['rps'] or 0:>8.1f}{f(r['p50_ms'])}{f(r['p95_ms'])}{f(r['p99_ms'])}{f(r['max_ms'])}")
+        if r["error_kinds"]:
+            print(f"{'':<11}  ❌ {', '.join(f'{k}×{v}' for k, v in r['error_kinds'].items())}")
+    http = [r for r in rows if r["endpoint"] not in ("page_load", "sse_lag")]
+    total = sum(r["requests"] for r in http)
+    errors = sum(r["errors"] for r in http)
+    print(f"\n📊 {elapsed:.1f}초 동안 HTTP 요청 {total:,}건 ({total / elapsed:,.1f}/초), "
+          f"오류 {errors:,}건 ({errors / total * 100 if total else 0:.2f}%)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="server.py 부하 테스트")
+    ap.add_argument("--url", help="이미 떠 있는 서버 주소 (없으면 가짜 데이터로 로컬 서버를 띄운다)")
+    ap.add_argument("--users", default=DEFAULT_USERS, help=f"시나리오=가상 사용자 수 (기본 {DEFAULT_USERS})")
+    ap.add_argument("--duration", type=float, default=30, help="측정 시간(초)")
+    ap.add_argument("--ramp", type=float, default=3, help="사용자 시작을 나눠 뿌릴 시간(초)")
+    ap.add_argument("--think", type=float, default=1.0, help="방문/검색 사이 평균 생각 시간(초, 0=쉬지 않음)")
+    ap.add_argument("--poll", type=float, default=2.0, help="관리자 /api/status 폴링 간격(초)")
+    ap.add_argument("--no-sse", dest="sse", action="store_false", help="관리자가 SSE 스트림을 열지 않음")
+    ap.add_argument("--timeout", type=float, default=10, help="요청 타임아웃(초)")
+    ap.add_argument("--crawl", choices=("none", "sim", "real"), default="none", help="부하 중 크롤링")
+    ap.add_argument("--crawl-rate", type=float, default=5, help="--crawl sim 초당 이벤트 수")
+    ap.add_argument("--seed", type=int, default=0)
+    local = ap.add_argument_group("로컬 서버 (--url 없을 때)")
+    local.add_argument("--server", choices=("flask", "gunicorn"),
+                       default="gunicorn" if importlib.util.find_spec("gunicorn") else "flask")
+    local.add_argument("--workers", type=int, default=2, help="gunicorn 워커 수")
+    local.add_argument("--threads", type=int, default=4, help="gunicorn 워커당 스레드 수")
+    local.add_argument("--port", type=int, default=5055)
+    local.add_argument("--postings", type=int, default=300, help="사이트별 가짜 공고 수")
+    local.add_argument("--sandbox", help="서버를 띄울 디렉터리 (기본: 임시 디렉터리, 끝나면 지움)")
+    ap.add_argument("--baseline", default=BASELINE, help="비교할 기준선 결과 파일")
+    ap.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    ap.add_argument("--tolerance", type=float, default=0.20, help="허용 p95 증가 비율 (기본 20%%)")
+    ap.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = ap.parse_args()
+
+    users = parse_users(args.users)
+    unknown = [name for name in users if name not in SCENARIOS]
+    if unknown:
+        print(f"❌ 알 수 없는 시나리오: {', '.join(unknown)} (가능: {', '.join(SCENARIOS)})")
+        return 2
+    paths = data_paths()
+
+    proc = sandbox = log = sim = None
+    url = (args.url or f"http://127.0.0.1:{args.port}").rstrip("/")
+    try:
+        if not args.url:
+            sandbox = args.sandbox or tempfile.mkdtemp(prefix="loadtest-")
+            os.environ["STATE_DIR"] = os.path.join(sandbox, "state")
+            make_sandbox(sandbox, paths, args.postings, args.seed)
+            log = open(os.path.join(sandbox, "server.log"), "ab")
+            proc = start_server(sandbox, args, log)
+            workers = f" 워커 {args.workers} × 스레드 {args.threads}" if args.server == "gunicorn" else ""
+            print(f"🚀 {args.server}{workers} → {url} (공고 {args.postings}건 × {len(paths)}개 사이트, {sandbox})")
+        if not wait_ready(url, proc):
+            print(f"❌ 서버 응답 없음: {url}" + (f" (로그: {log.name})" if log else ""))
+            return 2
+
+        if args.crawl == "sim":
+            ctx_mp = multiprocessing.get_context("fork")
+            stop = ctx_mp.Event()
+            site_ids = [os.path.splitext(os.path.basename(p))[0] for p in paths]
+            sim = ctx_mp.Process(target=simulate_crawl, args=(stop, args.crawl_rate, site_ids), daemon=True)
+            sim.start()
+
+        print(f"🏋️ {', '.join(f'{k} {v}명' for k, v in users.items())} · {args.duration:g}초")
+        ctx = Ctx(url, args, paths)
+        elapsed = asyncio.run(run_load(ctx, users))
+    finally:
+        if sim is not None:
+            stop.set()
+            sim.join(timeout=10)
+        if proc is not None:
+            stop_server(proc)
+        if log is not None:
+            log.close()
+        if sandbox and not args.sandbox:
+            shutil.rmtree(sandbox, ignore_errors=True)
+
+    rows = ctx.stats.summary(elapsed)
+    config = {
+        "url": args.url, "users": users, "duration": args.duration, "think": args.think, "poll": args.poll,
+        "sse": args.sse, "crawl": args.crawl, "python": sys.version.split()[0],
+    }
+    if not args.url:
+        config.update(server=args.server, workers=args.workers, threads=args.threads, postings=args.postings)
+    base_config, baseline = load_results(args.baseline)
+    regressions = compare(rows, baseline, args.tolerance)
+
+    if args.json:
+        print(json.dumps({"config": config, "elapsed": round(elapsed, 2), "rows": rows}, ensure_ascii=False, indent=2))
+    else:
+        print_report(rows, elapsed)
+        compared = [r for r in rows if "p95_vs_baseline" in r or r.get("regression")]
+        if compared:
+            print(f"\n📏 기준선 비교 ({os.path.relpath(args.baseline, ROOT_DIR)})")
+            changed = [k for k in ("users", "server", "workers", "threads", "crawl") if base_config.get(k) != config.get(k)]
+            if changed:
+                print(f"  ⚠️ 기준선과 설정이 다름: {', '.join(changed)}")
+            for r in compared:
+                flag = "  ⚠️ 느려짐/오류 증가" if r.get("regression") else ""
+                print(f"  {r['scenario']:<11}{r['endpoint']:<20}p95 {r.get('p95_vs_baseline', 0):+.1f}%{flag}")
+
+    path = os.path.join(RESULT_DIR, f"loadtest-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    save_results(config, rows, path)
+    if not args.json:
+        print(f"\n📝 결과: {os.path.relpath(path, ROOT_DIR)}")
+    if args.save_baseline:
+        save_results(config, rows, args.baseline)
+        print(f"📌 기준선 저장: {os.path.relpath(args.baseline, ROOT_DIR)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+normalize_jobs.py 규모 벤치마크 (bench/gen_jobs.py 가짜 공고 사용).
+
+    python bench/normalize_bench.py                                # 1k,10k,100k × record,range,file
+    python bench/normalize_bench.py --sizes 1m,10m --bench file
+    python bench/normalize_bench.py --save-baseline                # 이번 결과를 기준선으로 저장
+
+- record: normalize_record 반복 (레코드 풀을 돌려 써서 생성 비용은 빼고 잰다)
+- range:  parse_range 반복 (스크래퍼별 기간 표기 풀)
+- file:   입력 파일(bench/data/ 에 캐시) → normalize_file 전체. 처리량 + 입력/출력 크기
+- 케이스마다 fork한 자식 프로세스에서 돌려 최대 RSS와 그 케이스에서 늘어난 RSS를 따로 잰다.
+- 결과는 bench/results/normalize-<시각>.json 에 남기고, 기준선(normalize-baseline.json)이 있으면
+  처리량이 --tolerance 보다 더 떨어진 케이스를 ⚠️ 로 표시한다 (종료 코드 1).
+"""
+import os, sys, io, json, time, random, argparse, resource, multiprocessing
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, "data")
+RESULT_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE = os.path.join(RESULT_DIR, "normalize-baseline.json")
+POOL_SIZE = 100_000
+
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+import normalize_jobs  # noqa: E402
+import profiling  # noqa: E402
+import gen_jobs  # noqa: E402
+
+
+# 🔹 케이스
+
+def bench_record(n, seed):
+    pool = list(gen_jobs.iter_records(min(n, POOL_SIZE), seed))
+    size, norm = len(pool), normalize_jobs.normalize_record
+    started = time.perf_counter()
+    for i in range(n):
+        norm(pool[i % size])
+    return {"sec": time.perf_counter() - started}
+
+
+def bench_range(n, seed):
+    rng = random.Random(seed)
+    today = date.today()
+    pool = []
+    for _ in range(min(n, POOL_SIZE)):
+        start = today + timedelta(days=rng.randint(-60, 10))
+        pool.append(gen_jobs.period_text(rng, start, start + timedelta(days=rng.randint(3, 45))))
+    size, parse = len(pool), normalize_jobs.parse_range
+    started = time.perf_counter()
+    for i in range(n):
+        parse(pool[i % size])
+    return {"sec": time.perf_counter() - started}
+
+
+def input_file(n, seed):
+    """bench/data/jobs-<n>-s<seed>.json (없으면 만든다)"""
+    path = os.path.join(DATA_DIR, f"jobs-{n}-s{seed}.json")
+    if not os.path.exists(path):
+        print(f"🧪 입력 생성: {os.path.relpath(path, ROOT_DIR)} ({n:,}건)")
+        gen_jobs.write_records(path, n, seed)
+    return path
+
+
+def bench_file(n, seed):
+    path = input_file(n, seed)
+    out_path = os.path.join(DATA_DIR, f"normalized-{n}-s{seed}-{os.getpid()}.json")
+    try:
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            normalize_jobs.normalize_file(path, out_path)
+        sec = time.perf_counter() - started
+        return {"sec": sec, "in_bytes": os.path.getsize(path), "out_bytes": os.path.getsize(out_path)}
+    finally:
+        if os.path.exists(out_path):
+            os.remove(out_path)
+
+
+BENCHES = {"record": bench_record, "range": bench_range, "file": bench_file}
+
+
+# 🔹 실행 (케이스마다 자식 프로세스)
+
+def _child(conn, name, n, seed):
+    try:
+        rss_before = profiling.tree_rss(os.getpid()) or 0
+        result = BENCHES[name](n, seed)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # 리눅스: KB
+        result["peak_rss_mb"] = round(peak / 1024 / 1024, 1)
+        result["rss_growth_mb"] = round(max(0, peak - rss_before) / 1024 / 1024, 1)
+        conn.send(result)
+    except BaseException as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_case(name, n, seed):
+    if name == "file":
+        input_file(n, seed)  # 입력 생성은 측정 밖에서
+    ctx = multiprocessing.get_context("fork")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(send, name, n, seed))
+    proc.start()
+    send.close()
+    try:
+        result = recv.recv()
+    except EOFError:
+        result = {"error": f"자식 프로세스 비정상 종료 (exit {proc.exitcode})"}  # 메모리 부족으로 죽은 경우 등
+    proc.join()
+    result.update({"bench": name, "n": n})
+    if "sec" in result:
+        result["sec"] = round(result["sec"], 4)
+        result["per_sec"] = round(n / result["sec"], 1) if result["sec"] else None
+    return result
+
+
+# 🔹 기준선 비교
+
+def load_results(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {(c["bench"], c["n"]): c for c in json.load(f)["cases"]}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def compare(cases, baseline, tolerance):
+    """기준선 대비 처리량 변화(%) 기록, 떨어진 케이스 수 반환"""
+    regressions = 0
+    for c in cases:
+        base = baseline.get((c["bench"], c["n"]))
+        if not base or not base.get("per_sec") or not c.get("per_sec"):
+            continue
+        change = c["per_sec"] / base["per_sec"] - 1
+        c["vs_baseline"] = round(change * 100, 1)
+        if change < -tolerance:
+            c["regression"] = True
+            regressions += 1
+    return regressions
+
+
+def save_results(cases, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created_at": time.time(), "python": sys.version.split()[0], "cases": cases},
+                  f, ensure_ascii=False, indent=2)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="normalize_jobs.py 규모 벤치마크")
+    ap.add_argument("--sizes", default="1k,10k,100k", help="쉼표로 구분 (예: 1k,1m,10m)")
+    ap.add_argument("--bench", default="record,range,file", help="record,range,file 중 선택")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--baseline", default=BASELINE, help="비교할 기준선 결과 파일")
+    ap.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    ap.add_argument("--tolerance", type=float, default=0.10, help="허용 처리량 하락 비율 (기본 10%%)")
+    args = ap.parse_args()
+
+    sizes = [gen_jobs.parse_count(s) for s in args.sizes.split(",") if s]
+    names = [b for b in args.bench.split(",") if b]
+    unknown = [b for b in names if b not in BENCHES]
+    if unknown:
+        print(f"❌ 알 수 없는 벤치마크: {', '.join(unknown)}")
+        return 2
+
+    cases = []
+    print(f"{'벤치':<8}{'건수':>12}{'초':>10}{'건/초':>14}{'최대RSS(MB)':>13}{'증가(MB)':>10}{'출력(MB)':>10}")
+    for name in names:
+        for n in sizes:
+            c = run_case(name, n, args.seed)
+            cases.append(c)
+            if "error" in c:
+                print(f"{name:<8}{n:>12,}  ❌ {c['error']}")
+                continue
+            out_mb = f"{c['out_bytes'] / 1024 / 1024:.1f}" if "out_bytes" in c else "-"
+            print(f"{name:<8}{n:>12,}{c['sec']:>10.2f}{c['per_sec']:>14,.0f}"
+                  f"{c['peak_rss_mb']:>13.1f}{c['rss_growth_mb']:>10.1f}{out_mb:>10}")
+
+    regressions = compare(cases, load_results(args.baseline), args.tolerance)
+    compared = [c for c in cases if "vs_baseline" in c]
+    if compared:
+        print(f"\n📏 기준선 비교 ({os.path.relpath(args.baseline, ROOT_DIR)})")
+        for c in compared:
+            flag = "  ⚠️ 느려짐" if c.get("regression") else ""
+            print(f"  {c['bench']:<8}{c['n']:>12,}  {c['vs_baseline']:+.1f}%{flag}")
+
+    path = os.path.join(RESULT_DIR, f"normalize-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    save_results(cases, path)
+    print(f"\n📝 결과: {os.path.relpath(path, ROOT_DIR)}")
+    if args.save_baseline:
+        save_results(cases, args.baseline)
+        print(f"📌 기준선 저장: {os.path.relpath(args.baseline, ROOT_DIR)}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+파싱 벤치마크: 기록한 fixture를 사이트 × BeautifulSoup 파서별로 반복 파싱해서
+페이지당 ms, 초당 항목 수, 항목 수를 비교한다. 파서마다 항목 수가 다르면 표시(⚠️)한다.
+
+    python bench/parse_bench.py                 # fixture 전체, 설치된 파서 전부
+    python bench/parse_bench.py samsung amc -n 20 --parsers html.parser,lxml
+    python bench/parse_bench.py --json > parse_bench.json
+"""
+import os, sys, io, json, time, logging, argparse, importlib.util
+from contextlib import redirect_stdout
+
+from bs4 import FeatureNotFound
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import replay  # noqa: E402
+from replay import crawl_hooks  # noqa: E402
+
+# BeautifulSoup 파서 이름 → 필요한 모듈 (html.parser는 표준 라이브러리)
+BACKENDS = {"html.parser": None, "lxml": "lxml", "html5lib": "html5lib"}
+
+
+def available_parsers():
+    return [name for name, mod in BACKENDS.items() if mod is None or importlib.util.find_spec(mod)]
+
+
+def bench_site(fixture, parser, repeat):
+    """한 사이트를 한 파서로 repeat번 파싱 → 결과 dict"""
+    crawl_hooks.HTML_PARSER = parser
+    pages = len(fixture["pages"])
+    items = sum(len(found) for _, found in replay.replay(fixture))  # 워밍업 + 항목 수
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        replay.replay(fixture)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "site": fixture["site"], "parser": parser, "pages": pages, "items": items,
+        "bytes": sum(len(p["html"].encode("utf-8")) for p in fixture["pages"]),
+        "ms_per_page": round(best * 1000 / pages, 3) if pages else None,
+        "items_per_sec": round(items / best, 1) if best else None,
+    }
+
+
+def run(sites, parsers, repeat, fixture_dir=replay.FIXTURE_DIR):
+    rows = []
+    for site in sites:
+        if site not in replay.PARSERS:
+            print(f"⚠️ {site}: 파싱 진입점 없음", file=sys.stderr)
+            continue
+        fixture = replay.load_fixture(site, fixture_dir)
+        for parser in parsers:
+            try:
+                # 스크래퍼의 로그/print가 측정에 섞이지 않도록
+                with redirect_stdout(io.StringIO()):
+                    rows.append(bench_site(fixture, parser, repeat))
+            except FeatureNotFound:
+                print(f"⚠️ {parser}: 설치되지 않은 파서", file=sys.stderr)
+            except ImportError as e:
+                print(f"⚠️ {site}: 모듈을 불러올 수 없음 ({e})", file=sys.stderr)
+                break
+    # 같은 사이트인데 파서별 항목 수가 다르면 표시
+    counts = {}
+    for r in rows:
+        counts.setdefault(r["site"], set()).add(r["items"])
+    for r in rows:
+        r["mismatch"] = len(counts[r["site"]]) > 1
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="사이트 × HTML 파서 파싱 벤치마크")
+    ap.add_argument("sites", nargs="*", help="사이트 id (기본: fixture가 있는 전체)")
+    ap.add_argument("-n", "--repeat", type=int, default=10, help="반복 횟수 (가장 빠른 값 사용)")
+    ap.add_argument("--parsers", help="쉼표로 구분 (기본: 설치된 것 전부)")
+    ap.add_argument("--fixtures", default=replay.FIXTURE_DIR)
+    ap.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = ap.parse_args()
+
+    parsers = args.parsers.split(",") if args.parsers else available_parsers()
+    logging.disable(logging.CRITICAL)
+    rows = run(args.sites or replay.list_fixtures(args.fixtures), parsers, args.repeat, args.fixtures)
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    print(f"{'사이트':<16}{'파서':<13}{'페이지':>6}{'항목':>6}{'KB':>8}{'ms/페이지':>11}{'항목/초':>10}")
+    for r in rows:
+        flag = "  ⚠️ 항목 수 불일치" if r["mismatch"] else ""
+        print(f"{r['site']:<16}{r['parser']:<13}{r['pages']:>6}{r['items']:>6}{r['bytes'] / 1024:>8.1f}"
+              f"{r['ms_per_page'] or 0:>11.2f}{r['items_per_sec'] or 0:>10.1f}{flag}")
+
+
+if __name__ == "__main__":
+    main()
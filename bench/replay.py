@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+기록해 둔 페이지 HTML(fixture)을 스크래퍼의 파싱 함수에 그대로 넣어 네트워크/브라우저 없이 재현.
+
+기록:  RECORD_DIR=bench/fixtures python src/run_all.py   (또는 스크립트 하나만 단독 실행)
+재현:  python bench/replay.py [사이트 id ...]
+
+- fixture: bench/fixtures/<사이트 id>/manifest.json + list-001.html ...
+- 날짜 기준(오늘/지금)은 기록 시각(manifest의 recorded_at)을 쓴다 → 언제 돌려도 같은 결과.
+  (단, 파싱 함수 안에서 직접 datetime.now()로 계산하는 D-day 같은 값은 실행일 기준)
+- Selenium WebElement를 직접 다루는 사이트(kumc, hyumc, caumc, cmcseoul)는 BeautifulSoup으로
+  WebElement 흉내를 낸 SoupElement로 재현한다. .text는 근사값이고 WebDriver 왕복 비용은 빠진다.
+"""
+import os, sys, json, argparse, importlib
+from datetime import datetime, timezone, timedelta
+from urllib.parse import urljoin
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+sys.path.insert(0, SRC_DIR)
+import crawl_hooks  # noqa: E402
+from bs4 import BeautifulSoup  # noqa: E402
+
+KST = timezone(timedelta(hours=9))
+
+try:
+    from selenium.common.exceptions import NoSuchElementException
+except ImportError:  # Selenium 사이트 모듈은 어차피 selenium이 있어야 불러진다
+    class NoSuchElementException(Exception):
+        pass
+
+
+# 🔹 fixture 읽기
+
+def list_fixtures(fixture_dir=FIXTURE_DIR):
+    """manifest.json이 있는 사이트 id 목록"""
+    if not os.path.isdir(fixture_dir):
+        return []
+    return sorted(d for d in os.listdir(fixture_dir)
+                  if os.path.isfile(os.path.join(fixture_dir, d, "manifest.json")))
+
+
+def load_fixture(site, fixture_dir=FIXTURE_DIR):
+    """{"site", "now", "pages": [{"page", "url", "html", ...}]}"""
+    site_dir = os.path.join(fixture_dir, site)
+    with open(os.path.join(site_dir, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    pages = []
+    for p in manifest.get("pages", []):
+        if p.get("kind", "list") != "list":
+            continue
+        with open(os.path.join(site_dir, p["file"]), "r", encoding="utf-8") as f:
+            pages.append({**p, "html": f.read()})
+    recorded_at = manifest.get("recorded_at")
+    now = datetime.fromisoformat(recorded_at).astimezone(KST) if recorded_at else datetime.now(KST)
+    return {"site": site, "now": now, "pages": pages}
+
+
+# 🔹 Selenium WebElement 흉내 (find_element(s), text, get_attribute, is_displayed)
+
+class SoupElement:
+    def __init__(self, node, base_url=None):
+        self.node = node
+        self.base_url = base_url
+
+    @classmethod
+    def from_html(cls, html, base_url=None):
+        return cls(BeautifulSoup(html, crawl_hooks.HTML_PARSER), base_url)
+
+    def find_elements(self, by, value):
+        if by == "css selector":
+            nodes = self.node.select(value)
+        elif by == "tag name":
+            nodes = self.node.find_all(value)
+        else:
+            # XPath는 지원하지 않음 → 못 찾은 것으로 (스크래퍼들은 XPath를 대체 경로로만 쓴다)
+            nodes = []
+        return [SoupElement(n, self.base_url) for n in nodes]
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"{by}={value}")
+        return found[0]
+
+    @property
+    def text(self):
+        return self.node.get_text("\n", strip=True)
+
+    def get_attribute(self, name):
+        value = self.node.get(name)
+        if isinstance(value, list):
+            value = " ".join(value)
+        if name in ("href", "src") and value is not None and self.base_url:
+            value = urljoin(self.base_url, value)  # WebDriver는 절대 URL을 돌려준다
+        return value
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+
+# 🔹 사이트별 파싱 진입점: (html, page, now) → 항목 목록
+
+def _module(name):
+    return importlib.import_module(name)
+
+
+def _samsung(html, page, now):
+    parsed = _module("samsung").parse_list_page(html, now.date())
+    return parsed[0] if parsed else []
+
+
+def _seoul(html, page, now):
+    return _module("seoul").parse_list_page(html, now.date()) or []
+
+
+def _gunguk(html, page, now):
+    return _module("gunguk").parse_list_page(html) or []
+
+
+def _khmc(html, page, now):
+    return _module("gyunghee").parse_list_page(html) or []
+
+
+def _seoul_mokdong(html, page, now):
+    return _module("seoul_mokdong").parse_list_page(html, now.date()) or []
+
+
+def _mokdong(html, page, now):
+    mod = _module("mokdong")
+    lis = mod.find_list_items(html) or []
+    items = (mod.extract_item(li, page["page"], i) for i, li in enumerate(lis, 1))
+    return [item for item in items if item]
+
+
+def _amc(html, page, now):
+    return _module("seoul_asan").parse_list_items(html, now_kst=now)[0]
+
+
+def _sebrance(html, page, now):
+    return _module("sebrance").extract_from_dom(html)[0]
+
+
+def _kbsmc(html, page, now):
+    return _module("gangbuk").extract_page_items(html)[0]
+
+
+def _snubh(html, page, now):
+    return _module("bundang").parse_job_list(html)
+
+
+def _webelement_items(module):
+    """li WebElement마다 parse_li를 부르는 Selenium 사이트 (실패한 li는 크롤러처럼 건너뜀)"""
+    def parse(html, page, now):
+        mod = _module(module)
+        root = SoupElement.from_html(html, page.get("url"))
+        items = []
+        for li in root.find_elements("css selector", mod.LI_SEL):
+            try:
+                items.append(mod.parse_li(li))
+            except Exception:
+                continue
+        return items
+    return parse
+
+
+def _caumc(html, page, now):
+    root = SoupElement.from_html(html, page.get("url"))
+    return _module("jungang").parse_list_page(root, show_only_open=True, warn_on_fail=False)
+
+
+PARSERS = {
+    "samsung": _samsung,
+    "seoul": _seoul,
+    "gunguk": _gunguk,
+    "khmc": _khmc,
+    "seoul_mokdong": _seoul_mokdong,
+    "mokdong": _mokdong,
+    "amc": _amc,
+    "sebrance": _sebrance,
+    "kbsmc": _kbsmc,
+    "snubh": _snubh,
+    "kumc": _webelement_items("goryu"),
+    "hyumc": _webelement_items("hanyang"),
+    "caumc": _caumc,
+    "cmcseoul": _webelement_items("sungmo"),
+}
+
+
+def replay(fixture):
+    """fixture 전체 페이지 파싱 → [(page, items), ...]"""
+    parse = PARSERS[fixture["site"]]
+    return [(p, parse(p["html"], p, fixture["now"])) for p in fixture["pages"]]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="기록한 HTML로 파싱 재현")
+    ap.add_argument("sites", nargs="*", help="사이트 id (기본: fixture가 있는 전체)")
+    ap.add_argument("--fixtures", default=FIXTURE_DIR)
+    ap.add_argument("--parser", default=crawl_hooks.HTML_PARSER, help="BeautifulSoup 파서")
+    ap.add_argument("--show", action="store_true", help="항목 JSON까지 출력")
+    args = ap.parse_args()
+
+    crawl_hooks.HTML_PARSER = args.parser
+    for site in args.sites or list_fixtures(args.fixtures):
+        if site not in PARSERS:
+            print(f"⚠️ {site}: 파싱 진입점 없음")
+            continue
+        try:
+            results = replay(load_fixture(site, args.fixtures))
+        except ImportError as e:
+            print(f"⚠️ {site}: 모듈을 불러올 수 없음 ({e})")
+            continue
+        total = sum(len(items) for _, items in results)
+        print(f"✅ {site}: {len(results)}페이지, {total}건")
+        if args.show:
+            for page, items in results:
+                print(json.dumps({"page": page["page"], "items": items}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+여러 워커 프로세스가 함께 보는 크롤링 상태 저장소.
+
+- 상태(진행 문구, 에러, 마지막 업데이트)는 SQLite(state/crawl_state.db)에 JSON으로 저장
+- "이미 실행 중" 판단은 파일 락(fcntl.flock)으로 한다.
+  락을 잡은 프로세스가 죽으면 OS가 락을 풀어주므로 running 플래그가 영영 남는 일이 없다.
+  프로세스 사이 동시 실행 수 제한(브라우저/HTTP 슬롯)도 같은 락으로 센다.
+- 사이트별 회로 차단기(연속 실패 횟수, 열린 시각, 다음 시도 시각)와
+  최근 소요 시간 기록(실행 순서 계획용)도 site:<id> 상태에 같이 둔다.
+"""
+import os, json, time, fcntl, sqlite3, threading
+
+# 서버(루트)와 run_all.py(src/)가 어디서 실행되든 같은 파일을 보도록 모듈 위치 기준 경로
+STATE_DIR = os.getenv("STATE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "state"))
+DB_PATH = os.path.join(STATE_DIR, "crawl_state.db")
+LOCK_DIR = os.path.join(STATE_DIR, "locks")
+
+# 전체 크롤링(run_all.py)에 쓰는 상태/락 이름
+ALL = "all"
+
+DEFAULT_STATUS = {
+    'running': False,
+    'last_update': None,
+    'progress': '',
+    'error': None
+}
+
+_local = threading.local()
+
+
+def connect():
+    """프로세스·스레드별 SQLite 연결 (fork 이후에는 새로 연다)"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "pid", None) == os.getpid():
+        return conn
+    os.makedirs(STATE_DIR, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS status (name TEXT PRIMARY KEY, data TEXT NOT NULL)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS events ("
+        " id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, data TEXT NOT NULL)"
+    )
+    _local.conn, _local.pid = conn, os.getpid()
+    return conn
+
+
+# 🔹 상태
+
+def _read(conn, name):
+    row = conn.execute("SELECT data FROM status WHERE name = ?", (name,)).fetchone()
+    return json.loads(row[0]) if row else {}
+
+
+def _write(conn, name, data):
+    conn.execute(
+        "INSERT INTO status (name, data) VALUES (?, ?) "
+        "ON CONFLICT(name) DO UPDATE SET data = excluded.data",
+        (name, json.dumps(data, ensure_ascii=False))
+    )
+
+
+def get_status(name=ALL):
+    """저장된 상태 + 락 기준 running 여부"""
+    data = dict(DEFAULT_STATUS)
+    data.update(_read(connect(), name))
+    data['running'] = is_locked(name)
+    return data
+
+
+def site_statuses():
+    """사이트별 상태 {site_id: 상태} (상태 이름이 'site:<id>'인 것들)"""
+    rows = connect().execute("SELECT name FROM status WHERE name LIKE 'site:%'").fetchall()
+    return {name[len('site:'):]: get_status(name) for (name,) in rows}
+
+
+def update_status(name=ALL, **fields):
+    """상태 일부 필드만 갱신 (read-modify-write를 한 트랜잭션으로)"""
+    conn = connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        data = _read(conn, name)
+        data.update(fields)
+        data.pop('running', None)  # running은 락으로만 판단
+        _write(conn, name, data)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return data
+
+
+# 🔹 데이터 버전 (정규화 결과가 새로 게시될 때마다 1씩 증가 → API 캐시 무효화 기준)
+
+def data_version():
+    return _read(connect(), 'data').get('version', 0)
+
+
+def bump_data_version():
+    conn = connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        data = _read(conn, 'data')
+        data['version'] = data.get('version', 0) + 1
+        data['published_at'] = time.time()
+        _write(conn, 'data', data)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return data['version']
+
+
+# 🔹 사이트별 회로 차단기
+# 사이트 개편 등으로 매번 실패하는 사이트는 BREAKER_FAILURES번 연속 실패하면 열어서(open) 건너뛴다.
+# BREAKER_COOLDOWN_SEC가 지나면 반열림(half_open): 한 번만 시도해서 성공하면 닫고, 실패하면 대기 시간을 두 배로 다시 연다.
+# 건너뛴 사이트는 정규화에서 마지막 정상 스냅샷을 stale로 이어서 내보낸다.
+
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "3"))
+BREAKER_COOLDOWN_SEC = int(os.getenv("BREAKER_COOLDOWN_SEC", str(6 * 3600)))
+BREAKER_MAX_COOLDOWN_SEC = int(os.getenv("BREAKER_MAX_COOLDOWN_SEC", str(7 * 24 * 3600)))
+BREAKER_STATES = ("closed", "open", "half_open")
+
+
+def breaker(site, now=None):
+    """사이트 회로 차단기 상태 {state, failures, opened_at, retry_at, cooldown}"""
+    data = dict(_read(connect(), f"site:{site}").get("breaker") or {})
+    data.setdefault("failures", 0)
+    if data.get("retry_at") is None:
+        data["state"] = "closed"
+    elif (now or time.time()) >= data["retry_at"]:
+        data["state"] = "half_open"
+    else:
+        data["state"] = "open"
+    return data
+
+
+def breaker_state(site, now=None):
+    """closed(정상) / open(건너뜀) / half_open(다음 실행에서 한 번 시도)"""
+    return breaker(site, now)["state"]
+
+
+def record_breaker(site, ok, now=None):
+    """크롤링 결과 반영 → 바뀐 차단기 상태. 성공이면 닫고, 실패가 쌓이면 연다"""
+    now = now or time.time()
+    name = f"site:{site}"
+    conn = connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        data = _read(conn, name)
+        prev = data.get("breaker") or {}
+        if ok:
+            cur = {"failures": 0}
+        else:
+            failures = prev.get("failures", 0) + 1
+            cur = {"failures": failures}
+            if prev.get("retry_at") is not None:
+                # 반열림 시도도 실패 → 대기 시간을 늘려서 다시 연다
+                cooldown = min(prev.get("cooldown", BREAKER_COOLDOWN_SEC) * 2, BREAKER_MAX_COOLDOWN_SEC)
+                cur.update(opened_at=prev.get("opened_at") or now, cooldown=cooldown, retry_at=now + cooldown)
+            elif failures >= BREAKER_FAILURES:
+                cur.update(opened_at=now, cooldown=BREAKER_COOLDOWN_SEC, retry_at=now + BREAKER_COOLDOWN_SEC)
+        data["breaker"] = cur
+        _write(conn, name, data)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return breaker(site, now)
+
+
+def reset_breaker(site):
+    """차단기를 닫는다 (사이트를 고친 뒤 바로 다시 돌릴 때)"""
+    update_status(f"site:{site}", breaker={"failures": 0})
+
+
+# 🔹 사이트별 소요 시간 기록 (run_all.py가 오래 걸릴 사이트부터 돌리는 데 쓴다)
+
+DURATIONS_KEEP = 20
+DURATION_ALPHA = 0.3  # 이동 평균 가중치 (최근 실행 비중)
+
+
+def record_duration(site, seconds):
+    """사이트 한 번 실행한 시간(초) 기록 → 갱신된 통계"""
+    name = f"site:{site}"
+    conn = connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        data = _read(conn, name)
+        hist = data.get("durations") or {}
+        samples = (hist.get("samples") or [])[-(DURATIONS_KEEP - 1):] + [round(seconds, 2)]
+        ewma = hist.get("ewma")
+        ewma = seconds if ewma is None else DURATION_ALPHA * seconds + (1 - DURATION_ALPHA) * ewma
+        data["durations"] = {"samples": samples, "ewma": round(ewma, 2)}
+        _write(conn, name, data)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return duration_stats(site)
+
+
+def duration_stats(site):
+    """{n, ewma, p90} (기록이 없으면 n=0, 나머지 None)"""
+    hist = _read(connect(), f"site:{site}").get("durations") or {}
+    samples = sorted(hist.get("samples") or [])
+    if not samples:
+        return {"n": 0, "ewma": None, "p90": None}
+    p90 = samples[max(0, -(-len(samples) * 9 // 10) - 1)]  # nearest-rank
+    return {"n": len(samples), "ewma": hist.get("ewma"), "p90": p90}
+
+
+# 🔹 진행 이벤트 로그 (SSE용, 모든 워커가 같은 테이블을 tail 한다)
+
+EVENTS_KEEP = 5000
+
+
+def append_event(event):
+    """이벤트 dict 저장 후 id 반환. 오래된 이벤트는 EVENTS_KEEP개만 남긴다."""
+    conn = connect()
+    cur = conn.execute(
+        "INSERT INTO events (ts, data) VALUES (?, ?)",
+        (event.get('ts') or time.time(), json.dumps(event, ensure_ascii=False))
+    )
+    event_id = cur.lastrowid
+    if event_id % 500 == 0:
+        conn.execute("DELETE FROM events WHERE id <= ?", (event_id - EVENTS_KEEP,))
+    return event_id
+
+
+def events_since(last_id, limit=500):
+    """last_id 이후 이벤트 [(id, json문자열), ...]"""
+    return connect().execute(
+        "SELECT id, data FROM events WHERE id > ? ORDER BY id LIMIT ?", (last_id, limit)
+    ).fetchall()
+
+
+def last_event_id():
+    row = connect().execute("SELECT MAX(id) FROM events").fetchone()
+    return row[0] or 0
+
+
+# 🔹 락
+
+def _lock_path(name):
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    return os.path.join(LOCK_DIR, f"{safe}.lock")
+
+
+def acquire_lock(name=ALL):
+    """락 획득 시 fd 반환, 이미 잡혀 있으면 None.
+    fd를 subprocess에 pass_fds로 넘기면 자식이 살아있는 동안 락이 유지된다."""
+    fd = os.open(_lock_path(name), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def release_lock(fd):
+    """락을 풀고 fd를 닫는다. 같은 fd를 물려받은 자식이 아직 살아 있어도 풀리므로 자식이 다 끝난 뒤에만"""
+    if fd is None:
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def close_lock(fd):
+    """락은 풀지 않고 이 프로세스의 fd만 닫는다.
+    pass_fds로 같은 fd를 물려받은 자식·자손이 모두 끝나야 OS가 락을 푼다"""
+    if fd is not None:
+        os.close(fd)
+
+
+# 🔹 동시 실행 슬롯 (프로세스 사이 세마포어)
+# 전체 실행, 예약·수동 사이트 갱신이 각각 run_all.py 프로세스로 돌아도 Chrome처럼 무거운 크롤러 수는 전체에서 제한한다.
+# 슬롯 i는 락 slot:<pool>:<i> 하나 → 잡은 프로세스가 죽으면 OS가 풀어준다.
+
+def acquire_slot(pool, limit):
+    """pool 슬롯 limit개 중 빈 것 하나를 잡아 fd 반환, 다 차 있으면 None"""
+    for i in range(max(1, limit)):
+        fd = acquire_lock(f"slot:{pool}:{i}")
+        if fd is not None:
+            return fd
+    return None
+
+
+def slots_in_use(pool, limit):
+    return sum(is_locked(f"slot:{pool}:{i}") for i in range(max(1, limit)))
+
+
+def is_locked(name=ALL):
+    fd = os.open(_lock_path(name), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except OSError:
+        return True
+    finally:
+        os.close(fd)  # close 시 잡았던 공유 락도 같이 풀린다
+    return False
@@ -0,0 +1,17 @@
+# 운영용 gunicorn 설정: gunicorn -c gunicorn.conf.py server:app  (또는 python server.py --prod)
+# 크롤링 상태/락은 crawl_state(SQLite + 파일 락)에 있으므로 워커를 여러 개 띄워도 안전하다.
+import os
+import multiprocessing
+
+bind = os.getenv("BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+
+# 크롤링은 워커 안의 백그라운드 스레드로 돌고, /api/status/stream(SSE)은 연결마다 스레드를 하나 붙잡으므로
+# 스레드 워커를 쓴다. SSE는 SSE_MAX_SEC(기본 300초)마다 끊고 브라우저가 다시 붙으므로 스레드를 영영 잡지는 않지만,
+# 관리자 탭을 여러 개 띄우면 THREADS를 늘린다.
+worker_class = "gthread"
+threads = int(os.getenv("THREADS", "4"))
+
+timeout = 120
+graceful_timeout = 30
+accesslog = "-"
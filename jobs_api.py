@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+/api/jobs 조회 로직.
+
+- 게시된 현재 버전(publish.current_dir(), 없으면 normalized/)의 <site>.json 을
+  데이터 버전(crawl_state.data_version)마다 한 번만 읽는다.
+- 쿼리 결과는 (버전, 정규화된 파라미터) 키로 QueryCache에 JSON bytes로 저장.
+  새 스냅샷이 게시되면 버전이 올라가므로 이전 결과는 더 이상 맞지 않고, 캐시를 비운 뒤
+  인기 쿼리로 바로 다시 채운다(warm). 워커마다 감시 스레드가 버전 변화를 확인한다.
+- 필터/정렬 의미는 index.html의 apply()와 같다.
+- /api/jobs/<id>: 적재할 때 만든 id → 공고 dict 인덱스로 바로 찾는다 (id는 normalize_jobs.posting_id).
+  공고 저장소(posting_store)의 처음/마지막 본 시각, 내려간 시각을 붙이고, 이미 내려간 공고도 저장소에서 찾는다.
+- /api/changes: 저장소의 변경 로그에서 since 이후만 (클라이언트는 응답의 next를 다음 since로 넘긴다).
+- /api/stats/<name>: analytics 롤업 조회. 결과는 같은 QueryCache에 (버전, "stats", 오늘 날짜(KST), ...) 키로
+  (인기 집계에는 넣지 않는다). 조회 기간이 오늘 기준이라 게시가 없어도 날짜가 바뀌면 다시 계산한다.
+"""
+import os, re, json, time, threading
+from datetime import datetime
+
+import analytics
+import crawl_state
+import posting_store
+import publish
+from query_cache import QueryCache
+
+NORMALIZED_DIR = "normalized"
+SORTS = ("deadline", "recent")
+FILTERS = ("all", "urgent", "soon", "normal")
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+WARM_TOP_N = 20
+WATCH_SEC = 2
+
+# 첫 화면(전체, 마감임박순, 1페이지)은 인기 집계가 없어도 항상 미리 채운다
+DEFAULT_PARAMS = (("*",), "", "deadline", "all", 1, PAGE_SIZE)
+
+cache = QueryCache(max_bytes=int(os.getenv("QUERY_CACHE_MB", "32")) * 1024 * 1024)
+
+SOURCE_IDS = []
+_dataset = {"version": None}
+_dataset_lock = threading.Lock()
+_seen_version = None
+_version_lock = threading.Lock()
+
+
+def init(source_ids):
+    """조회 대상 사이트 id 목록 설정 (server.py에서 run_all.JOBS 기준으로 호출)"""
+    SOURCE_IDS[:] = source_ids
+
+
+# 🔹 데이터 적재
+
+def _sort_key_deadline(job):
+    return (job.get("end_dt") is None, job.get("end_dt") or "")
+
+
+def load_dataset(version):
+    jobs = []
+    # current를 한 번만 풀어서 읽는다 → 읽는 도중 새 버전이 게시돼도 사이트끼리 버전이 섞이지 않는다
+    base = publish.current_dir() or NORMALIZED_DIR
+    for site in SOURCE_IDS:
+        path = os.path.join(base, f"{site}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for rec in data if isinstance(data, list) else []:
+            jobs.append({**rec, "source": site})
+    # 정렬은 적재할 때 한 번만: 필터는 순서를 유지하므로 쿼리마다 다시 정렬할 필요가 없다
+    by_recent = sorted(jobs, key=lambda j: j.get("start_dt") or "", reverse=True)
+    by_recent.sort(key=lambda j: j.get("start_dt") is None)
+    return {
+        "version": version,
+        "deadline": sorted(jobs, key=_sort_key_deadline),
+        "recent": by_recent,
+        "by_id": {j["id"]: j for j in jobs if j.get("id")},
+    }
+
+
+def dataset(version):
+    """버전의 데이터셋. 새 dict를 다 만든 뒤 참조만 바꾸므로, 이전 dict를 받아 간 요청은 끝까지 그 버전을 본다"""
+    global _dataset
+    data = _dataset
+    if data["version"] != version:
+        with _dataset_lock:
+            data = _dataset
+            if data["version"] != version:
+                data = _dataset = load_dataset(version)
+    return data
+
+
+# 🔹 쿼리
+
+def normalize_params(args):
+    """요청 파라미터 → 캐시 키로 쓸 튜플 (같은 의미의 요청은 같은 키)"""
+    wanted = {s for s in (args.get("source") or "").split(",") if s in SOURCE_IDS}
+    sources = ("*",) if not wanted or len(wanted) == len(SOURCE_IDS) else tuple(sorted(wanted))
+    q = " ".join((args.get("q") or "").lower().split())
+    sort = args.get("sort") if args.get("sort") in SORTS else "deadline"
+    filt = args.get("filter") if args.get("filter") in FILTERS else "all"
+    try:
+        page = max(1, int(args.get("page") or 1))
+    except ValueError:
+        page = 1
+    try:
+        size = min(MAX_PAGE_SIZE, max(1, int(args.get("size") or PAGE_SIZE)))
+    except ValueError:
+        size = PAGE_SIZE
+    return (sources, q, sort, filt, page, size)
+
+
+DDAY_RE = re.compile(r"D-(\d+)")
+
+
+def _dday_bucket(job):
+    m = DDAY_RE.search(job.get("dday") or "")
+    if not m:
+        return None
+    days = int(m.group(1))
+    if days <= 1:
+        return "urgent"
+    if days <= 5:
+        return "soon"
+    return "normal"
+
+
+def run_query(data, params):
+    sources, q, sort, filt, page, size = params
+    arr = data[sort]
+    if sources != ("*",):
+        arr = [j for j in arr if j["source"] in sources]
+    if q:
+        arr = [j for j in arr if q in str(j.get("title") or "").lower()]
+    if filt != "all":
+        arr = [j for j in arr if _dday_bucket(j) == filt]
+    start = (page - 1) * size
+    body = {
+        "version": data["version"],
+        "total": len(arr),
+        "page": page,
+        "size": size,
+        "items": arr[start:start + size],
+    }
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def query_jobs(args):
+    """(버전, JSON bytes) 반환"""
+    version = crawl_state.data_version()
+    check_version(version)
+    params = normalize_params(args)
+    body = cache.get_or_compute(
+        (version,) + params,
+        lambda: run_query(dataset(version), params),
+        tag=params
+    )
+    return version, body
+
+
+def get_job(job_id):
+    """(버전, 공고 JSON bytes) — 없으면 bytes 대신 None"""
+    version = crawl_state.data_version()
+    check_version(version)
+    job = dataset(version)["by_id"].get(job_id)
+    history = posting_store.get(job_id)
+    if job is None and history is None:
+        return version, None
+    job = {**(history or {}), **(job or {})}  # 현재 게시 버전 내용이 우선, 이력 필드는 저장소에서
+    return version, json.dumps(job, ensure_ascii=False).encode("utf-8")
+
+
+def get_changes(args):
+    """since, source(쉼표 구분), limit → (버전, JSON bytes)"""
+    version = crawl_state.data_version()
+    try:
+        since = max(0, int(args.get("since") or 0))
+    except ValueError:
+        since = 0
+    try:
+        limit = min(posting_store.CHANGES_PAGE, max(1, int(args.get("limit") or posting_store.CHANGES_PAGE)))
+    except ValueError:
+        limit = posting_store.CHANGES_PAGE
+    sources = sorted({s for s in (args.get("source") or "").split(",") if s in SOURCE_IDS})
+    body = posting_store.changes_since(since, limit, sources)
+    return version, json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+STATS_RANGE = {"weekly": ("weeks", 12, 520), "windows": ("weeks", 12, 520), "daily": ("days", 30, 3660)}
+
+
+def get_stats(name, args):
+    """analytics.STATS[name] 결과 → (버전, JSON bytes), 없는 이름이면 bytes 대신 None.
+    source(쉼표 구분), weekly/windows는 weeks, daily는 days"""
+    version = crawl_state.data_version()
+    check_version(version)
+    if name not in analytics.STATS:
+        return version, None
+    sources = tuple(sorted({s for s in (args.get("source") or "").split(",") if s in SOURCE_IDS}))
+    kwargs = {"sources": sources}
+    if name in STATS_RANGE:
+        key, default, most = STATS_RANGE[name]
+        try:
+            kwargs[key] = min(most, max(1, int(args.get(key) or default)))
+        except ValueError:
+            kwargs[key] = default
+    today = datetime.now(analytics.KST).date().isoformat()  # closing/weekly 등은 오늘 기준
+    params = ("stats", name, today) + tuple(sorted(kwargs.items()))
+
+    def compute():
+        result = analytics.STATS[name](**kwargs)  # 목록 또는 {items, ...}
+        body = {"version": version, "stat": name, **(result if isinstance(result, dict) else {"items": result})}
+        return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+    return version, cache.get_or_compute((version,) + params, compute, count=False)
+
+
+# 🔹 무효화 + 미리 채우기
+
+def warm(version):
+    targets = [DEFAULT_PARAMS] + [p for p in cache.popular(WARM_TOP_N) if p != DEFAULT_PARAMS]
+    data = dataset(version)
+    for params in targets:
+        try:
+            cache.get_or_compute((version,) + params, lambda p=params: run_query(data, p), tag=params, count=False)
+        except Exception as e:
+            print(f"⚠️ 캐시 미리 채우기 실패 {params}: {e}")
+
+
+def check_version(version=None):
+    """버전이 바뀌었으면 캐시를 비우고 인기 쿼리로 다시 채운다. 바뀌었으면 True"""
+    global _seen_version
+    version = crawl_state.data_version() if version is None else version
+    if version == _seen_version:
+        return False
+    with _version_lock:
+        if version == _seen_version:
+            return False
+        cache.clear()
+        _seen_version = version
+    threading.Thread(target=warm, args=(version,), daemon=True).start()
+    return True
+
+
+def _watch():
+    while True:
+        try:
+            check_version()
+        except Exception as e:
+            print(f"⚠️ 캐시 버전 확인 실패: {e}")
+        time.sleep(WATCH_SEC)
+
+
+def start_watcher():
+    thread = threading.Thread(target=_watch, name="jobs-cache-watch", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+가벼운 Prometheus 형식 메트릭.
+
+- 값은 프로세스 메모리에 두고(스레드 락 하나), 몇 초마다/종료 시 state/metrics/<pid>.json 으로 내려쓴다.
+- /metrics 는 모든 프로세스 파일 + 자기 프로세스의 현재 값을 합쳐 텍스트 형식으로 내보낸다.
+  (gunicorn 워커, run_all.py, normalize_jobs.py가 각자 쓴 값을 합산)
+- 죽은 프로세스의 파일은 _merged.json 에 합쳐서 카운터가 줄어들지 않게 한다.
+"""
+import os, json, time, atexit, threading
+
+import crawl_state
+
+METRICS_DIR = os.path.join(crawl_state.STATE_DIR, "metrics")
+FLUSH_SEC = 5
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+CRAWL_BUCKETS = (1, 2, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600)
+RSS_BUCKETS = tuple(mb * 1024 * 1024 for mb in (64, 128, 256, 512, 768, 1024, 1536, 2048, 3072, 4096))
+
+# 이름 → (타입, 설명, 버킷)
+METRICS = {
+    "crawl_site_duration_seconds": ("histogram", "사이트별 크롤링 소요 시간", CRAWL_BUCKETS),
+    "crawl_page_fetch_seconds": ("histogram", "페이지 요청(로드) 지연", TIME_BUCKETS),
+    "crawl_bytes_downloaded_total": ("counter", "내려받은 페이지 바이트 수", None),
+    "crawl_pages_total": ("counter", "수집한 페이지 수", None),
+    "crawl_items_parsed_total": ("counter", "파싱한 공고 수", None),
+    "crawl_failures_total": ("counter", "크롤링 실패 수 (reason별)", None),
+    "crawl_breaker_skips_total": ("counter", "회로 차단으로 건너뛴 사이트 실행 수", None),
+    "crawl_breaker_transitions_total": ("counter", "회로 차단기 상태 변경 수 (바뀐 state별)", None),
+    "crawl_site_peak_rss_bytes": ("histogram", "크롤러 프로세스 트리 최대 RSS", RSS_BUCKETS),
+    "crawl_site_cpu_seconds_total": ("counter", "크롤러 프로세스 트리 CPU 시간", None),
+    "normalize_file_seconds": ("histogram", "파일별 정규화 소요 시간", TIME_BUCKETS),
+    "normalize_records_total": ("counter", "정규화한 레코드 수", None),
+    "normalize_stale_total": ("counter", "이전 스냅샷을 유지한(stale) 사이트 수", None),
+    "http_request_duration_seconds": ("histogram", "Flask 라우트 응답 시간", TIME_BUCKETS),
+    "http_requests_total": ("counter", "Flask 요청 수 (status별)", None),
+}
+
+_lock = threading.Lock()
+_counters = {}   # (name, labels) -> float
+_hists = {}      # (name, labels) -> [버킷별 개수..., sum, count]
+_dirty = False
+_flusher = None
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name, value=1, **labels):
+    global _dirty
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+        _dirty = True
+    _ensure_flusher()
+
+
+def observe(name, value, **labels):
+    global _dirty
+    buckets = METRICS[name][2]
+    key = _key(name, labels)
+    with _lock:
+        h = _hists.get(key)
+        if h is None:
+            h = _hists[key] = [0] * len(buckets) + [0.0, 0]
+        for i, le in enumerate(buckets):
+            if value <= le:
+                h[i] += 1
+        h[-2] += value
+        h[-1] += 1
+        _dirty = True
+    _ensure_flusher()
+
+
+# 🔹 파일로 내려쓰기
+
+def _snapshot():
+    with _lock:
+        return {
+            "counters": [[n, list(l), v] for (n, l), v in _counters.items()],
+            "hists": [[n, list(l), list(h)] for (n, l), h in _hists.items()],
+        }
+
+
+def _write_json(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def flush():
+    global _dirty
+    if not _dirty:
+        return
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    _dirty = False
+    _write_json(os.path.join(METRICS_DIR, f"{os.getpid()}.json"), _snapshot())
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_SEC)
+        try:
+            flush()
+        except Exception as e:
+            print(f"⚠️ 메트릭 저장 실패: {e}")
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher[0] == os.getpid():
+        return
+    thread = threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True)
+    _flusher = (os.getpid(), thread)
+    thread.start()
+
+
+def _reset_after_fork():
+    # fork된 자식이 부모 값을 물려받아 두 번 세지 않도록
+    global _lock, _dirty
+    _lock = threading.Lock()
+    _counters.clear()
+    _hists.clear()
+    _dirty = False
+
+
+atexit.register(flush)
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+# 🔹 합산 + 텍스트 출력
+
+def _merge(total, data):
+    for name, labels, value in data.get("counters", []):
+        key = (name, tuple(tuple(x) for x in labels))
+        total["counters"][key] = total["counters"].get(key, 0) + value
+    for name, labels, h in data.get("hists", []):
+        key = (name, tuple(tuple(x) for x in labels))
+        cur = total["hists"].get(key)
+        total["hists"][key] = list(h) if cur is None else [a + b for a, b in zip(cur, h)]
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compact():
+    """죽은 프로세스 파일을 _merged.json 에 합치고 지운다"""
+    if not os.path.isdir(METRICS_DIR):
+        return
+    lock_fd = crawl_state.acquire_lock("metrics")
+    if lock_fd is None:
+        return
+    try:
+        merged_path = os.path.join(METRICS_DIR, "_merged.json")
+        total = {"counters": {}, "hists": {}}
+        _merge(total, _read_json(merged_path))
+        dead = []
+        for fname in os.listdir(METRICS_DIR):
+            stem = fname[:-len(".json")] if fname.endswith(".json") else ""
+            if stem.isdigit() and not _alive(int(stem)):
+                _merge(total, _read_json(os.path.join(METRICS_DIR, fname)))
+                dead.append(fname)
+        if not dead:
+            return
+        _write_json(merged_path, {
+            "counters": [[n, list(l), v] for (n, l), v in total["counters"].items()],
+            "hists": [[n, list(l), h] for (n, l), h in total["hists"].items()],
+        })
+        for fname in dead:
+            os.remove(os.path.join(METRICS_DIR, fname))
+    finally:
+        crawl_state.release_lock(lock_fd)
+
+
+def collect():
+    """모든 프로세스 값 합산 {"counters": {key: v}, "hists": {key: h}}"""
+    compact()
+    total = {"counters": {}, "hists": {}}
+    own = f"{os.getpid()}.json"
+    if os.path.isdir(METRICS_DIR):
+        for fname in sorted(os.listdir(METRICS_DIR)):
+            if fname.endswith(".json") and fname != own:
+                _merge(total, _read_json(os.path.join(METRICS_DIR, fname)))
+    _merge(total, _snapshot())  # 자기 프로세스는 파일 대신 현재 값
+    return total
+
+
+def _fmt_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+
+def _fmt_num(v):
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def render(extra_lines=()):
+    """Prometheus 텍스트 형식"""
+    total = collect()
+    lines = []
+    for name, (kind, help_text, buckets) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (n, labels), v in sorted(total["counters"].items()):
+                if n == name:
+                    lines.append(f"{name}{_fmt_labels(labels)} {_fmt_num(v)}")
+        else:
+            for (n, labels), h in sorted(total["hists"].items()):
+                if n != name:
+                    continue
+                for le, c in zip(buckets, h):
+                    lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', le)])} {c}")
+                lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {h[-1]}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_num(h[-2])}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {h[-1]}")
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
@@ -1,9 +1,27 @@
 # -*- coding: utf-8 -*-
-import os, re, sys, json, glob
+import os, re, sys, json, glob, time, hashlib
 from datetime import datetime, timezone, timedelta
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import analytics
+import archive
+import crawl_state
+import metrics
+import posting_store
+import publish
+import tracing
 
 KST = timezone(timedelta(hours=9))
-KEEP_KEYS = {"title", "start_dt", "end_dt", "dday", "detail_url"}
+KEEP_KEYS = {"id", "title", "start_dt", "end_dt", "dday", "detail_url"}
+
+# 공고 id: 사이트 공고 번호(스크래퍼가 recu_idx/announce_sn 등으로 내보냄) → 상세 URL → 제목+기간 순으로
+# 가장 강한 키를 골라 "<사이트>-<해시 12자리>". 같은 공고는 실행이 바뀌어도 같은 id (API 조회, 중복 제거, 변경 비교 기준)
+ID_FIELDS = ("recu_idx", "announce_sn", "jobnoticeSn", "seq")
+
+# 사이트별 스냅샷 유지: 크롤링이 실패했거나 결과가 이상하면 새 결과 대신 마지막 정상 스냅샷을 stale로 계속 게시
+STALE_DROP_RATIO = float(os.getenv("STALE_DROP_RATIO", "0.5"))  # 이전보다 이 비율 넘게 줄면 이상
+STALE_MIN_ITEMS = int(os.getenv("STALE_MIN_ITEMS", "5"))        # 이전 건수가 이보다 적으면 감소는 보지 않음
+STALE_ACCEPT_RUNS = int(os.getenv("STALE_ACCEPT_RUNS", "3"))    # 급감·0건이 이만큼 연달아 나오면 실제 변화로 보고 게시
 
 def parse_dt_kst(s: str):
     """다양한 포맷을 KST aware datetime으로 파싱"""
@@ -55,7 +73,29 @@ def compute_dday(sdt, edt):
         return f"D-{d}" if d >= 0 else f"D+{abs(d)}"
     return None
 
-def normalize_record(rec: dict):
+def canonical_url(url):
+    """같은 주소면 같은 문자열로: 호스트 소문자, 쿼리 파라미터 정렬, #fragment 제거"""
+    u = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(u.query, keep_blank_values=True)))
+    return urlunsplit((u.scheme.lower(), u.netloc.lower(), u.path, query, ""))
+
+def posting_key(rec: dict):
+    """공고를 가리키는 가장 강한 키 (정규화 전 원본 레코드 기준)"""
+    ids = [str(rec[f]) for f in ID_FIELDS if rec.get(f)]
+    if ids:
+        return "sn:" + "|".join(ids)
+    url = rec.get("detail_url") or rec.get("url") or rec.get("link")
+    if url:
+        return "url:" + canonical_url(url)
+    title = rec.get("title") or rec.get("subject") or rec.get("name") or ""
+    period = rec.get("start_dt") or rec.get("period_text") or rec.get("date_text") or rec.get("period") or rec.get("date") or ""
+    return f"title:{title}|{period}"
+
+def posting_id(site, key):
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=6).hexdigest()
+    return f"{site}-{digest}" if site else digest
+
+def normalize_record(rec: dict, site=""):
     # 1) 기본 키 매핑
     title = rec.get("title") or rec.get("subject") or rec.get("name")
 
@@ -84,36 +124,66 @@ def normalize_record(rec: dict):
     # 4) detail_url 후보
     detail_url = rec.get("detail_url") or rec.get("url") or rec.get("link")
 
-    return {
+    out = {
+        "id": posting_id(site, posting_key(rec)),
         "title": title,
         "start_dt": s_iso,
         "end_dt": e_iso,
         "dday": dday,
         "detail_url": detail_url
     }
+    # 5) 증분 수집이 이전 결과에서 이어 붙인 공고 (posting_store가 last_seen을 올리지 않고 떼어 낸다)
+    if rec.get("carried"):
+        out["carried"] = True
+    return out
 
-def normalize_file(in_path, out_path=None):
+def normalize_records(in_path):
+    """json/<site>.json → 정규화 레코드 목록 (리스트 JSON이 아니면 None)"""
     with open(in_path, "r", encoding="utf-8") as f:
         data = json.load(f)
 
     if not isinstance(data, list):
         print(f"⚠️ 리스트 JSON이 아님: {in_path}")
-        return
+        return None
 
-    norm = [normalize_record(r) for r in data]
+    site = os.path.basename(in_path).rsplit(".", 1)[0]
+    norm = [normalize_record(r, site) for r in data]
+    unique_ids(norm, data, site)
+    return norm
+
+def normalize_file(in_path, out_path=None):
+    norm = normalize_records(in_path)
+    if norm is None:
+        return
+    site = os.path.basename(in_path).rsplit(".", 1)[0]
 
     # ✅ GitHub Actions에서도 작동하도록 상대 경로로 변경
     if out_path is None:
-        base = os.path.basename(in_path).rsplit(".", 1)[0]
+        base = site
         # 현재 작업 디렉토리 기준 normalized 폴더
         out_dir = os.path.join(os.getcwd(), "normalized")
         os.makedirs(out_dir, exist_ok=True)
         out_path = os.path.join(out_dir, f"{base}.json")
 
-    with open(out_path, "w", encoding="utf-8") as f:
+    # 임시 파일에 다 쓴 뒤 교체: 읽는 쪽이 반쯤 쓴 파일을 보지 않고, 하드링크로 공유하는 이전 버전(publish.py)도 그대로
+    tmp_path = os.path.join(os.path.dirname(out_path), f".{os.path.basename(out_path)}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
         json.dump(norm, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, out_path)
 
     print(f"✅ {os.path.basename(in_path)} → {out_path} ({len(norm)}건)")
+    return len(norm)
+
+def unique_ids(norm, data, site):
+    """한 파일 안에서 id가 겹치면(상세 URL이 목록 주소로 다 같은 경우 등) 제목·기간까지 넣어 다시 만든다"""
+    taken = set()
+    for out, rec in zip(norm, data):
+        if out["id"] in taken:
+            base = posting_id(site, f"{posting_key(rec)}|{out['title']}|{out['start_dt']}|{out['end_dt']}")
+            out["id"], n = base, 2
+            while out["id"] in taken:
+                out["id"], n = f"{base}-{n}", n + 1
+        taken.add(out["id"])
 
 def expand_targets(args):
     targets = []
@@ -127,6 +197,117 @@ def expand_targets(args):
             print(f"무시: {a}")
     return targets
 
+def crawl_failure(site):
+    """이번 크롤링이 실패/중단됐으면 사유, 아니면 None (run_all.py가 crawl_state의 site:<id>에 남긴 기록)"""
+    st = crawl_state.get_status(f"site:{site}")
+    started, finished = st.get("crawl_started_at"), st.get("crawl_finished_at")
+    breaker = st.get("breaker") or {}
+    if breaker.get("retry_at") is not None and time.time() < breaker["retry_at"]:
+        # 회로 차단으로 이번 크롤링을 건너뜀
+        return f"연속 {breaker.get('failures', 0)}회 실패로 차단 중 (마지막 오류: {st.get('error') or '-'})"
+    if not started:
+        return None  # 크롤링 기록 없음 (json을 직접 넣은 경우 등)
+    if not finished or finished < started:
+        return "크롤링이 끝나지 않음 (시간 초과/중단)"
+    if not st.get("crawl_ok"):
+        return st.get("error") or "크롤링 실패"
+    return None
+
+def count_items(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return len(data) if isinstance(data, list) else None
+    except (OSError, ValueError):
+        return None
+
+def judge(count, prev_count, prev):
+    """새 결과(count건)를 게시할지 → (게시 여부, 안 하면 사유)"""
+    if not prev_count:
+        return True, None
+    # 0건도 급감과 같이 센다: 정말 채용 공고가 없어진 병원이면 STALE_ACCEPT_RUNS번째에 빈 결과를 게시한다
+    # (그래야 이전 공고가 stale로 계속 보이지 않고 공고 저장소에서도 내려간다)
+    if count == 0 or (prev_count >= STALE_MIN_ITEMS and count < prev_count * (1 - STALE_DROP_RATIO)):
+        if prev.get("anomaly_runs", 0) + 1 < STALE_ACCEPT_RUNS:
+            return False, f"결과 0건 (이전 {prev_count}건)" if count == 0 else f"건수 급감 {prev_count}→{count}건"
+    return True, None
+
+def normalize_into(fp, staging, previous):
+    """fp를 정규화해서 공고 저장소(posting_store)에 반영하고 staging/<site>.json 으로 내보낸다. 실패/이상이면 이전 스냅샷(하드링크)을 그대로 둔다.
+    반환: (정규화 건수, manifest sources 항목)"""
+    site = os.path.basename(fp).rsplit(".", 1)[0]
+    out_path = os.path.join(staging, f"{site}.json")
+    prev = previous.get(site) or {}
+    has_prev = os.path.exists(out_path)
+    prev_count = prev.get("items") if prev.get("items") is not None else (count_items(out_path) if has_prev else None)
+    now = time.time()
+
+    def keep(reason, **extra):
+        print(f"⏳ {site}: {reason} → 이전 스냅샷 유지 ({prev_count}건)")
+        return {
+            "items": prev_count, "updated_at": prev.get("updated_at") or os.path.getmtime(out_path),
+            "stale": True, "reason": reason, "stale_since": prev.get("stale_since") or now, **extra,
+        }
+
+    failure = crawl_failure(site)
+    if failure and has_prev:
+        return None, keep(failure)
+
+    norm = normalize_records(fp)
+    if norm is None:
+        if has_prev:
+            return None, keep("결과 파일이 리스트 JSON이 아님")
+        return None, None
+    count = len(norm)
+    ok, reason = judge(count, prev_count, prev) if has_prev else (True, None)
+    if not ok:
+        # 급감·0건이 연달아 몇 번 나오는지 센다 (STALE_ACCEPT_RUNS)
+        return count, keep(reason, anomaly_runs=prev.get("anomaly_runs", 0) + 1)
+    # 새 스냅샷은 공고 저장소에 반영(처음/마지막 본 시각, 내려간 공고)하고, 게시 파일은 저장소에서 내보낸다
+    saved = posting_store.save_site(site, norm, now)
+    posting_store.export_site(site, out_path)
+    try:
+        archive.append_site(site, norm, now)  # 추세 분석용 아카이브 (바뀐 행만)
+    except Exception as e:
+        print(f"⚠️ {site}: 아카이브 기록 실패 ({e})")
+    try:
+        analytics.refresh()  # /api/stats 롤업에 이번 변경 반영
+    except Exception as e:
+        print(f"⚠️ {site}: 통계 집계 실패 ({e})")
+    print(f"✅ {os.path.basename(fp)} → {site}.json ({count}건, 새 공고 {saved['added']}건, 변경 {saved['changed']}건, 내려감 {saved['closed']}건)")
+    entry = {"items": count, "updated_at": now, "stale": False}
+    if failure:  # 이전 스냅샷이 없어서 실패한 실행의 결과라도 게시
+        entry.update(stale=True, reason=failure, stale_since=now)
+    return count, entry
+
+def publish_files(files):
+    """files를 정규화해서 새 버전 하나로 게시 → manifest sources (이번에 다시 정한 사이트만)
+    run_all.py는 사이트 크롤링이 끝날 때마다 그 사이트 파일로 부른다"""
+    traced = tracing.active()
+    # 스테이징 디렉터리에 정규화 → 블록이 끝나면 새 버전으로 게시 (current 교체 + 데이터 버전 증가)
+    # 사이트마다 따로 판단하므로 한 사이트가 실패해도 나머지는 새로 게시된다
+    sources = {}
+    with publish.release(sources) as staging:
+        previous = publish.current_manifest().get("sources") or {}
+        for fp in files:
+            site = os.path.basename(fp).rsplit(".", 1)[0]
+            started = time.time()
+            count, entry = normalize_into(fp, staging, previous)
+            elapsed = time.time() - started
+            stale = bool(entry and entry["stale"])
+            if entry is not None:
+                sources[site] = entry
+            metrics.observe("normalize_file_seconds", elapsed, file=os.path.basename(fp))
+            metrics.inc("normalize_records_total", count or 0)
+            if stale:
+                metrics.inc("normalize_stale_total", site=site)
+            if traced:
+                tracing.record("normalize_file", started, elapsed, file=os.path.basename(fp), records=count, stale=stale)
+        started = time.time()
+    if traced:
+        tracing.record("publish", started, time.time() - started)
+    return sources
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("사용법: python normalize_jobs.py <json파일 또는 폴더> [...]")
@@ -135,5 +316,4 @@ if __name__ == "__main__":
     if not files:
         print("처리할 JSON이 없습니다.")
         sys.exit(0)
-    for fp in files:
-        normalize_file(fp)
+    publish_files(files)
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+공고 저장소: 정규화한 공고를 id(normalize_jobs.posting_id)별 한 행으로 SQLite(state/postings.db)에 쌓는다.
+
+- 사이트 스냅샷이 새로 게시될 때마다(normalize_jobs.normalize_into) 그 사이트 공고를 한 트랜잭션으로 upsert.
+  처음 본 시각(first_seen), 마지막으로 본 시각(last_seen)을 남기고,
+  이번 스냅샷에서 빠진 공고는 closed_at을 찍는다 (다시 나오면 closed_at을 지운다).
+- stale로 이전 스냅샷을 이어 쓰는 경우(크롤링 실패, 건수 급감)는 저장하지 않는다 → 실패 때문에 닫히는 공고가 없다.
+- 증분 수집이 중간에 멈추고 이전 결과에서 이어 붙인 공고(carried)는 열린 채로 두되 last_seen은 올리지 않는다
+  (이번에 다시 확인한 공고가 아니므로). 저장·게시하는 레코드에는 carried를 남기지 않는다.
+- 게시되는 <site>.json 은 이 저장소에서 내보낸다 (export_site: 열린 공고를 마지막 크롤링 순서대로).
+- 서버(jobs_api.get_job)는 여기서 이력과 이미 내려간 공고를 찾는다.
+- 저장할 때 이전 스냅샷과 공고별로 비교한 변경(added/changed/reopened/closed)을 changes 테이블에
+  계속 덧붙인다. seq는 계속 커지므로 /api/changes?since=<seq> 는 마지막으로 본 seq 이후만 돌려준다.
+  changed는 CHANGE_FIELDS 중 바뀐 필드만 {필드: [이전, 이후]} (dday는 날마다 바뀌므로 보지 않는다).
+- 게시 락(publish.release) 안에서만 쓰므로 쓰는 쪽은 항상 하나, 읽는 쪽은 WAL이라 막히지 않는다.
+- publish.py rollback은 게시 버전만 되돌린다 (저장소 이력은 그대로).
+
+    python posting_store.py stats
+    python posting_store.py import normalized/       # 기존 정규화 파일로 처음 채우기
+    python posting_store.py show <공고 id>
+"""
+import os, sys, json, time, glob, sqlite3, threading
+
+import crawl_state
+
+DB_PATH = os.getenv("POSTINGS_DB", os.path.join(crawl_state.STATE_DIR, "postings.db"))
+CHANGE_FIELDS = ("title", "start_dt", "end_dt", "detail_url")
+CHANGE_KINDS = ("added", "changed", "reopened", "closed")
+CHANGES_PAGE = 500
+
+_local = threading.local()
+
+
+def connect():
+    """프로세스·스레드별 SQLite 연결 (fork 이후에는 새로 연다)"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "pid", None) == os.getpid():
+        return conn
+    os.makedirs(os.path.dirname(os.path.abspath(DB_PATH)), exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS postings ("
+        " id TEXT PRIMARY KEY, source TEXT NOT NULL,"
+        " title TEXT, start_dt TEXT, end_dt TEXT, detail_url TEXT,"
+        " data TEXT NOT NULL,"        # 정규화 레코드 JSON (내보낼 때 그대로 쓴다)
+        " pos INTEGER,"               # 마지막 스냅샷에서의 순서
+        " first_seen REAL NOT NULL, last_seen REAL NOT NULL, closed_at REAL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS postings_source ON postings (source, closed_at, pos)")
+    conn.execute("CREATE INDEX IF NOT EXISTS postings_end_dt ON postings (end_dt)")
+    conn.execute("CREATE INDEX IF NOT EXISTS postings_first_seen ON postings (first_seen)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS changes ("
+        " seq INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, source TEXT NOT NULL,"
+        " posting_id TEXT NOT NULL, kind TEXT NOT NULL, data TEXT NOT NULL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS changes_source ON changes (source, seq)")
+    _local.conn, _local.pid = conn, os.getpid()
+    return conn
+
+
+# 🔹 쓰기
+
+def diff_site(conn, site, records):
+    """저장된 site 공고와 새 스냅샷 비교 → [(공고 id, kind, 내용 dict), ...]"""
+    cols = ", ".join(CHANGE_FIELDS)
+    stored = {
+        row[0]: row[1:] for row in
+        conn.execute(f"SELECT id, closed_at, {cols} FROM postings WHERE source = ?", (site,))
+    }
+    changes, seen = [], set()
+    for rec in records:
+        pid = rec.get("id")
+        if not pid or pid in seen:
+            continue
+        seen.add(pid)
+        row = stored.get(pid)
+        if row is None:
+            changes.append((pid, "added", {"posting": rec}))
+            continue
+        closed_at, old = row[0], dict(zip(CHANGE_FIELDS, row[1:]))
+        fields = {f: [old[f], rec.get(f)] for f in CHANGE_FIELDS if old[f] != rec.get(f)}
+        if closed_at is not None:
+            changes.append((pid, "reopened", {"posting": rec, **({"fields": fields} if fields else {})}))
+        elif fields:
+            changes.append((pid, "changed", {"posting": rec, "fields": fields}))
+    for pid, row in stored.items():
+        if row[0] is None and pid not in seen:
+            changes.append((pid, "closed", {"title": row[1 + CHANGE_FIELDS.index("title")]}))
+    return changes
+
+
+def save_site(site, records, now=None):
+    """site의 새 스냅샷(정규화 레코드 목록)을 반영하고 변경을 기록 → {items, added, changed, reopened, closed}"""
+    now = now or time.time()
+    carried = {rec["id"] for rec in records if rec.get("carried") and rec.get("id")}
+    records = [{k: v for k, v in rec.items() if k != "carried"} for rec in records]
+    conn = connect()
+    rows = [
+        (rec["id"], site, rec.get("title"), rec.get("start_dt"), rec.get("end_dt"), rec.get("detail_url"),
+         json.dumps(rec, ensure_ascii=False), pos, now, now)
+        for pos, rec in enumerate(records) if rec.get("id")
+    ]
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        changes = diff_site(conn, site, records)
+        carried_seen = conn.execute(
+            f"SELECT last_seen, id FROM postings WHERE id IN ({','.join('?' * len(carried))})", tuple(carried)
+        ).fetchall() if carried else []
+        conn.executemany(
+            "INSERT INTO changes (ts, source, posting_id, kind, data) VALUES (?, ?, ?, ?, ?)",
+            [(now, site, pid, kind, json.dumps(body, ensure_ascii=False)) for pid, kind, body in changes]
+        )
+        conn.executemany(
+            "INSERT INTO postings (id, source, title, start_dt, end_dt, detail_url, data, pos, first_seen, last_seen)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(id) DO UPDATE SET source = excluded.source, title = excluded.title,"
+            " start_dt = excluded.start_dt, end_dt = excluded.end_dt, detail_url = excluded.detail_url,"
+            " data = excluded.data, pos = excluded.pos, last_seen = excluded.last_seen, closed_at = NULL",
+            rows
+        )
+        conn.execute(
+            "UPDATE postings SET closed_at = ?, pos = NULL WHERE source = ? AND closed_at IS NULL AND last_seen < ?",
+            (now, site, now)
+        )
+        # 이어 붙인 공고는 마지막으로 실제로 본 시각을 되돌린다 (위에서 닫지 않도록 닫은 뒤에)
+        conn.executemany("UPDATE postings SET last_seen = ? WHERE id = ?", carried_seen)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    counts = {kind: 0 for kind in CHANGE_KINDS}
+    for _, kind, _ in changes:
+        counts[kind] += 1
+    return {"items": len(rows), **counts}
+
+
+def export_site(site, path):
+    """열린 공고를 normalized/<site>.json 과 같은 모양으로 path에 쓴다 → 건수.
+    임시 파일에 쓰고 교체하므로 하드링크로 공유하는 이전 게시 버전은 바뀌지 않는다"""
+    records = site_records(site)
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def import_dir(path, now=None):
+    """정규화 파일 폴더(normalized/ 등)로 저장소를 채운다 (처음 도입할 때). 파일 수정 시각을 본 시각으로"""
+    results = {}
+    for fp in sorted(glob.glob(os.path.join(path, "*.json"))):
+        site = os.path.basename(fp).rsplit(".", 1)[0]
+        try:
+            with open(fp, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(data, list) or not all(isinstance(r, dict) and r.get("id") for r in data):
+            continue  # manifest.json, id가 없는 예전 파일
+        results[site] = save_site(site, data, now or os.path.getmtime(fp))
+    return results
+
+
+# 🔹 조회
+
+def site_records(site):
+    """site의 열린 공고 (마지막 스냅샷 순서)"""
+    rows = connect().execute(
+        "SELECT data FROM postings WHERE source = ? AND closed_at IS NULL ORDER BY pos", (site,)
+    ).fetchall()
+    return [json.loads(data) for (data,) in rows]
+
+
+def get(posting_id):
+    """공고 하나 + 이력 {..., source, first_seen, last_seen, closed_at} (없으면 None)"""
+    row = connect().execute(
+        "SELECT data, source, first_seen, last_seen, closed_at FROM postings WHERE id = ?", (posting_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    data, source, first_seen, last_seen, closed_at = row
+    return {**json.loads(data), "source": source,
+            "first_seen": first_seen, "last_seen": last_seen, "closed_at": closed_at}
+
+
+def changes_since(since=0, limit=CHANGES_PAGE, sources=None):
+    """seq가 since보다 큰 변경 → {since, next, latest, more, reset, changes}
+    next: 다음에 since로 넘길 값, more: limit에 걸려서 더 남았는지, latest: 지금까지의 마지막 seq,
+    reset: since가 latest보다 크다 (저장소를 새로 만든 경우 → 전체 스냅샷부터 다시 받아야 한다)"""
+    conn = connect()
+    sql, params = "SELECT seq, ts, source, posting_id, kind, data FROM changes WHERE seq > ?", [since]
+    if sources:
+        sql += f" AND source IN ({','.join('?' * len(sources))})"
+        params += list(sources)
+    rows = conn.execute(sql + " ORDER BY seq LIMIT ?", params + [limit + 1]).fetchall()
+    more = len(rows) > limit
+    rows = rows[:limit]
+    latest = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+    return {
+        "since": since,
+        "next": rows[-1][0] if rows else latest,
+        "latest": latest,
+        "more": more,
+        "reset": since > latest,
+        "changes": [{"seq": seq, "ts": ts, "source": source, "id": pid, "kind": kind, **json.loads(data)}
+                    for seq, ts, source, pid, kind, data in rows],
+    }
+
+
+def stats():
+    """사이트별 {total, open, first_seen, last_seen}"""
+    rows = connect().execute(
+        "SELECT source, COUNT(*), SUM(closed_at IS NULL), MIN(first_seen), MAX(last_seen)"
+        " FROM postings GROUP BY source ORDER BY source"
+    ).fetchall()
+    return {source: {"total": total, "open": opened, "first_seen": first, "last_seen": last}
+            for source, total, opened, first, last in rows}
+
+
+def _fmt(ts):
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(ts)) if ts else "-"
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if cmd == "stats":
+        for source, s in stats().items():
+            print(f"{source:<16} 열림 {s['open']:>5} / 전체 {s['total']:>6}  {_fmt(s['first_seen'])} ~ {_fmt(s['last_seen'])}")
+    elif cmd == "import" and len(sys.argv) > 2:
+        for site, r in import_dir(sys.argv[2]).items():
+            print(f"✅ {site}: {r['items']}건 (새 공고 {r['added']}건)")
+    elif cmd == "show" and len(sys.argv) > 2:
+        rec = get(sys.argv[2])
+        if rec is None:
+            print(f"❌ 공고 없음: {sys.argv[2]}")
+            sys.exit(1)
+        print(json.dumps(rec, ensure_ascii=False, indent=2))
+    else:
+        print("사용법: python posting_store.py [stats | import <폴더> | show <공고 id>]")
+        sys.exit(1)
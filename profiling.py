@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+사이트별 크롤링 리소스 측정 + 실행 리포트.
+
+- 최대 RSS: 크롤러 프로세스와 그 자식들(chromedriver, Chrome 렌더러 등) 전체 트리의 RSS 합을
+  SAMPLE_SEC마다 재서 가장 큰 값. psutil이 있으면 쓰고, 없으면 리눅스 /proc 을 직접 읽는다.
+- CPU 시간: run_all.py가 크롤러를 os.wait4로 회수하며 받은 rusage → 자식과 그 자손(끝나서 회수된 것)까지 포함.
+  여러 사이트가 동시에 돌아도 사이트끼리 섞이지 않는다.
+- 파이썬 메모리: CRAWL_TRACEMALLOC=1일 때만, 크롤러 안에서 tracemalloc으로 잰 최대값과 할당 상위 위치(crawl_hooks가 종료 시 전송).
+- 실행이 끝나면 state/reports/<트레이스 id>.json 으로 저장 → /api/reports/<id>
+  (사이트별 최신값은 상태 sites.<id>.usage 에도 남겨서 admin.html이 보여준다)
+"""
+import os, json, time, threading
+
+import crawl_state
+
+try:
+    import psutil
+except ImportError:  # 선택 의존성: 없으면 /proc 으로 대체
+    psutil = None
+
+REPORT_DIR = os.path.join(crawl_state.STATE_DIR, "reports")
+KEEP_REPORTS = 30
+SAMPLE_SEC = 0.5
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# 🔹 프로세스 트리 RSS
+
+def _proc_children():
+    """/proc 기준 {ppid: [pid, ...]}"""
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # comm에 공백/괄호가 있을 수 있어 마지막 ')' 뒤에서 자른다
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(name))
+    return children
+
+
+def _proc_rss(pid):
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def tree_rss(pid):
+    """pid와 모든 자손 프로세스의 RSS 합 (bytes). 잴 수 없으면 None"""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            procs = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return None
+        total = 0
+        for p in procs:
+            try:
+                total += p.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    if not os.path.isdir("/proc"):
+        return None
+    children = _proc_children()
+    total, stack = 0, [pid]
+    while stack:
+        cur = stack.pop()
+        total += _proc_rss(cur)
+        stack.extend(children.get(cur, []))
+    return total
+
+
+def tree_pids(pid):
+    """pid의 모든 자손 pid (pid 자신은 빼고). 부모가 죽으면 자손이 init으로 옮겨 가므로 죽이기 전에 모아 둔다"""
+    if psutil is not None:
+        try:
+            return [p.pid for p in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    if not os.path.isdir("/proc"):
+        return []
+    children = _proc_children()
+    found, stack = [], list(children.get(pid, []))
+    while stack:
+        cur = stack.pop()
+        found.append(cur)
+        stack.extend(children.get(cur, []))
+    return found
+
+
+class TreeSampler:
+    """자식 프로세스가 도는 동안 트리 RSS 최대값을 재는 백그라운드 스레드"""
+
+    def __init__(self, pid, interval=SAMPLE_SEC):
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"rss-{pid}", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = tree_rss(self.pid)
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=self.interval * 4)
+        return self.peak
+
+
+# 🔹 실행 리포트
+
+def save_report(report_id, sites, **extra):
+    """sites: {site_id: {...}} → state/reports/<id>.json (extra: 실행 전체 값, 예: makespan)"""
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    path = os.path.join(REPORT_DIR, f"{report_id}.json")
+    report = {"id": report_id, "created_at": time.time(), "sites": sites, **extra}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+    for old in list_reports()[KEEP_REPORTS:]:
+        os.remove(os.path.join(REPORT_DIR, f"{old}.json"))
+    return path
+
+
+def list_reports():
+    """리포트 id 목록 (최신순)"""
+    if not os.path.isdir(REPORT_DIR):
+        return []
+    paths = [os.path.join(REPORT_DIR, f) for f in os.listdir(REPORT_DIR) if f.endswith(".json")]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    return [os.path.splitext(os.path.basename(p))[0] for p in paths]
+
+
+def load_report(report_id):
+    if os.path.basename(report_id) != report_id:
+        return None
+    try:
+        with open(os.path.join(REPORT_DIR, f"{report_id}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
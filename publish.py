@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+정규화 결과 게시: 버전별 디렉터리에 쓰고 current 심볼릭 링크를 한 번에 바꾼다.
+
+    releases/
+      20261019-070528/                ← 게시된 버전 (게시 후에는 내용이 바뀌지 않는다)
+        amc.json ... manifest.json
+      current -> 20261019-070528      ← os.replace로 원자적으로 교체
+    normalized/<id>.json               ← 이전 경로 호환(GitHub Pages 등). 파일 단위로만 원자적
+
+- release(): 게시 락 → 현재 버전을 하드링크로 옮겨 담은 스테이징 디렉터리 → (여기에 쓴다) → publish().
+  사이트 하나만 정규화해도 나머지 사이트는 이전 버전 그대로 이어진다.
+  스테이징의 파일은 덮어쓰지 말고 새로 써서 os.replace 해야 한다 (하드링크를 공유하는 이전 버전이 바뀌지 않게).
+- publish(): manifest.json → releases/<버전> 으로 rename → current 교체 → normalized/ 미러 → 데이터 버전 증가.
+  서버는 current를 따라 읽으므로 재시작 없이 다음 요청부터 새 버전을 본다.
+- 최근 KEEP(PUBLISH_KEEP, 기본 30)개 버전만 남기고, rollback()으로 이전 버전으로 바로 되돌린다.
+- 게시는 releases/.lock 으로 한 번에 하나씩 (사이트별 갱신이 동시에 끝나도 서로의 결과를 덮어쓰지 않게).
+- manifest.json 의 sources 에 사이트별 건수, 스냅샷 시각(updated_at), stale 여부/사유를 남긴다.
+  크롤링이 실패한 사이트는 이전 스냅샷이 그대로 이어지고 stale로 표시된다 (판단은 normalize_jobs.py).
+  normalized/manifest.json 으로도 미러하므로 정적 호스팅에서도 보인다.
+
+    python publish.py list
+    python publish.py rollback              # 바로 이전 버전으로
+    python publish.py rollback 20261019-070528
+"""
+import os, sys, json, time, fcntl, shutil, tempfile
+from contextlib import contextmanager
+
+import crawl_state
+
+# normalized/ 와 같이 작업 디렉터리 기준
+RELEASES_DIR = os.getenv("RELEASES_DIR", "releases")
+CURRENT = os.path.join(RELEASES_DIR, "current")
+LEGACY_DIR = "normalized"
+MANIFEST = "manifest.json"
+KEEP = int(os.getenv("PUBLISH_KEEP", "30"))  # 사이트마다 게시하므로 한 번 실행에 버전이 여러 개 (파일은 하드링크로 공유)
+STAGING_PREFIX = ".staging-"
+STALE_STAGING_SEC = 3600
+
+
+# 🔹 조회
+
+def current_version():
+    try:
+        return os.path.basename(os.readlink(CURRENT))
+    except OSError:
+        return None
+
+
+def current_dir():
+    """current가 가리키는 실제 디렉터리 (게시 전이면 None).
+    한 번 풀어 둔 경로로 읽으면 도중에 current가 바뀌어도 같은 버전을 끝까지 읽는다."""
+    version = current_version()
+    return os.path.realpath(os.path.join(RELEASES_DIR, version)) if version else None
+
+
+def version_key(version):
+    """정렬 키 (시각, 같은 초 안의 순번): '20261019-070528-10' 이 '-2' 보다 뒤로 가게 숫자로 비교한다"""
+    parts = version.split("-")
+    n = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 1
+    return ("-".join(parts[:2]), n)
+
+
+def list_versions():
+    """게시된 버전 목록 (최신순)"""
+    try:
+        names = os.listdir(RELEASES_DIR)
+    except OSError:
+        return []
+    return sorted(
+        (n for n in names if not n.startswith(".") and n != "current"
+         and os.path.isdir(os.path.join(RELEASES_DIR, n)) and not os.path.islink(os.path.join(RELEASES_DIR, n))),
+        key=version_key, reverse=True
+    )
+
+
+def load_manifest(version):
+    try:
+        with open(os.path.join(RELEASES_DIR, version, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def current_manifest():
+    """현재 버전의 manifest (게시 전이면 normalized/manifest.json, 그것도 없으면 {})"""
+    version = current_version()
+    if version:
+        return load_manifest(version) or {}
+    try:
+        with open(os.path.join(LEGACY_DIR, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+# 🔹 게시
+
+@contextmanager
+def _lock():
+    """게시 락 (기다렸다가 잡는다)"""
+    os.makedirs(RELEASES_DIR, exist_ok=True)
+    fd = os.open(os.path.join(RELEASES_DIR, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
+
+
+def _data_files(path):
+    return sorted(n for n in os.listdir(path) if n.endswith(".json") and n != MANIFEST)
+
+
+def stage():
+    """현재 버전(없으면 normalized/)의 파일을 하드링크로 담은 스테이징 디렉터리"""
+    staging = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=RELEASES_DIR)
+    base = current_dir() or (LEGACY_DIR if os.path.isdir(LEGACY_DIR) else None)
+    for name in _data_files(base) if base else []:
+        src, dst = os.path.join(base, name), os.path.join(staging, name)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)  # 하드링크가 안 되는 파일시스템
+    return staging
+
+
+def _new_version():
+    version = time.strftime("%Y%m%d-%H%M%S")
+    n = 1
+    while os.path.exists(os.path.join(RELEASES_DIR, version if n == 1 else f"{version}-{n:03d}")):
+        n += 1
+    return version if n == 1 else f"{version}-{n:03d}"
+
+
+def _swap(version):
+    """current → version (새 링크를 만들고 rename 하므로 읽는 쪽은 항상 이전 또는 새 버전 하나만 본다)"""
+    tmp = f"{CURRENT}.tmp-{os.getpid()}"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    os.symlink(version, tmp)
+    os.replace(tmp, CURRENT)
+
+
+def _mirror(version):
+    """normalized/ 에도 같은 파일 + manifest.json (파일마다 임시 파일 → os.replace)"""
+    src_dir = os.path.join(RELEASES_DIR, version)
+    os.makedirs(LEGACY_DIR, exist_ok=True)
+    for name in _data_files(src_dir) + [MANIFEST]:
+        tmp = os.path.join(LEGACY_DIR, f".{name}.tmp")
+        shutil.copyfile(os.path.join(src_dir, name), tmp)
+        os.replace(tmp, os.path.join(LEGACY_DIR, name))
+
+
+def prune(keep=KEEP):
+    """최근 keep개(+ current)만 남기고, 오래 남은 스테이징(죽은 게시)도 지운다. 지운 버전 목록 반환"""
+    current = current_version()
+    removed = []
+    for version in list_versions()[keep:]:
+        if version != current:
+            shutil.rmtree(os.path.join(RELEASES_DIR, version), ignore_errors=True)
+            removed.append(version)
+    for name in os.listdir(RELEASES_DIR):
+        path = os.path.join(RELEASES_DIR, name)
+        if name.startswith(STAGING_PREFIX) and time.time() - os.path.getmtime(path) > STALE_STAGING_SEC:
+            shutil.rmtree(path, ignore_errors=True)
+    return removed
+
+
+def publish(staging, sources=None):
+    """스테이징 디렉터리를 새 버전으로 게시하고 current를 바꾼다 → 버전 이름 (게시 락 안에서 호출)
+    sources: 이번에 다시 정한 사이트별 상태. 나머지 사이트는 이전 manifest 값을 이어받는다"""
+    version = _new_version()
+    files = {os.path.splitext(n)[0]: os.path.getsize(os.path.join(staging, n)) for n in _data_files(staging)}
+    carried = current_manifest().get("sources") or {}
+    merged = {**carried, **(sources or {})}
+    manifest = {
+        "version": version, "published_at": time.time(), "previous": current_version(), "files": files,
+        "sources": {site: merged[site] for site in files if site in merged},
+    }
+    with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.chmod(staging, 0o755)  # mkdtemp는 0700
+    os.rename(staging, os.path.join(RELEASES_DIR, version))
+    _swap(version)
+    _mirror(version)
+    prune()
+    # 새 스냅샷 게시 → 서버의 조회 캐시가 버전 변화를 보고 무효화된다
+    crawl_state.bump_data_version()
+    return version
+
+
+@contextmanager
+def release(sources=None):
+    """with release(sources) as staging: ...  → 블록이 끝나면 게시, 예외면 스테이징을 버린다.
+    sources(dict)는 블록 안에서 채우면 manifest의 사이트별 상태로 들어간다"""
+    with _lock():
+        staging = stage()
+        try:
+            yield staging
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        version = publish(staging, sources)
+    print(f"📦 게시: {RELEASES_DIR}/{version} (current)")
+
+
+def rollback(version=None):
+    """current를 version(없으면 바로 이전 버전)으로 되돌린다 → 버전 이름, 대상이 없으면 None"""
+    with _lock():
+        versions = list_versions()
+        current = current_version()
+        if version is None:
+            older = [v for v in versions if current is None or version_key(v) < version_key(current)]
+            version = older[0] if older else None
+        if version is None or version not in versions:
+            return None
+        _swap(version)
+        _mirror(version)
+        crawl_state.bump_data_version()
+    return version
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if cmd == "list":
+        current = current_version()
+        for v in list_versions():
+            m = load_manifest(v) or {}
+            mark = "👉" if v == current else "  "
+            stale = [site for site, src in (m.get("sources") or {}).items() if src.get("stale")]
+            print(f"{mark} {v}  사이트 {len(m.get('files') or {})}개  {sum((m.get('files') or {}).values()) / 1024:.0f}KB"
+                  + (f"  ⏳ stale: {', '.join(stale)}" if stale else ""))
+    elif cmd == "rollback":
+        version = rollback(sys.argv[2] if len(sys.argv) > 2 else None)
+        if version is None:
+            print("❌ 되돌릴 버전이 없습니다.")
+            sys.exit(1)
+        print(f"⏪ current → {version}")
+    else:
+        print("사용법: python publish.py [list | rollback [버전]]")
+        sys.exit(1)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+API 결과 캐시: 크기 제한 LRU + single-flight + 인기 쿼리 집계.
+
+- 값은 이미 직렬화된 bytes(JSON)로 저장 → 메모리 사용량을 정확히 셀 수 있다.
+- 같은 키를 동시에 여러 요청이 찾으면 한 요청만 계산하고 나머지는 그 결과를 기다린다.
+- 데이터 버전이 바뀌면 clear() 후, 많이 쓰인 키(popular)로 미리 채워둔다(warm).
+"""
+import threading
+from collections import Counter, OrderedDict
+
+
+class QueryCache:
+    def __init__(self, max_bytes=32 * 1024 * 1024, max_entries=2000):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._data = OrderedDict()   # key -> bytes
+        self._bytes = 0
+        self._inflight = {}          # key -> threading.Event
+        self._lock = threading.Lock()
+        self.popularity = Counter()
+        self.hits = self.misses = 0
+
+    def get_or_compute(self, key, compute, tag=None, count=True):
+        """캐시에 있으면 반환, 없으면 compute()로 계산해서 저장 (동시 요청은 한 번만 계산)
+        - tag: 인기 집계에 쓸 키 (버전이 바뀌어도 이어지도록 버전을 뺀 쿼리 파라미터)
+        - count=False: 미리 채우기(warm)처럼 집계에 넣지 않을 호출"""
+        tag = key if tag is None else tag
+        while True:
+            with self._lock:
+                if count:
+                    self._count(tag)
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return self._data[key]
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    waiter = self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            # 다른 스레드가 계산 중 → 끝나면 캐시에서 다시 찾는다 (실패했으면 내가 계산)
+            waiter.wait()
+            count = False  # 다시 돌 때 중복 집계하지 않는다
+
+        try:
+            value = compute()
+            self.put(key, value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            waiter.set()
+
+    def put(self, key, value):
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._data[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._data) > self.max_entries:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _count(self, tag):
+        """인기 집계 (락 안에서). 요청 조합이 다양해도 무한히 커지지 않게, max_entries*2개를 넘으면
+        상위 max_entries개만 남기고 횟수를 반으로 줄인다 (오래전 인기 쿼리가 계속 자리를 차지하지 않게)"""
+        self.popularity[tag] += 1
+        if len(self.popularity) > self.max_entries * 2:
+            self.popularity = Counter({
+                key: n // 2 for key, n in self.popularity.most_common(self.max_entries) if n // 2
+            })
+
+    def popular(self, n=20):
+        with self._lock:
+            return [key for key, _ in self.popularity.most_common(n)]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+서버 내장 크롤링 스케줄러.
+
+- 사이트마다 주기(interval_min), 실행 시간대(window, KST 시 단위), 지터(jitter_min)를 따로 둔다.
+- 다음 실행 시각은 crawl_state의 'scheduler' 상태에 저장해서 재시작해도 이어간다.
+- gunicorn 워커가 여러 개여도 'scheduler' 파일 락을 잡은 프로세스 하나만 돌린다.
+  (그 워커가 죽으면 다른 워커가 락을 이어받는다)
+- 같은 사이트 중복 실행은 사이트 락(site:<id>)이 막는다. 바쁘면 잠시 뒤 다시 시도.
+  브라우저/HTTP 동시 실행 한도(crawl_state 슬롯, run_all.lane_workers)가 다 차 있어도 같은 식으로 미룬다.
+
+설정은 아래 DEFAULT/SCHEDULES가 기본값이고, schedule.json(SCHEDULE_FILE)이 있으면 덮어쓴다.
+  {"amc": {"interval_min": 60, "window": [9, 18], "jitter_min": 10}}
+"""
+import os, json, time, random, threading
+from datetime import datetime, timezone, timedelta
+
+import crawl_state
+
+KST = timezone(timedelta(hours=9))
+SCHEDULE_FILE = os.getenv("SCHEDULE_FILE", "schedule.json")
+TICK_SEC = 30          # 스케줄 확인 주기
+BUSY_RETRY_MIN = 5     # 사이트가 이미 실행 중이면 몇 분 뒤 다시 시도할지
+
+# 기본: 하루 한 번, 하루 중 아무 때나 (지터로 자정 한 번에 몰리지 않게 분산)
+DEFAULT = {"interval_min": 24 * 60, "window": [0, 24], "jitter_min": 90}
+
+# 공고가 자주 올라오는 곳은 업무시간에 자주
+SCHEDULES = {
+    "amc":     {"interval_min": 60,  "window": [8, 20], "jitter_min": 10},
+    "samsung": {"interval_min": 60,  "window": [8, 20], "jitter_min": 10},
+    "seoul":   {"interval_min": 120, "window": [8, 20], "jitter_min": 15},
+    "mokdong": {"interval_min": 180, "window": [8, 20], "jitter_min": 20},
+}
+
+
+def load_config(site_ids):
+    """사이트별 최종 설정 {site: {interval_min, window, jitter_min}}"""
+    overrides = {}
+    if os.path.exists(SCHEDULE_FILE):
+        with open(SCHEDULE_FILE, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+    config = {}
+    for site in site_ids:
+        cfg = dict(DEFAULT)
+        cfg.update(SCHEDULES.get(site, {}))
+        cfg.update(overrides.get(site, {}))
+        config[site] = cfg
+    return config
+
+
+def in_window(cfg, t):
+    start, end = cfg["window"]
+    if start <= end:
+        return start <= t.hour < end
+    return t.hour >= start or t.hour < end  # 22~6처럼 자정을 넘는 시간대
+
+
+def fit_window(cfg, t):
+    """t가 시간대 밖이면 다음 시간대 시작(+지터)으로 민다"""
+    if in_window(cfg, t):
+        return t
+    start = cfg["window"][0]
+    day = t if t.hour < start else t + timedelta(days=1)
+    base = day.replace(hour=start, minute=0, second=0, microsecond=0)
+    return base + timedelta(minutes=random.uniform(0, cfg["jitter_min"]))
+
+
+def next_run_after(cfg, now):
+    delay = cfg["interval_min"] + random.uniform(-cfg["jitter_min"], cfg["jitter_min"])
+    return fit_window(cfg, now + timedelta(minutes=max(delay, 1)))
+
+
+def load_next_runs():
+    data = crawl_state.get_status("scheduler").get("next_runs") or {}
+    return {site: datetime.fromisoformat(v) for site, v in data.items()}
+
+
+def save_next_runs(next_runs):
+    crawl_state.update_status(
+        "scheduler",
+        next_runs={site: t.isoformat(timespec="seconds") for site, t in next_runs.items()}
+    )
+
+
+def tick(config, next_runs, start_site, now=None):
+    """실행할 때가 된 사이트를 시작하고 next_runs 갱신. 시작한 사이트 목록 반환"""
+    now = now or datetime.now(KST)
+    started = []
+    for site, cfg in config.items():
+        due = next_runs.get(site)
+        if due is None:
+            # 처음 보는 사이트: 바로 몰리지 않게 지터만큼 흩어서 첫 실행
+            next_runs[site] = fit_window(cfg, now + timedelta(minutes=random.uniform(0, cfg["jitter_min"])))
+            continue
+        if now < due:
+            continue
+        if not in_window(cfg, now):
+            next_runs[site] = fit_window(cfg, now)
+            continue
+        if start_site(site):
+            started.append(site)
+            next_runs[site] = next_run_after(cfg, now)
+        else:
+            # 다른 곳(전체 실행, 수동 갱신)에서 돌고 있거나 동시 실행 한도가 참 → 조금 뒤 재시도
+            next_runs[site] = now + timedelta(minutes=BUSY_RETRY_MIN)
+    save_next_runs(next_runs)
+    return started
+
+
+def _loop(site_ids, start_site):
+    while True:
+        lock_fd = crawl_state.acquire_lock("scheduler")
+        if lock_fd is None:
+            # 다른 워커가 스케줄러 담당 → 그 워커가 죽었는지 가끔 확인
+            time.sleep(60)
+            continue
+        try:
+            config = load_config(site_ids)
+            next_runs = load_next_runs()
+            print(f"⏰ 스케줄러 시작 (pid={os.getpid()}, 사이트 {len(config)}개)")
+            while True:
+                started = tick(config, next_runs, start_site)
+                if started:
+                    print(f"⏰ 예약 크롤링 시작: {', '.join(started)}")
+                time.sleep(TICK_SEC)
+        except Exception as e:
+            print(f"❌ 스케줄러 오류: {e}")
+            time.sleep(TICK_SEC)
+        finally:
+            crawl_state.release_lock(lock_fd)
+
+
+def start(site_ids, start_site):
+    """백그라운드 스케줄러 스레드 시작. start_site(site) → 시작했으면 True, 이미 실행 중이면 False"""
+    thread = threading.Thread(target=_loop, args=(list(site_ids), start_site), name="scheduler")
+    thread.daemon = True
+    thread.start()
+    return thread
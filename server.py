@@ -1,23 +1,35 @@
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, Response, abort, jsonify, request, send_from_directory, stream_with_context
 from flask_cors import CORS
 import subprocess
 import os
 import json
+import sys
+import time
+from collections import deque
 from datetime import datetime
 import threading
 
+import archive
+import crawl_state
+import jobs_api
+import metrics
+import tracing
+import profiling
+import publish
+import scheduler
+
+# src/의 크롤러 이벤트 프로토콜(crawl_hooks) 사용
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+import crawl_hooks  # noqa: E402
+import run_all  # noqa: E402
+
 app = Flask(__name__)
 CORS(app)  # CORS 허용
 
 # 🔹 상태 관리
-status = {
-    'running': False,
-    'last_update': None,
-    'progress': '',
-    'error': None
-}
-
-# 🔹 마지막 업데이트 시간 파일
+# 멀티 워커(gunicorn)에서도 모두 같은 상태를 보도록 crawl_state(SQLite + 파일 락)에 저장한다.
+
+# 🔹 마지막 업데이트 시간 파일 (이전 버전 호환용: 최초 1회만 상태 저장소로 옮긴다)
 TIMESTAMP_FILE = 'last_update.json'
 
 
@@ -33,86 +45,380 @@ def load_last_update():
     return None
 
 
-def save_last_update():
-    """마지막 업데이트 시간 저장"""
-    with open(TIMESTAMP_FILE, 'w') as f:
-        json.dump({'last_update': datetime.now().isoformat()}, f)
+# 전체 크롤링 타임아웃 (초). run_all.py에는 이보다 조금 이른 마감(RUN_DEADLINE)을 넘겨서
+# 사이트별 예산 안에서 스스로 정리하고 끝난 사이트만이라도 게시되게 한다 (타임아웃은 최후의 안전장치)
+RUN_TIMEOUT = 600
+RUN_DEADLINE_MARGIN = 30
+
 
+def site_timeout(site):
+    """사이트 하나만 갱신할 때의 타임아웃: 사이트 예산 + 취소 유예 + 여유"""
+    return run_all.budget_for(site) + run_all.CANCEL_GRACE_SEC + RUN_DEADLINE_MARGIN
+
+# 내장 스케줄러 (SCHEDULER=1일 때만, 여러 워커 중 하나만 실제로 돈다)
+SITE_IDS = [run_all.site_id(output) for _, _, output in run_all.JOBS]
+SCHEDULER_ENABLED = os.getenv('SCHEDULER', '0') == '1'
 
 # 초기화 시 마지막 업데이트 불러오기
-status['last_update'] = load_last_update()
+if crawl_state.get_status()['last_update'] is None:
+    crawl_state.update_status(last_update=load_last_update())
+
+
+def describe_event(ev):
+    """이벤트 → 상태 progress 문구 (해당 없으면 None)"""
+    name = ev.get('name') or ev.get('site')
+    if ev.get('event') == 'site_started':
+        return f'📡 {name} 크롤링 중...'
+    if ev.get('event') == 'page':
+        return f'📡 {ev.get("site")} {ev.get("page")}페이지 수집 중...'
+    if ev.get('event') == 'published':
+        return f'📦 {", ".join(ev.get("sites") or [])} 게시됨'
+    return None
 
 
-def run_crawler():
-    """크롤링 + 정규화 실행"""
-    global status
-    status['running'] = True
-    status['progress'] = '크롤링 시작...'
-    status['error'] = None
+def track_unpublished(unpublished, ev):
+    """크롤링이 끝난 사이트(site_finished)를 더하고 run_all.py가 게시한 사이트(published)는 뺀다"""
+    if ev.get('event') == 'site_finished' and ev.get('site'):
+        unpublished.add(ev['site'])
+    elif ev.get('event') == 'published':
+        unpublished.difference_update(ev.get('sites') or [])
+
+
+def stream_process(cmd, lock_fd, timeout, status_name=crawl_state.ALL, extra_env=None, unpublished=None):
+    """자식 프로세스 출력을 줄 단위로 읽으며 진행 이벤트를 공유 저장소에 기록.
+    unpublished(set)를 넘기면 크롤링은 성공했는데 아직 게시되지 않은 사이트 id를 채운다 (시간 초과로 끊겨도).
+    반환: (returncode, 마지막 출력 몇 줄)"""
+    env = os.environ.copy()
+    env['CRAWL_EVENTS'] = '1'
+    env['PYTHONUNBUFFERED'] = '1'
+    env['CRAWL_LOCK_FD'] = str(lock_fd)  # run_all.py가 크롤러 스크립트에도 넘긴다
+    env.update(extra_env or {})
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        env=env,
+        pass_fds=(lock_fd,)
+    )
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        # run_all.py는 SIGTERM을 받으면 돌리던 사이트의 프로세스 트리(Chrome 포함)를 정리하고 끝난다
+        proc.terminate()
+        force = threading.Timer(run_all.CANCEL_GRACE_SEC, proc.kill)
+        force.daemon = True
+        force.start()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    tail = deque(maxlen=20)
+    try:
+        for line in proc.stdout:
+            ev = crawl_hooks.parse_event(line.rstrip('\n'))
+            if ev is None:
+                tail.append(line.rstrip())
+                continue
+            crawl_state.append_event(ev)
+            if unpublished is not None:
+                track_unpublished(unpublished, ev)
+            progress = describe_event(ev)
+            if progress:
+                crawl_state.update_status(status_name, progress=progress)
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    return returncode, '\n'.join(tail)
+
+
+def run_crawler(lock_fd, site=None, force=False):
+    """크롤링 + 정규화 실행
+    - lock_fd: trigger_update(전체) 또는 trigger_site_update(사이트)에서 잡은 락
+    - site: 지정하면 그 사이트만 크롤링하고 그 파일만 정규화한다
+    - force: 회로 차단 중인 사이트도 시도한다 (관리자가 직접 갱신한 경우)"""
+    status_name = f'site:{site}' if site else crawl_state.ALL
+    # 크롤링 → 정규화 → 게시 구간을 한 트레이스로 (자식 프로세스는 TRACE_ID로 이어서 기록)
+    trace_id = tracing.new_trace_id()
+    crawl_state.update_status(status_name, progress='크롤링 시작...', error=None, trace_id=trace_id)
+    pipeline_started = time.time()
 
     try:
         # 1. 크롤링 실행
-        status['progress'] = '📡 병원 데이터 크롤링 중...'
-        result1 = subprocess.run(
-            ['python3', 'src/run_all.py'],
-            capture_output=True,
-            text=True,
-            timeout=600  # 10분 타임아웃
-        )
-
-        if result1.returncode != 0:
-            raise Exception(f"크롤링 실패: {result1.stderr}")
-
-        # 2. 정규화 실행
-        status['progress'] = '🔄 데이터 정규화 중...'
-        result2 = subprocess.run(
-            ['python3', 'normalize_jobs.py', './json'],
-            capture_output=True,
-            text=True,
-            timeout=300  # 5분 타임아웃
-        )
-
-        if result2.returncode != 0:
-            raise Exception(f"정규화 실패: {result2.stderr}")
+        # 락 fd를 자식(과 run_all.py가 띄우는 크롤러 스크립트)에게도 넘겨서, 워커가 죽어도 크롤러가 끝날 때까지 락이 유지되게 한다.
+        # --resume: 직전 실행이 재시작·타임아웃으로 끊겼으면 끝난 사이트는 건너뛰고 이어 한다 (run_all.RESUME_MAX_AGE_SEC 이내)
+        # 출력은 끝까지 모았다가 받지 않고 줄 단위로 읽어 사이트별 진행 이벤트로 기록한다.
+        # run_all.py가 사이트마다 끝나는 대로 정규화·게시하므로 새 공고는 사이트 단위로 먼저 보인다.
+        crawl_state.update_status(status_name, progress='📡 병원 데이터 크롤링 중 (끝난 사이트부터 게시)...')
+        crawl_failure = None
+        unpublished = set()
+        try:
+            if site:
+                returncode, tail = stream_process(
+                    ['python3', 'src/run_all.py', site, '--resume'],
+                    lock_fd,
+                    timeout=site_timeout(site),
+                    status_name=status_name,
+                    # 사이트 락은 이미 여기서 잡았음
+                    extra_env={'HELD_SITE_LOCK': site, 'TRACE_ID': trace_id,
+                               'BREAKER_BYPASS': site if force else ''},
+                    unpublished=unpublished
+                )
+            else:
+                returncode, tail = stream_process(
+                    ['python3', 'src/run_all.py', '--resume'],
+                    lock_fd,
+                    timeout=RUN_TIMEOUT,
+                    extra_env={
+                        'TRACE_ID': trace_id,
+                        'RUN_DEADLINE': str(time.time() + RUN_TIMEOUT - RUN_DEADLINE_MARGIN),
+                    },
+                    unpublished=unpublished
+                )
+            if returncode != 0:
+                crawl_failure = Exception(f"크롤링 실패: {tail}")
+        except subprocess.TimeoutExpired as e:
+            crawl_failure = e
+
+        # 2. 크롤링은 성공했는데 게시되지 않은 사이트만 정규화·게시 (진행 이벤트의 site_finished − published)
+        # 시간 초과로 run_all.py가 게시하기 전에 끊긴 사이트, PIPELINE_PUBLISH=0 이라 run_all.py가 게시하지 않은 사이트.
+        # 이미 게시했거나 크롤링하지 않은 사이트는 다시 저장하지 않는다 (새 버전·last_seen을 헛되이 올리지 않게).
+        # 실패·중단된 사이트는 게시된 이전 스냅샷이 그대로 남는다 (run_all.py가 게시하면 사이트별로 stale 표시).
+        targets = [os.path.join('json', run_all.job_for(s)[2]) for s in sorted(unpublished) if run_all.job_for(s)]
+        if targets:
+            crawl_state.update_status(status_name, progress='🔄 데이터 정규화 중...')
+            with tracing.span('normalize', trace_id=trace_id, target=','.join(targets)):
+                result2 = subprocess.run(
+                    ['python3', 'normalize_jobs.py', *targets],
+                    capture_output=True,
+                    text=True,
+                    timeout=300,  # 5분 타임아웃
+                    pass_fds=(lock_fd,),
+                    env={**os.environ, 'TRACE_ID': trace_id}
+                )
+
+            if result2.returncode != 0:
+                raise Exception(f"정규화 실패: {result2.stderr}")
+
+        # 게시가 데이터 버전을 올렸으니 이 워커의 조회 캐시를 바로 비우고 다시 채운다
+        with tracing.span('publish', trace_id=trace_id):
+            jobs_api.check_version()
+
+        if crawl_failure is not None:
+            raise crawl_failure
 
         # 3. 완료
-        status['progress'] = '✅ 업데이트 완료!'
-        status['last_update'] = datetime.now().isoformat()
-        save_last_update()
+        crawl_state.update_status(
+            status_name,
+            progress='✅ 업데이트 완료!',
+            last_update=datetime.now().isoformat()
+        )
 
     except subprocess.TimeoutExpired:
-        status['error'] = '⏱️ 시간 초과: 스크립트 실행이 너무 오래 걸립니다.'
+        metrics.inc('crawl_failures_total', site=site or crawl_state.ALL, reason='timeout')
+        crawl_state.update_status(status_name, error='⏱️ 시간 초과: 스크립트 실행이 너무 오래 걸립니다.')
     except Exception as e:
-        status['error'] = f'❌ 에러: {str(e)}'
+        crawl_state.update_status(status_name, error=f'❌ 에러: {str(e)}')
     finally:
-        status['running'] = False
+        # 여기서 락을 풀지 않는다: 시간 초과로 run_all.py를 죽였어도 물려받은 크롤러 스크립트가 남아 있을 수 있으니
+        # fd만 닫고, 락을 가진 자손이 모두 끝나면 OS가 푼다 (그 전에는 새 실행이 시작되지 않는다)
+        crawl_state.close_lock(lock_fd)
+        tracing.record('refresh', pipeline_started, time.time() - pipeline_started,
+                       trace_id=trace_id, site=site or crawl_state.ALL)
+        tracing.export(trace_id)
+
+
+# 🔹 요청 메트릭 (라우트 패턴 기준으로 묶어서 라벨 수가 늘어나지 않게)
+
+@app.before_request
+def start_timer():
+    request.environ['metrics.start'] = time.perf_counter()
+
+
+@app.after_request
+def record_request(response):
+    started = request.environ.get('metrics.start')
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - started,
+                        route=route, method=request.method)
+        metrics.inc('http_requests_total', route=route, method=request.method, status=response.status_code)
+    return response
+
+
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus 형식 메트릭 (모든 워커 + 크롤러 + 정규화 프로세스 합산)"""
+    return Response(metrics.render(breaker_metric_lines()), mimetype='text/plain; version=0.0.4')
+
+
+def breaker_metric_lines():
+    """사이트별 회로 차단기 상태 게이지 (상태 저장소에서 바로 읽는다)"""
+    lines = ['# HELP crawl_breaker_state 사이트별 회로 차단기 상태 (해당 state면 1)',
+             '# TYPE crawl_breaker_state gauge']
+    for site in SITE_IDS:
+        state = crawl_state.breaker_state(site)
+        for s in crawl_state.BREAKER_STATES:
+            lines.append(f'crawl_breaker_state{{site="{site}",state="{s}"}} {int(s == state)}')
+    return lines
 
 
 # 🔹 API 엔드포인트
 
 @app.route('/api/status')
 def get_status():
-    """현재 상태 반환"""
+    """현재 상태 반환 (sites: 사이트별 크롤링 상태·회로 차단기, sources: 사이트별 게시 스냅샷 상태)"""
+    status = crawl_state.get_status()
+    status['sites'] = crawl_state.site_statuses()
+    for site, st in status['sites'].items():
+        st['breaker'] = crawl_state.breaker(site)
+    # 게시된 사이트별 스냅샷 상태 (건수, updated_at, stale/사유)
+    status['sources'] = publish.current_manifest().get('sources') or {}
     return jsonify(status)
 
 
+# SSE 연결 하나가 gthread 워커 스레드 하나를 붙잡으므로 오래 열어 두지 않는다.
+# SSE_MAX_SEC가 지나면 스트림을 닫고, 브라우저 EventSource가 retry 뒤 Last-Event-ID로 다시 붙어 이어받는다.
+SSE_MAX_SEC = int(os.getenv('SSE_MAX_SEC', '300'))
+
+
+@app.route('/api/status/stream')
+def status_stream():
+    """크롤링 진행 이벤트 SSE 스트림 (Last-Event-ID 이어받기 지원, SSE_MAX_SEC마다 끊고 다시 연결)"""
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    last_id = int(since) if since and since.isdigit() else crawl_state.last_event_id()
+
+    def generate():
+        nonlocal last_id
+        # id만 있는 블록은 이벤트로 전달되지 않고 Last-Event-ID만 정한다 → 다시 붙을 때 그 사이 이벤트를 놓치지 않는다
+        yield f'retry: 3000\nid: {last_id}\n\n'
+        last_status = None
+        idle = 0.0
+        close_at = time.time() + SSE_MAX_SEC
+        while time.time() < close_at:
+            status = crawl_state.get_status()
+            if status != last_status:
+                yield f'event: status\ndata: {json.dumps(status, ensure_ascii=False)}\n\n'
+                last_status = status
+                idle = 0.0
+            rows = crawl_state.events_since(last_id)
+            for event_id, data in rows:
+                yield f'id: {event_id}\nevent: crawl\ndata: {data}\n\n'
+                last_id = event_id
+            if rows:
+                idle = 0.0
+                continue
+            if idle >= 15:
+                yield ': keepalive\n\n'
+                idle = 0.0
+            time.sleep(1)
+            idle += 1
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/api/update', methods=['POST'])
 def trigger_update():
     """크롤링 시작"""
-    if status['running']:
+    # 락 획득 자체가 "실행 중" 검사 → 여러 워커가 동시에 요청해도 한 번만 시작된다.
+    lock_fd = crawl_state.acquire_lock()
+    if lock_fd is None:
         return jsonify({'error': '이미 실행 중입니다.'}), 400
 
     # 백그라운드에서 실행
-    thread = threading.Thread(target=run_crawler)
+    thread = threading.Thread(target=run_crawler, args=(lock_fd,))
     thread.daemon = True
     thread.start()
 
     return jsonify({'message': '크롤링 시작됨'})
 
 
+def start_site_crawl(site_id, force=False):
+    """사이트 락을 잡고 백그라운드로 사이트 크롤링 시작. 이미 실행 중이면 False
+    예약 실행(force=False)은 그 사이트 종류(브라우저/HTTP)의 동시 실행 슬롯이 다 차 있어도 False → 스케줄러가 미룬다.
+    직접 갱신은 시작하고, run_all.py가 슬롯이 빌 때까지 기다린다"""
+    lane = run_all.lane_for(site_id)
+    if not force and crawl_state.slots_in_use(lane, run_all.lane_workers(lane)) >= run_all.lane_workers(lane):
+        return False
+    lock_fd = crawl_state.acquire_lock(f'site:{site_id}')
+    if lock_fd is None:
+        return False
+
+    thread = threading.Thread(target=run_crawler, args=(lock_fd, site_id, force))
+    thread.daemon = True
+    thread.start()
+    return True
+
+
+@app.route('/api/update/<site_id>', methods=['POST'])
+def trigger_site_update(site_id):
+    """사이트 하나만 크롤링 + 정규화 (다른 사이트 크롤링과 동시에 실행 가능)"""
+    if run_all.job_for(site_id) is None:
+        return jsonify({'error': f'알 수 없는 사이트: {site_id}'}), 404
+
+    # 직접 갱신은 회로 차단 중이어도 시도한다 (예약 실행은 차단을 따른다)
+    if not start_site_crawl(site_id, force=True):
+        return jsonify({'error': f'{site_id} 이미 실행 중입니다.'}), 400
+
+    return jsonify({'message': f'{site_id} 크롤링 시작됨'})
+
+
+@app.route('/api/breaker/<site_id>/reset', methods=['POST'])
+def reset_breaker(site_id):
+    """사이트 회로 차단기를 닫는다 (사이트를 고친 뒤 다음 실행부터 바로 크롤링)"""
+    if run_all.job_for(site_id) is None:
+        return jsonify({'error': f'알 수 없는 사이트: {site_id}'}), 404
+    crawl_state.reset_breaker(site_id)
+    return jsonify({'message': f'{site_id} 차단 해제됨'})
+
+
+@app.route('/api/schedule')
+def get_schedule():
+    """사이트별 예약 설정과 다음 실행 시각"""
+    config = scheduler.load_config(SITE_IDS)
+    next_runs = crawl_state.get_status('scheduler').get('next_runs') or {}
+    return jsonify({
+        'enabled': SCHEDULER_ENABLED,
+        'sites': {site: {**cfg, 'next_run': next_runs.get(site)} for site, cfg in config.items()}
+    })
+
+
+@app.route('/api/traces/<trace_id>')
+def get_trace(trace_id):
+    """실행 트레이스(Chrome trace JSON) 내려받기 → chrome://tracing, ui.perfetto.dev 에서 열기
+    trace_id는 /api/status(또는 sites.<id>)의 trace_id"""
+    return send_from_directory(tracing.TRACE_DIR, f'{trace_id}.json', mimetype='application/json')
+
+
+@app.route('/api/reports')
+def list_reports():
+    """실행 리포트 id 목록 (최신순)"""
+    return jsonify({'reports': profiling.list_reports()})
+
+
+@app.route('/api/reports/<report_id>')
+def get_report(report_id):
+    """사이트별 리소스 리포트 (report_id = 트레이스 id, 'latest'면 가장 최근 것)"""
+    if report_id == 'latest':
+        ids = profiling.list_reports()
+        report_id = ids[0] if ids else None
+    report = profiling.load_report(report_id) if report_id else None
+    if report is None:
+        return jsonify({'error': '리포트가 없습니다.'}), 404
+    return jsonify(report)
+
+
 @app.route('/api/can-update')
 def can_update():
     """24시간 경과 여부 확인"""
+    status = crawl_state.get_status()
     if not status['last_update']:
         return jsonify({'can_update': True, 'hours_passed': None})
 
@@ -127,18 +433,101 @@ def can_update():
     })
 
 
+if SCHEDULER_ENABLED:
+    scheduler.start(SITE_IDS, start_site_crawl)
+
+# 🔹 공고 조회 API (결과 캐시는 데이터 버전이 바뀌면 자동 무효화)
+jobs_api.init(SITE_IDS)
+jobs_api.start_watcher()
+
+
+@app.route('/api/jobs')
+def get_jobs():
+    """공고 조회: source(쉼표 구분), q, sort(deadline|recent), filter(all|urgent|soon|normal), page, size"""
+    version, body = jobs_api.query_jobs(request.args)
+    resp = Response(body, mimetype='application/json')
+    resp.headers['X-Data-Version'] = str(version)
+    return resp
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """공고 하나 (id는 정규화 때 붙인 '<사이트>-<해시>'). first_seen/last_seen/closed_at 포함, 내려간 공고도 조회된다"""
+    version, body = jobs_api.get_job(job_id)
+    if body is None:
+        return jsonify({'error': f'공고 없음: {job_id}'}), 404
+    resp = Response(body, mimetype='application/json')
+    resp.headers['X-Data-Version'] = str(version)
+    return resp
+
+
+@app.route('/api/changes')
+def get_changes():
+    """since(seq) 이후 새로 올라온/바뀐/다시 올라온/내려간 공고: since, source(쉼표 구분), limit.
+    응답의 next를 다음 요청의 since로, more면 바로 이어서 받는다"""
+    version, body = jobs_api.get_changes(request.args)
+    resp = Response(body, mimetype='application/json')
+    resp.headers['X-Data-Version'] = str(version)
+    return resp
+
+
+@app.route('/api/stats/<name>')
+def get_stats(name):
+    """채용 추세 (analytics.py 롤업): weekly(주간 새/내려간 공고), daily, windows(평균 공고·게시 기간), closing(이번 주 마감)
+    source(쉼표 구분), weeks / days"""
+    version, body = jobs_api.get_stats(name, request.args)
+    if body is None:
+        return jsonify({'error': f'알 수 없는 통계: {name}'}), 404
+    resp = Response(body, mimetype='application/json')
+    resp.headers['X-Data-Version'] = str(version)
+    return resp
+
+
+# 🔹 게시된 데이터 버전 (publish.py)
+# releases/<버전>/ 은 게시 후 바뀌지 않으므로 오래 캐시하고, current(manifest.json으로 버전 확인)만 매번 재검증한다.
+@app.route('/releases/<version>/<path:filename>')
+def serve_release(version, filename):
+    if version == 'current':
+        return send_from_directory(publish.RELEASES_DIR, f'{version}/{filename}')  # no-cache + ETag
+    resp = send_from_directory(publish.RELEASES_DIR, f'{version}/{filename}', max_age=365 * 24 * 3600)
+    resp.cache_control.immutable = True
+    return resp
+
+
 # 🔹 정적 파일 서빙
 @app.route('/')
 def index():
     return send_from_directory('.', 'index.html')
 
 
+# 이 폴더를 그대로 내보내므로 런타임 파일은 막는다: 상태 저장소(SQLite DB, 락, 트레이스·리포트·메트릭),
+# 스냅샷 아카이브, 숨김 파일(releases/.lock, .git 등). 설정으로 옮긴 경우도 기본 위치도 막는다
+PRIVATE_DIRS = [os.path.realpath(d) for d in (
+    crawl_state.STATE_DIR, archive.ARCHIVE_DIR,
+    os.path.join(app.root_path, 'state'), os.path.join(app.root_path, 'archive'),
+)]
+
+
+def is_private(path):
+    """웹으로 내보내지 않는 경로인지 (웹 루트 기준 상대 경로)"""
+    if any(part.startswith('.') for part in path.split('/')):
+        return True
+    target = os.path.realpath(os.path.join(app.root_path, path))
+    return any(target == d or target.startswith(d + os.sep) for d in PRIVATE_DIRS)
+
+
 @app.route('/<path:path>')
 def serve_file(path):
+    if is_private(path):
+        abort(404)
     return send_from_directory('.', path)
 
 
 if __name__ == '__main__':
+    if '--prod' in sys.argv:
+        # 운영 모드: gunicorn 멀티 워커로 실행 (설정은 gunicorn.conf.py)
+        os.execvp('gunicorn', ['gunicorn', '-c', 'gunicorn.conf.py', 'server:app'])
+
     print("🚀 Flask 서버 시작: http://localhost:5000")
     print("📡 관리자 페이지: http://localhost:5000/admin.html")
     app.run(debug=True, port=5000)
@@ -7,10 +7,15 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+import os
 import json
 from datetime import datetime
 import re
-import time
+
+import crawl_hooks
+
+BASE_URL = crawl_hooks.site_url("https://snubh.recruiter.co.kr")
+LIST_URL = f"{BASE_URL}/app/jobnotice/list"
 
 def parse_date(date_str):
     """날짜 문자열을 ISO 8601 형식으로 변환"""
@@ -40,10 +45,155 @@ def setup_driver():
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
     
     # webdriver-manager를 사용하여 자동으로 ChromeDriver 다운로드
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
+    with crawl_hooks.span("driver_start"):
+        service = Service(ChromeDriverManager().install())
+        driver = webdriver.Chrome(service=service, options=chrome_options)
     return driver
 
+def parse_job_list(page_source, base_url=BASE_URL):
+    """목록 페이지 HTML → 접수중 공고 리스트 (접수중이 아닌 공고를 만나면 거기서 멈춘다)"""
+    # BeautifulSoup으로 파싱
+    soup = BeautifulSoup(page_source, crawl_hooks.HTML_PARSER)
+
+    # 채용 공고 리스트
+    job_list = []
+    
+    # divJobnoticeList 내부의 ul 찾기
+    div_element = soup.find('div', id='divJobnoticeList')
+    
+    if not div_element:
+        print("[ERROR] divJobnoticeList를 찾을 수 없습니다.")
+        return []
+    
+    ul_element = div_element.find('ul')
+    
+    if not ul_element:
+        print("[ERROR] ul 요소를 찾을 수 없습니다.")
+        print(f"[DEBUG] divJobnoticeList 내용: {div_element.prettify()[:500]}")
+        return []
+    
+    # li 태그들 찾기
+    li_elements = ul_element.find_all('li', recursive=False)
+    print(f"[DEBUG] 총 {len(li_elements)}개의 공고를 찾았습니다.\n")
+    
+    for idx, li in enumerate(li_elements, 1):
+        try:
+            print(f"\n[DEBUG] --- {idx}번째 공고 처리 중 ---")
+            
+            # 상태 확인 - "접수중"인지 체크
+            status_element = li.select_one('div.list-bbs-status > span')
+            
+            if status_element:
+                status_text = status_element.get_text(strip=True)
+                print(f"[DEBUG] 상태: '{status_text}'")
+            else:
+                print(f"[DEBUG] 상태 요소를 찾을 수 없습니다.")
+            
+            if not status_element or '접수중' not in status_element.get_text(strip=True):
+                print(f"[INFO] {idx}번째 공고: 접수중이 아니므로 크롤링을 종료합니다.")
+                break
+            
+            # 제목 및 링크
+            # span.list-bbs-notice-name > a 셀렉터 사용
+            title_element = li.select_one('span.list-bbs-notice-name > a')
+            
+            if not title_element:
+                # 대체 셀렉터
+                title_element = li.select_one('h2.list-bbs-title a')
+                print(f"[DEBUG] 대체 제목 셀렉터 사용")
+            
+            if not title_element:
+                print(f"[ERROR] {idx}번째 공고의 제목을 찾을 수 없습니다.")
+                continue
+            
+            title = title_element.get_text(strip=True)
+            detail_path = title_element.get('href', '')
+            detail_url = f"{base_url}{detail_path}" if detail_path else ""
+            print(f"[DEBUG] 제목: {title}")
+            print(f"[DEBUG] 상세 URL: {detail_url}")
+            
+            # 날짜 (시작일 ~ 종료일)
+            date_element = li.select_one('span.list-bbs-date')
+            
+            if not date_element:
+                print(f"[ERROR] {idx}번째 공고의 날짜를 찾을 수 없습니다.")
+                continue
+            
+            date_text = date_element.get_text(strip=True)
+            print(f"[DEBUG] 날짜 텍스트: '{date_text}'")
+            
+            # 날짜 파싱 (예: "2025.10.24(금) 09:00 ~ 2025.11.03(월) 23:59")
+            start_dt = ""
+            end_dt = ""
+            
+            # 정규식으로 날짜와 시간 추출
+            date_pattern = r'(\d{4}\.\d{2}\.\d{2})\([^)]+\)\s+(\d{2}:\d{2})\s*~\s*(\d{4}\.\d{2}\.\d{2})\([^)]+\)\s+(\d{2}:\d{2})'
+            match = re.search(date_pattern, date_text)
+            
+            if match:
+                start_date_str = match.group(1)  # 2025.10.24
+                start_time_str = match.group(2)  # 09:00
+                end_date_str = match.group(3)    # 2025.11.03
+                end_time_str = match.group(4)    # 23:59
+                
+                # 시작일 파싱
+                start_date = parse_date(start_date_str)
+                if start_date:
+                    start_hour, start_min = map(int, start_time_str.split(':'))
+                    start_dt = start_date.replace(hour=start_hour, minute=start_min, second=0).strftime("%Y-%m-%dT%H:%M:%S+09:00")
+                
+                # 종료일 파싱
+                end_date = parse_date(end_date_str)
+                if end_date:
+                    end_hour, end_min = map(int, end_time_str.split(':'))
+                    end_dt = end_date.replace(hour=end_hour, minute=end_min, second=0).strftime("%Y-%m-%dT%H:%M:%S+09:00")
+                
+                print(f"[DEBUG] 파싱된 시작일: {start_dt}")
+                print(f"[DEBUG] 파싱된 종료일: {end_dt}")
+            
+            # D-day
+            dday_element = li.select_one('span.list-bbs-dday')
+            dday = parse_dday(dday_element.get_text(strip=True)) if dday_element else ""
+            print(f"[DEBUG] D-day: '{dday}'")
+            
+            # URL에서 공고 번호 추출
+            recu_idx = ""
+            announce_sn = ""
+            
+            if detail_path:
+                # URL 파라미터 파싱
+                import urllib.parse
+                parsed = urllib.parse.urlparse(detail_path)
+                query_params = urllib.parse.parse_qs(parsed.query)
+                print(f"[DEBUG] URL 파라미터: {query_params}")
+                
+                # jobnoticeSn 추출
+                if 'jobnoticeSn' in query_params:
+                    announce_sn = query_params['jobnoticeSn'][0]
+                    print(f"[DEBUG] announce_sn: {announce_sn}")
+            
+            # 결과 저장
+            job_data = {
+                "title": title,
+                "start_dt": start_dt,
+                "end_dt": end_dt,
+                "dday": dday,
+                "recu_idx": recu_idx,
+                "announce_sn": announce_sn,
+                "detail_url": detail_url
+            }
+            
+            job_list.append(job_data)
+            print(f"[SUCCESS] {idx}. {title} - {dday} 추가 완료\n")
+            
+        except Exception as e:
+            print(f"[ERROR] {idx}번째 공고 처리 중 오류: {e}")
+            import traceback
+            traceback.print_exc()
+            continue
+    
+    return job_list
+
 def crawl_snubh_recruitment():
     """분당서울대병원 채용 공고 크롤링 (Selenium 사용)"""
     
@@ -53,16 +203,13 @@ def crawl_snubh_recruitment():
         print("[INFO] Chrome 드라이버 초기화 중...")
         driver = setup_driver()
         
-        # 기본 URL
-        base_url = "https://snubh.recruiter.co.kr"
-        list_url = f"{base_url}/app/jobnotice/list"
-        
-        print(f"[DEBUG] 페이지 접속 중: {list_url}")
-        driver.get(list_url)
+        print(f"[DEBUG] 페이지 접속 중: {LIST_URL}")
+        with crawl_hooks.span("page_load"):
+            driver.get(LIST_URL)
         
         # 페이지 로드 대기
         print("[DEBUG] 페이지 로딩 대기 중...")
-        time.sleep(2)
+        crawl_hooks.sleep(2)
         
         # 100개씩 보기 설정
         try:
@@ -74,7 +221,7 @@ def crawl_snubh_recruitment():
             select.select_by_value("100")
             
             # 선택 후 페이지 로드 대기
-            time.sleep(3)
+            crawl_hooks.sleep(3)
             print("[DEBUG] 100개씩 보기 설정 완료")
         except Exception as e:
             print(f"[WARNING] 100개씩 보기 설정 실패: {e}")
@@ -86,157 +233,22 @@ def crawl_snubh_recruitment():
         )
         
         # 추가 대기 (JavaScript 실행 완료)
-        time.sleep(2)
+        crawl_hooks.sleep(2)
         
         # 페이지 소스 가져오기
         page_source = driver.page_source
         print(f"[DEBUG] 페이지 소스 길이: {len(page_source)} 문자")
         
-        # BeautifulSoup으로 파싱
-        soup = BeautifulSoup(page_source, 'html.parser')
+        crawl_hooks.record(page_source, page=1, url=LIST_URL)
         
         # 디버깅용 HTML 저장
         with open('debug_selenium_snubh.html', 'w', encoding='utf-8') as f:
             f.write(page_source)
         print("[DEBUG] HTML을 debug_selenium_snubh.html에 저장했습니다.")
         
-        # 채용 공고 리스트
-        job_list = []
-        
-        # divJobnoticeList 내부의 ul 찾기
-        div_element = soup.find('div', id='divJobnoticeList')
-        
-        if not div_element:
-            print("[ERROR] divJobnoticeList를 찾을 수 없습니다.")
-            return []
-        
-        ul_element = div_element.find('ul')
-        
-        if not ul_element:
-            print("[ERROR] ul 요소를 찾을 수 없습니다.")
-            print(f"[DEBUG] divJobnoticeList 내용: {div_element.prettify()[:500]}")
-            return []
-        
-        # li 태그들 찾기
-        li_elements = ul_element.find_all('li', recursive=False)
-        print(f"[DEBUG] 총 {len(li_elements)}개의 공고를 찾았습니다.\n")
-        
-        for idx, li in enumerate(li_elements, 1):
-            try:
-                print(f"\n[DEBUG] --- {idx}번째 공고 처리 중 ---")
-                
-                # 상태 확인 - "접수중"인지 체크
-                status_element = li.select_one('div.list-bbs-status > span')
-                
-                if status_element:
-                    status_text = status_element.get_text(strip=True)
-                    print(f"[DEBUG] 상태: '{status_text}'")
-                else:
-                    print(f"[DEBUG] 상태 요소를 찾을 수 없습니다.")
-                
-                if not status_element or '접수중' not in status_element.get_text(strip=True):
-                    print(f"[INFO] {idx}번째 공고: 접수중이 아니므로 크롤링을 종료합니다.")
-                    break
-                
-                # 제목 및 링크
-                # span.list-bbs-notice-name > a 셀렉터 사용
-                title_element = li.select_one('span.list-bbs-notice-name > a')
-                
-                if not title_element:
-                    # 대체 셀렉터
-                    title_element = li.select_one('h2.list-bbs-title a')
-                    print(f"[DEBUG] 대체 제목 셀렉터 사용")
-                
-                if not title_element:
-                    print(f"[ERROR] {idx}번째 공고의 제목을 찾을 수 없습니다.")
-                    continue
-                
-                title = title_element.get_text(strip=True)
-                detail_path = title_element.get('href', '')
-                detail_url = f"{base_url}{detail_path}" if detail_path else ""
-                print(f"[DEBUG] 제목: {title}")
-                print(f"[DEBUG] 상세 URL: {detail_url}")
-                
-                # 날짜 (시작일 ~ 종료일)
-                date_element = li.select_one('span.list-bbs-date')
-                
-                if not date_element:
-                    print(f"[ERROR] {idx}번째 공고의 날짜를 찾을 수 없습니다.")
-                    continue
-                
-                date_text = date_element.get_text(strip=True)
-                print(f"[DEBUG] 날짜 텍스트: '{date_text}'")
-                
-                # 날짜 파싱 (예: "2025.10.24(금) 09:00 ~ 2025.11.03(월) 23:59")
-                start_dt = ""
-                end_dt = ""
-                
-                # 정규식으로 날짜와 시간 추출
-                date_pattern = r'(\d{4}\.\d{2}\.\d{2})\([^)]+\)\s+(\d{2}:\d{2})\s*~\s*(\d{4}\.\d{2}\.\d{2})\([^)]+\)\s+(\d{2}:\d{2})'
-                match = re.search(date_pattern, date_text)
-                
-                if match:
-                    start_date_str = match.group(1)  # 2025.10.24
-                    start_time_str = match.group(2)  # 09:00
-                    end_date_str = match.group(3)    # 2025.11.03
-                    end_time_str = match.group(4)    # 23:59
-                    
-                    # 시작일 파싱
-                    start_date = parse_date(start_date_str)
-                    if start_date:
-                        start_hour, start_min = map(int, start_time_str.split(':'))
-                        start_dt = start_date.replace(hour=start_hour, minute=start_min, second=0).strftime("%Y-%m-%dT%H:%M:%S+09:00")
-                    
-                    # 종료일 파싱
-                    end_date = parse_date(end_date_str)
-                    if end_date:
-                        end_hour, end_min = map(int, end_time_str.split(':'))
-                        end_dt = end_date.replace(hour=end_hour, minute=end_min, second=0).strftime("%Y-%m-%dT%H:%M:%S+09:00")
-                    
-                    print(f"[DEBUG] 파싱된 시작일: {start_dt}")
-                    print(f"[DEBUG] 파싱된 종료일: {end_dt}")
-                
-                # D-day
-                dday_element = li.select_one('span.list-bbs-dday')
-                dday = parse_dday(dday_element.get_text(strip=True)) if dday_element else ""
-                print(f"[DEBUG] D-day: '{dday}'")
-                
-                # URL에서 공고 번호 추출
-                recu_idx = ""
-                announce_sn = ""
-                
-                if detail_path:
-                    # URL 파라미터 파싱
-                    import urllib.parse
-                    parsed = urllib.parse.urlparse(detail_path)
-                    query_params = urllib.parse.parse_qs(parsed.query)
-                    print(f"[DEBUG] URL 파라미터: {query_params}")
-                    
-                    # jobnoticeSn 추출
-                    if 'jobnoticeSn' in query_params:
-                        announce_sn = query_params['jobnoticeSn'][0]
-                        print(f"[DEBUG] announce_sn: {announce_sn}")
-                
-                # 결과 저장
-                job_data = {
-                    "title": title,
-                    "start_dt": start_dt,
-                    "end_dt": end_dt,
-                    "dday": dday,
-                    "recu_idx": recu_idx,
-                    "announce_sn": announce_sn,
-                    "detail_url": detail_url
-                }
-                
-                job_list.append(job_data)
-                print(f"[SUCCESS] {idx}. {title} - {dday} 추가 완료\n")
-                
-            except Exception as e:
-                print(f"[ERROR] {idx}번째 공고 처리 중 오류: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-        
+        with crawl_hooks.span("parse", page=1):
+            job_list = parse_job_list(page_source)
+        crawl_hooks.emit("page", page=1, items=len(job_list), bytes=len(page_source.encode("utf-8")))
         return job_list
         
     except Exception as e:
@@ -271,7 +283,7 @@ if __name__ == "__main__":
     
     # JSON 파일로 저장
     if jobs:
-        save_to_json(jobs)
+        save_to_json(jobs, os.getenv("OUTPUT", "snubh.json"))
         
         # 결과 미리보기
         print("\n=== 수집된 데이터 미리보기 ===")
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""
+크롤러 ↔ run_all.py 사이의 진행 이벤트 프로토콜.
+
+run_all.py가 CRAWL_EVENTS=1로 스크립트를 실행하면, 스크립트는 emit()으로
+'@@event {json}' 한 줄을 stdout에 바로(flush) 쓴다. run_all.py는 자식 출력을
+줄 단위로 읽으면서 이 줄만 골라 사이트 id를 붙여 다시 내보내고, server.py가 이를 받아
+/api/status/stream(SSE)으로 흘려보낸다. 단독 실행 시에는 아무것도 출력하지 않는다.
+
+span()/sleep()은 구간 시간을 'span' 이벤트로 보낸다. run_all.py가 이를 실행별 트레이스
+(tracing.py)에 사이트 구간의 하위 구간으로 기록한다.
+
+메모리는 기본으로 run_all.py가 프로세스 트리의 RSS만 잰다(profiling.py). CRAWL_TRACEMALLOC=1이면
+run_all.py 아래에서 tracemalloc도 켠다 (모든 할당이 느려지므로 진단할 때만). 페이지마다 파이썬 메모리가
+최대치를 넘으면 스냅샷을 떠 두고, 종료 시 그 스냅샷의 할당 상위 위치를 'memory' 이벤트로 보낸다.
+
+RECORD_DIR이 있으면 record()가 스크립트가 받은 페이지 원본 HTML을 RECORD_DIR/<사이트>/ 에 저장한다.
+bench/replay.py가 이 파일을 파싱 함수에 그대로 넣어 네트워크 없이 재현/벤치마크한다.
+HTML_PARSER로 BeautifulSoup 파서(html.parser, lxml, ...)를 고른다.
+
+SITE_BASE_OVERRIDE가 있으면 스크래퍼가 site_url()로 감싼 주소의 scheme://host 를 바꾼다.
+값은 URL 하나(모든 사이트 공통) 또는 {사이트 id: URL} JSON 파일 경로(bench/fake_sites.py가 만든다).
+
+시간 예산: run_all.py가 CRAWL_DEADLINE(epoch 초)을 넘겨주면 page 이벤트와 sleep()에서 마감을 확인하고,
+지났으면 Cancelled를 던진다. 예산을 넘기면 run_all.py가 SIGTERM을 보내는데, 이것도 Cancelled로 바꿔서
+스크래퍼의 finally(driver.quit() 등)가 돌게 한다. Cancelled는 BaseException이라 except Exception에 먹히지 않고,
+한 번 취소되면 이후 page/sleep마다 다시 던진다 (bare except로 삼켜도 다음 확인 지점에서 멈춘다).
+
+체크포인트: run_all.py가 CRAWL_CHECKPOINT(파일 경로)를 넘겨주면 checkpoint()가 페이지를 끝낼 때마다
+그 페이지에서 모은 항목을 한 줄(NDJSON)씩 덧붙인다. 중단된 실행을 이어 할 때(CRAWL_RESUME=1)는
+resume_point()가 마지막으로 끝낸 페이지와 그때까지의 항목을 돌려주므로 그다음 페이지부터 수집하면 된다.
+
+증분 수집: run_all.py가 CRAWL_SEEN(파일 경로)을 넘겨주면 Seen이 이전 실행까지 본 공고 id의 해시 집합을 읽는다.
+최신순 목록에서 이미 본 공고가 INCREMENTAL_STOP_AFTER개 연속 나오면 페이지 넘기기를 멈추고,
+나머지는 이전 결과 파일(run_all.py가 실행 전에 옮겨 두고 CRAWL_PREVIOUS로 넘긴다, 단독 실행이면 OUTPUT)에서
+아직 마감되지 않은 공고로 채운다 (carried=True 표시 → 공고 저장소가 마지막으로 본 시각을 올리지 않는다).
+마감 처리가 늦게 반영되지 않도록
+INCREMENTAL_FULL_SEC(기본 7일)마다 한 번은 끝까지 수집한다. INCREMENTAL=0이면 항상 끝까지.
+"""
+import os, sys, json, time, atexit, signal, hashlib, tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse
+
+EVENT_PREFIX = "@@event "
+ENABLED = os.getenv("CRAWL_EVENTS", "0") == "1"
+TRACEMALLOC = ENABLED and os.getenv("CRAWL_TRACEMALLOC", "0") == "1"
+TOP_ALLOCS = 8
+
+# 사이트 id: run_all.py가 CRAWL_SITE로 넘겨주고, 단독 실행이면 스크립트 이름
+SITE = os.getenv("CRAWL_SITE") or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+RECORD_DIR = os.getenv("RECORD_DIR")
+HTML_PARSER = os.getenv("HTML_PARSER", "html.parser")
+
+
+def _base_override():
+    value = os.getenv("SITE_BASE_OVERRIDE")
+    if not value or not value.endswith(".json"):
+        return value
+    with open(value, "r", encoding="utf-8") as f:
+        return json.load(f).get(SITE)
+
+
+BASE_OVERRIDE = _base_override()
+DEADLINE = float(os.getenv("CRAWL_DEADLINE") or 0) or None
+
+
+def site_url(url):
+    """사이트 주소 → SITE_BASE_OVERRIDE가 있으면 같은 경로의 가짜 서버 주소 (없으면 그대로)"""
+    if not BASE_OVERRIDE:
+        return url
+    base = urlparse(BASE_OVERRIDE)
+    return urlparse(url)._replace(scheme=base.scheme, netloc=base.netloc).geturl()
+
+
+# 🔹 시간 예산 / 취소
+
+class Cancelled(BaseException):
+    """시간 예산 초과 또는 run_all.py의 취소(SIGTERM)"""
+
+
+_cancel = {"reason": None}
+
+
+def time_left():
+    """마감까지 남은 초 (마감이 없으면 None)"""
+    return None if DEADLINE is None else DEADLINE - time.time()
+
+
+def check_deadline():
+    """취소됐거나 마감이 지났으면 Cancelled"""
+    if _cancel["reason"] is None and DEADLINE is not None and time.time() >= DEADLINE:
+        _cancel["reason"] = "시간 예산 초과"
+    if _cancel["reason"] is not None:
+        raise Cancelled(_cancel["reason"])
+
+
+def _on_sigterm(signum, frame):
+    # 이미 취소되어 정리 중이면(마감과 SIGTERM이 겹친 경우) 정리를 끊지 않는다
+    if _cancel["reason"] is not None:
+        return
+    _cancel["reason"] = "취소됨 (SIGTERM)"
+    raise Cancelled(_cancel["reason"])
+
+
+def _excepthook(etype, value, tb):
+    # 취소는 오류 추적 대신 한 줄로 (종료 코드는 그대로 1)
+    if issubclass(etype, Cancelled):
+        print(f"⏹️ {SITE}: {value}", file=sys.stderr)
+        return
+    sys.__excepthook__(etype, value, tb)
+
+
+if ENABLED and DEADLINE is not None:  # run_all.py 아래에서 돌 때만
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    sys.excepthook = _excepthook
+
+
+def emit(event, **fields):
+    """진행 이벤트 한 줄 출력 (예: emit("page", page=3, items=10)). page 이벤트는 마감 확인 지점"""
+    if not ENABLED:
+        return
+    payload = {"event": event, "ts": round(time.time(), 3), **fields}
+    sys.stdout.write(EVENT_PREFIX + json.dumps(payload, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+    if event == "page" and TRACEMALLOC:
+        _maybe_snapshot()
+    if event == "page":
+        check_deadline()
+
+
+@contextmanager
+def span(name, **args):
+    """구간 시간 측정 (예: with span("fetch", page=3): ...)"""
+    start = time.time()
+    try:
+        yield
+    finally:
+        emit("span", span=name, start=round(start, 6), dur=round(time.time() - start, 6), **args)
+
+
+def sleep(seconds, **args):
+    """time.sleep + 대기 구간 기록 (트레이스에서 대기 시간이 따로 보이도록).
+    마감을 넘겨서 자지 않는다 (마감이면 Cancelled)"""
+    check_deadline()
+    left = time_left()
+    with span("sleep", **args):
+        time.sleep(seconds if left is None else max(0, min(seconds, left)))
+    check_deadline()
+
+
+# 🔹 체크포인트 (중단된 실행 이어 하기)
+
+CHECKPOINT = os.getenv("CRAWL_CHECKPOINT")
+RESUME = os.getenv("CRAWL_RESUME", "0") == "1"
+
+
+def resume_point():
+    """이어 할 위치 → (마지막으로 끝낸 페이지, 그때까지 모은 항목). 처음부터면 (0, [])"""
+    if not (CHECKPOINT and RESUME):
+        return 0, []
+    page, items = 0, []
+    try:
+        with open(CHECKPOINT, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    break  # 쓰다가 끊긴 마지막 줄
+                page = rec["page"]
+                items.extend(rec["items"])
+    except OSError:
+        return 0, []
+    if page:
+        emit("resumed", page=page, items=len(items))
+    return page, items
+
+
+def checkpoint(page, items):
+    """page를 끝냈을 때 그 페이지에서 모은 항목 기록 (이 페이지 몫만, 한 줄씩 덧붙인다)"""
+    if not CHECKPOINT:
+        return
+    with open(CHECKPOINT, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"page": page, "items": items}, ensure_ascii=False) + "\n")
+
+
+# 🔹 이미 본 공고 (증분 수집)
+
+SEEN_PATH = os.getenv("CRAWL_SEEN")
+PREVIOUS_PATH = os.getenv("CRAWL_PREVIOUS")
+INCREMENTAL = os.getenv("INCREMENTAL", "1") == "1"
+INCREMENTAL_STOP_AFTER = int(os.getenv("INCREMENTAL_STOP_AFTER", "10"))
+INCREMENTAL_FULL_SEC = int(os.getenv("INCREMENTAL_FULL_SEC", str(7 * 24 * 3600)))
+SEEN_KEEP_DAYS = 90
+
+
+def posting_key(item, *fields):
+    """공고 id: fields 중 처음 값이 있는 것들(announce_sn, recu_idx ...) → 없으면 detail_url → 제목"""
+    parts = [str(item[f]) for f in fields if item.get(f)]
+    return "|".join(parts) or item.get("detail_url") or item.get("title") or ""
+
+
+def _ended(item, now):
+    """end_dt(ISO)가 now보다 이전이면 True (없거나 못 읽으면 False)"""
+    try:
+        end = datetime.fromisoformat(item.get("end_dt") or "")
+    except (TypeError, ValueError):
+        return False
+    return (end if end.tzinfo else end.astimezone()) < now
+
+
+class Seen:
+    """사이트별로 본 공고 id 해시(8바이트) 집합 + 증분 수집 판단.
+
+        seen = crawl_hooks.Seen(key=lambda it: crawl_hooks.posting_key(it, "recu_idx", "announce_sn"))
+        for page ...:
+            results.extend(items)
+            if seen.observe(items):   # 이미 본 공고가 연속으로 나옴 → 그만 넘긴다
+                break
+        results = seen.finish(results, output)   # 이전 결과로 나머지를 채우고 id 집합 저장
+    """
+
+    def __init__(self, key=posting_key, path=SEEN_PATH):
+        self.key = key
+        self.path = path
+        self.ids, self.full_at = {}, 0
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.ids, self.full_at = data.get("ids") or {}, data.get("full_at") or 0
+            except (OSError, ValueError):
+                pass
+        # 본 공고 기록이 있고 최근에 끝까지 수집한 적이 있어야 중간에 멈춘다
+        self.active = bool(INCREMENTAL and path and self.ids and time.time() - self.full_at < INCREMENTAL_FULL_SEC)
+        self.run = 0  # 연속으로 이미 본 공고 수
+        self.stopped = False
+        self.today = int(time.time() // 86400)
+
+    def _hash(self, item):
+        return hashlib.blake2b(self.key(item).encode("utf-8"), digest_size=8).hexdigest()
+
+    def observe(self, items):
+        """한 페이지 항목 기록 → 이미 본 공고가 INCREMENTAL_STOP_AFTER개 연속이면 True (여기서 멈추면 된다)"""
+        for item in items:
+            h = self._hash(item)
+            self.run = self.run + 1 if h in self.ids else 0
+            self.ids[h] = self.today
+        if self.active and self.run >= INCREMENTAL_STOP_AFTER:
+            self.stopped = True
+            emit("incremental_stop", seen_run=self.run)
+        return self.stopped
+
+    def finish(self, results, previous_path=None):
+        """중간에 멈췄으면 이전 결과(previous_path)에서 이번에 못 본 공고 중 아직 안 끝난 것을 붙인다.
+        id 집합을 저장하고 합친 결과를 반환"""
+        previous_path = PREVIOUS_PATH or previous_path
+        if self.stopped and previous_path:
+            have = {self._hash(item) for item in results}
+            now = datetime.now().astimezone()
+            try:
+                with open(previous_path, "r", encoding="utf-8") as f:
+                    previous = json.load(f)
+            except (OSError, ValueError):
+                previous = []
+            carried = [
+                {**item, "carried": True} for item in previous
+                if isinstance(item, dict) and self._hash(item) not in have and not _ended(item, now)
+            ]
+            results = results + carried
+        if self.path:
+            cutoff = self.today - SEEN_KEEP_DAYS
+            data = {"full_at": self.full_at if self.stopped else time.time(),
+                    "ids": {h: d for h, d in self.ids.items() if d >= cutoff}}
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        return results
+
+
+# 🔹 페이지 기록 (오프라인 재현용 fixture)
+
+_recorded = []
+
+
+def record(html, page=1, url=None, kind="list"):
+    """RECORD_DIR이 설정돼 있으면 페이지 HTML을 <kind>-<page>.html 로 저장하고 manifest.json 갱신.
+    html은 문자열 또는 문자열을 돌려주는 함수 (driver.page_source는 기록할 때만 읽도록)"""
+    if not RECORD_DIR:
+        return
+    if callable(html):
+        html = html()
+    site_dir = os.path.join(RECORD_DIR, SITE)
+    os.makedirs(site_dir, exist_ok=True)
+    if not _recorded:
+        # 이번 실행의 첫 페이지: 이전 기록은 지우고 새로 채운다
+        for fname in os.listdir(site_dir):
+            if fname.endswith(".html") or fname == "manifest.json":
+                os.remove(os.path.join(site_dir, fname))
+    fname = f"{kind}-{page:03d}.html"
+    with open(os.path.join(site_dir, fname), "w", encoding="utf-8") as f:
+        f.write(html)
+    _recorded.append({"file": fname, "kind": kind, "page": page, "url": url,
+                      "bytes": len(html.encode("utf-8"))})
+    manifest = {
+        "site": SITE,
+        "recorded_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+        "pages": _recorded,
+    }
+    with open(os.path.join(site_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+# 🔹 파이썬 메모리 (tracemalloc)
+
+_peak_snapshot = {"size": 0, "snapshot": None}
+
+
+def _maybe_snapshot():
+    """지금이 지금까지 중 가장 메모리를 많이 쓰는 시점이면 스냅샷 보관"""
+    current, _ = tracemalloc.get_traced_memory()
+    if current > _peak_snapshot["size"]:
+        _peak_snapshot["size"] = current
+        _peak_snapshot["snapshot"] = tracemalloc.take_snapshot()
+
+
+def _report_memory():
+    _maybe_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    if _peak_snapshot["snapshot"] is None:
+        return
+    snapshot = _peak_snapshot["snapshot"].filter_traces((
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ))
+    top = []
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCS]:
+        frame = stat.traceback[0]
+        top.append({
+            "where": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+            "kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        })
+    emit("memory", python_peak=peak, top=top)
+
+
+if TRACEMALLOC:
+    tracemalloc.start()
+    atexit.register(_report_memory)
+
+
+def parse_event(line):
+    """'@@event {...}' 줄이면 dict, 아니면 None"""
+    if not line.startswith(EVENT_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(EVENT_PREFIX):])
+    except ValueError:
+        return None
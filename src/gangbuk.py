@@ -1,5 +1,5 @@
 # pip install selenium beautifulsoup4
-import os, re, json, time, logging
+import os, re, json, logging
 from datetime import datetime, timezone, timedelta
 from urllib.parse import urljoin
 from bs4 import BeautifulSoup
@@ -9,11 +9,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+import crawl_hooks
+
 # ==========================
 # 기본 설정
 # ==========================
 
-BASE = "https://recruit.kbsmc.co.kr"
+BASE = crawl_hooks.site_url("https://recruit.kbsmc.co.kr")
 LIST_URL = BASE + "/jsp/recruit/recruitList.jsp"
 KST = timezone(timedelta(hours=9))
 
@@ -65,15 +67,16 @@ def get_driver(headless=True):
     opts.add_argument("--disable-gpu")
     opts.add_argument("--no-sandbox")
     opts.add_argument("--window-size=1400,1200")
-    return webdriver.Chrome(options=opts)
+    with crawl_hooks.span("driver_start"):
+        return webdriver.Chrome(options=opts)
 
 # ==========================
 # 페이지 단위 추출
 # ==========================
 
-def extract_page_items(driver):
+def extract_page_items(html):
     """현재 페이지 HTML 파싱 (디버깅 로그 포함)"""
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = BeautifulSoup(html, crawl_hooks.HTML_PARSER)
     ul = soup.select_one("div.sub_0101_list.on > ul")
     if not ul:
         log.warning("리스트 ul을 못 찾음.")
@@ -143,15 +146,20 @@ def crawl_kbsmc(output="kbsmc.json", headless=True, max_pages=20):
     driver = get_driver(headless=headless)
     results = []
     try:
-        driver.get(LIST_URL)
+        with crawl_hooks.span("page_load"):
+            driver.get(LIST_URL)
         wait = WebDriverWait(driver, 10)
         wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.sub_0101_list.on > ul > a")))
 
         for page_idx in range(1, max_pages + 1):
             log.info("===== PAGE %d =====", page_idx)
-            items, stop_page = extract_page_items(driver)
+            html = driver.page_source
+            crawl_hooks.record(html, page=page_idx, url=driver.current_url)
+            with crawl_hooks.span("parse", page=page_idx):
+                items, stop_page = extract_page_items(html)
             results.extend(items)
             log.info("page %d: %d건 수집 (누적 %d)", page_idx, len(items), len(results))
+            crawl_hooks.emit("page", page=page_idx, items=len(items), bytes=len(html.encode("utf-8")))
 
             if stop_page:
                 log.info("이 페이지에서 '마감' 항목 발견 → 전체 중단.")
@@ -165,7 +173,7 @@ def crawl_kbsmc(output="kbsmc.json", headless=True, max_pages=20):
                 break
 
             driver.execute_script("arguments[0].click();", next_btn)
-            time.sleep(1.0)
+            crawl_hooks.sleep(1.0)
 
             try:
                 wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.sub_0101_list.on > ul > a")))
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # deps:
 #   pip install selenium webdriver-manager python-dateutil
-import json, re, time
+import os, json, re
 from urllib.parse import urljoin, urlparse
 from datetime import datetime, time as dtime
 from zoneinfo import ZoneInfo
@@ -14,8 +14,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-BASE_URL = "https://kumc.recruiter.co.kr"
-LIST_URL = "https://kumc.recruiter.co.kr/career/job"
+import crawl_hooks
+
+BASE_URL = crawl_hooks.site_url("https://kumc.recruiter.co.kr")
+LIST_URL = crawl_hooks.site_url("https://kumc.recruiter.co.kr/career/job")
 SEOUL = ZoneInfo("Asia/Seoul")
 
 # ---------------- Driver ----------------
@@ -28,7 +30,8 @@ def get_driver(headless=True):
     opts.add_argument("--disable-dev-shm-usage")
     opts.add_argument("--window-size=1366,3000")
     opts.add_argument("--user-agent=Mozilla/5.0")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+    with crawl_hooks.span("driver_start"):
+        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
 
 # ---------------- Date / D-day ----------------
 def to_iso(dt):
@@ -189,29 +192,37 @@ def click_page(driver, target_num, wait, wait_css=LIST_UL, timeout=10):
             )
     except:
         pass
-    time.sleep(0.5)
+    crawl_hooks.sleep(0.5)
     return True
 
 # ---------------- Crawl ----------------
 def crawl_kumc_paged(output_path="kumc_jobs.json", only_open=True, hospitals=("안암병원","구로병원")):
     driver = get_driver(headless=True)
     wait = WebDriverWait(driver, 12)
-    driver.get(LIST_URL)
+    with crawl_hooks.span("page_load"):
+        driver.get(LIST_URL)
 
     wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, LIST_UL)))
 
     total_pages = get_total_pages(driver)
-    results = []
+    # 중단된 실행을 이어 하면 마지막으로 끝낸 페이지 다음부터 (그때까지 모은 항목은 체크포인트에서)
+    done_page, results = crawl_hooks.resume_point()
     stop_flag = False   # ⬅ 추가
 
-    for page_num in range(1, total_pages + 1):
+    for page_num in range(done_page + 1, total_pages + 1):
         if page_num > 1:
             ok = click_page(driver, page_num, wait)
+            if not ok and page_num == done_page + 1:
+                # 이어 할 페이지 번호가 안 보이면 앞에서부터 차례로 넘긴다
+                ok = all(click_page(driver, p, wait) for p in range(2, page_num + 1))
             if not ok:
                 break
             wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, LIST_UL)))
 
+        crawl_hooks.record(lambda: driver.page_source, page=page_num, url=driver.current_url)
         lis = driver.find_elements(By.CSS_SELECTOR, LI_SEL)
+        crawl_hooks.emit("page", page=page_num, items=len(lis))
+        before = len(results)
         for li in lis:
             try:
                 item = parse_li(li)
@@ -238,6 +249,7 @@ def crawl_kumc_paged(output_path="kumc_jobs.json", only_open=True, hospitals=("
 
             results.append(item)
 
+        crawl_hooks.checkpoint(page_num, results[before:])
         if stop_flag:
             break   # 페이지 루프도 중단
 
@@ -252,4 +264,4 @@ def crawl_kumc_paged(output_path="kumc_jobs.json", only_open=True, hospitals=("
 # ---------------- Run ----------------
 if __name__ == "__main__":
     # 안암/구로만, 접수중만, 숫자 페이지 끝까지 순회
-    crawl_kumc_paged(output_path="kumc.json", only_open=True, hospitals=("안암병원","구로병원"))
+    crawl_kumc_paged(output_path=os.getenv("OUTPUT", "kumc.json"), only_open=True, hospitals=("안암병원","구로병원"))
@@ -5,7 +5,9 @@ from urllib.parse import urljoin
 import requests
 from bs4 import BeautifulSoup
 
-BASE = "https://www.kuh.ac.kr"
+import crawl_hooks
+
+BASE = crawl_hooks.site_url("https://www.kuh.ac.kr")
 LIST_URL = BASE + "/m/recruit/apply/noticeList.do"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 KST = timezone(timedelta(hours=9))
@@ -47,27 +49,16 @@ def parse_range(txt: str):
         edt = edt.replace(hour=23, minute=59)
     return sdt, edt
 
-def crawl_kuh(output="kuh.json"):
-    """
-    - #proceeding > div 를 위에서부터 순회
-    - 제목:   a > strong.title
-    - 기간:   a > div (텍스트 전체)
-    - 상태:   a > strong.color01  → '마감'이면 즉시 중단, 그 전까지 수집
-    """
-    sess = requests.Session()
-    sess.headers.update(HEADERS)
-
-    r = sess.get(LIST_URL, timeout=15)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
+def parse_list_page(html):
+    """리스트 HTML → 진행 중 공고 목록 ('마감' 항목을 만나면 거기서 멈춘다). #proceeding이 없으면 None"""
+    soup = BeautifulSoup(html, crawl_hooks.HTML_PARSER)
 
     container = soup.select_one("#proceeding")
     if not container:
         log.error("#proceeding 을 못 찾음. 구조가 바뀌었을 가능성.")
-        return []
+        return None
 
     results = []
-    hard_stop = False
 
     # div들을 문서 순서대로
     for idx, div in enumerate(container.find_all("div", recursive=False), 1):
@@ -99,12 +90,34 @@ def crawl_kuh(output="kuh.json"):
             "detail_url": detail_url
         })
 
+    return results
+
+def crawl_kuh(output="kuh.json"):
+    """
+    - #proceeding > div 를 위에서부터 순회
+    - 제목:   a > strong.title
+    - 기간:   a > div (텍스트 전체)
+    - 상태:   a > strong.color01  → '마감'이면 즉시 중단, 그 전까지 수집
+    """
+    sess = requests.Session()
+    sess.headers.update(HEADERS)
+
+    with crawl_hooks.span("fetch"):
+        r = sess.get(LIST_URL, timeout=15)
+    r.raise_for_status()
+    crawl_hooks.record(r.text, page=1, url=r.url)
+
+    with crawl_hooks.span("parse", page=1):
+        results = parse_list_page(r.text)
+    if results is None:
+        return []
 
+    crawl_hooks.emit("page", page=1, items=len(results), fetch_sec=round(r.elapsed.total_seconds(), 3), bytes=len(r.content))
 
     with open(output, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
 
-    log.info("저장 완료: %s (총 %d건, hard_stop=%s)", output, len(results), hard_stop)
+    log.info("저장 완료: %s (총 %d건)", output, len(results))
     return results
 
 if __name__ == "__main__":
@@ -5,7 +5,9 @@ from urllib.parse import urljoin
 import requests
 from bs4 import BeautifulSoup
 
-BASE = "https://recruit.incruit.com"
+import crawl_hooks
+
+BASE = crawl_hooks.site_url("https://recruit.incruit.com")
 START_URL = BASE + "/khmc/job/"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 KST = timezone(timedelta(hours=9))
@@ -55,23 +57,14 @@ def parse_range(txt: str):
         edt = edt.replace(hour=23, minute=59)
     return sdt, edt
 
-def crawl_khmc(output="khmc.json"):
-    """
-    - 인크루트 강북삼성병원 채용
-    - 모집중인 항목(span.state='모집중')만 수집
-    - title/em/url 추출
-    """
-    sess = requests.Session()
-    sess.headers.update(HEADERS)
-
-    r = sess.get(START_URL, timeout=15)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
+def parse_list_page(html):
+    """리스트 HTML → '모집중' 공고 목록. 리스트 ul이 없으면 None"""
+    soup = BeautifulSoup(html, crawl_hooks.HTML_PARSER)
 
     ul = soup.select_one("body > div > div.tamplet_container > div.inner-layout > div.list-item-box > ul")
     if not ul:
         log.error("공고 리스트 ul을 찾을 수 없음. 구조 변경됐을 가능성.")
-        return []
+        return None
 
     results = []
     lis = ul.find_all("li", recursive=False)
@@ -100,6 +93,29 @@ def crawl_khmc(output="khmc.json"):
             "detail_url": detail_url
         })
 
+    return results
+
+def crawl_khmc(output="khmc.json"):
+    """
+    - 인크루트 강북삼성병원 채용
+    - 모집중인 항목(span.state='모집중')만 수집
+    - title/em/url 추출
+    """
+    sess = requests.Session()
+    sess.headers.update(HEADERS)
+
+    with crawl_hooks.span("fetch"):
+        r = sess.get(START_URL, timeout=15)
+    r.raise_for_status()
+    crawl_hooks.record(r.text, page=1, url=r.url)
+
+    with crawl_hooks.span("parse", page=1):
+        results = parse_list_page(r.text)
+    if results is None:
+        return []
+
+    crawl_hooks.emit("page", page=1, items=len(results), fetch_sec=round(r.elapsed.total_seconds(), 3), bytes=len(r.content))
+
     with open(output, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
 
@@ -107,4 +123,4 @@ def crawl_khmc(output="khmc.json"):
     return results
 
 if __name__ == "__main__":
-    crawl_khmc()
+    crawl_khmc(output=os.getenv("OUTPUT", "khmc.json"))
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 # deps:
 #   pip install selenium webdriver-manager python-dateutil
-import json, re, time
+import os, json, re
 from urllib.parse import urljoin, urlparse
 from datetime import datetime, date, time as dtime
 from zoneinfo import ZoneInfo
@@ -14,9 +14,12 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-BASE_URL = "https://hyumc.recruiter.co.kr"
-LIST_URL = "https://hyumc.recruiter.co.kr/career/home"
+import crawl_hooks
+
+BASE_URL = crawl_hooks.site_url("https://hyumc.recruiter.co.kr")
+LIST_URL = crawl_hooks.site_url("https://hyumc.recruiter.co.kr/career/home")
 SEOUL = ZoneInfo("Asia/Seoul")
+LI_SEL = ".RecruitList_recruit-list__FlKk4.PC > ul > li"
 
 # ---------------------------- Driver ----------------------------
 def get_driver(headless=True):
@@ -28,7 +31,8 @@ def get_driver(headless=True):
     opts.add_argument("--disable-dev-shm-usage")
     opts.add_argument("--window-size=1366,3000")
     opts.add_argument("--user-agent=Mozilla/5.0")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+    with crawl_hooks.span("driver_start"):
+        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
 
 # ---------------------------- Date utils ----------------------------
 def to_iso(dt):
@@ -118,7 +122,7 @@ def try_click_more(driver):
             el = driver.find_element(By.XPATH, xp)
             if el.is_displayed() and el.is_enabled():
                 driver.execute_script("arguments[0].click();", el)
-                time.sleep(1.0)
+                crawl_hooks.sleep(1.0)
                 return True
         except Exception:
             pass
@@ -204,7 +208,8 @@ def parse_li(li):
 def crawl_hyumc(output_path="hyumc.json", show_only_open=True, click_more_times=0):
     driver = get_driver(headless=True)
     wait = WebDriverWait(driver, 12)
-    driver.get(LIST_URL)
+    with crawl_hooks.span("page_load"):
+        driver.get(LIST_URL)
 
     # 리스트 컨테이너 대기
     ul = wait_list_ul(driver, wait)
@@ -214,9 +219,11 @@ def crawl_hyumc(output_path="hyumc.json", show_only_open=True, click_more_times=
         if not try_click_more(driver):
             break
         # 새로운 li 로드 대기(간단히 sleep)
-        time.sleep(0.8)
+        crawl_hooks.sleep(0.8)
 
-    lis = driver.find_elements(By.CSS_SELECTOR, ".RecruitList_recruit-list__FlKk4.PC > ul > li")
+    crawl_hooks.record(lambda: driver.page_source, page=1, url=driver.current_url)
+    lis = driver.find_elements(By.CSS_SELECTOR, LI_SEL)
+    crawl_hooks.emit("page", page=1, items=len(lis))
     results = []
     for li in lis:
         try:
@@ -240,4 +247,4 @@ def crawl_hyumc(output_path="hyumc.json", show_only_open=True, click_more_times=
 if __name__ == "__main__":
     # show_only_open=True: '접수중'만, False: 전체
     # click_more_times: '더보기'가 있으면 몇 번 누를지 지정 (없으면 0)
-    crawl_hyumc(output_path="hyumc.json", show_only_open=True, click_more_times=0)
+    crawl_hyumc(output_path=os.getenv("OUTPUT", "hyumc.json"), show_only_open=True, click_more_times=0)
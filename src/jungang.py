@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 # deps: pip install selenium webdriver-manager python-dateutil
-import json, re, time
+import os, json, re
 from urllib.parse import urlparse, parse_qs
 from datetime import datetime, date, time as dtime
 from zoneinfo import ZoneInfo
@@ -13,8 +13,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 
-BASE_URL = "https://caumc.recruiter.co.kr"
-LIST_URL = "https://caumc.recruiter.co.kr/app/jobnotice/list"
+import crawl_hooks
+
+BASE_URL = crawl_hooks.site_url("https://caumc.recruiter.co.kr")
+LIST_URL = crawl_hooks.site_url("https://caumc.recruiter.co.kr/app/jobnotice/list")
 SEOUL = ZoneInfo("Asia/Seoul")
 
 # ---------------------------- 드라이버/유틸 ----------------------------
@@ -27,13 +29,14 @@ def get_driver(headless=True):
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--window-size=1366,3000")
     options.add_argument("--user-agent=Mozilla/5.0")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    with crawl_hooks.span("driver_start"):
+        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
 
 def set_page_size_20(driver, wait):
     try:
         sel = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#pageSize")))
         Select(sel).select_by_value("20")
-        time.sleep(1.0)
+        crawl_hooks.sleep(1.0)
         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#divJobnoticeList > ul > li")))
     except Exception:
         pass
@@ -231,7 +234,7 @@ def click_next(driver):
             el = driver.find_element(By.XPATH, xp)
             if el.is_enabled():
                 driver.execute_script("arguments[0].click();", el)
-                time.sleep(1.2)
+                crawl_hooks.sleep(1.2)
                 return True
         except:
             pass
@@ -239,7 +242,7 @@ def click_next(driver):
         current = driver.find_element(By.CSS_SELECTOR, ".pagination li.active, .paging li.on, .page li.active")
         sib = current.find_element(By.XPATH, "following-sibling::li[1]/a")
         driver.execute_script("arguments[0].click();", sib)
-        time.sleep(1.0)
+        crawl_hooks.sleep(1.0)
         return True
     except:
         return False
@@ -248,14 +251,18 @@ def click_next(driver):
 def crawl_to_json(output_path="caumc_jobs.json", show_only_open=True, page_limit=10):
     driver = get_driver(headless=True)
     wait = WebDriverWait(driver, 10)
-    driver.get(LIST_URL)
+    with crawl_hooks.span("page_load"):
+        driver.get(LIST_URL)
     set_page_size_20(driver, wait)
 
     all_rows, seen = [], set()
 
     for page in range(page_limit):
         wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "#divJobnoticeList > ul > li")))
-        page_rows = parse_list_page(driver, show_only_open=show_only_open, warn_on_fail=True)
+        crawl_hooks.record(lambda: driver.page_source, page=page + 1, url=driver.current_url)
+        with crawl_hooks.span("parse", page=page + 1):
+            page_rows = parse_list_page(driver, show_only_open=show_only_open, warn_on_fail=True)
+        crawl_hooks.emit("page", page=page + 1, items=len(page_rows))
         for r in page_rows:
             key = r["announce_sn"]
             if key in seen:
@@ -273,4 +280,4 @@ def crawl_to_json(output_path="caumc_jobs.json", show_only_open=True, page_limit
 
 if __name__ == "__main__":
     # 접수중만(True) / 전체(False)
-    crawl_to_json(output_path="caumc.json", show_only_open=True, page_limit=10)
+    crawl_to_json(output_path=os.getenv("OUTPUT", "caumc.json"), show_only_open=True, page_limit=10)
@@ -1,10 +1,12 @@
 # pip install requests beautifulsoup4
 import re, json, requests, logging, os, sys, traceback
 from bs4 import BeautifulSoup
+
+import crawl_hooks
 from urllib.parse import urljoin
 from datetime import datetime, timezone, timedelta
 
-BASE = "https://mokdong.eumc.ac.kr"
+BASE = crawl_hooks.site_url("https://mokdong.eumc.ac.kr")
 LIST_TPL = BASE + "/intro/recrut/list.do?pageIndex={page}&bid_status=I&searchWord="
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 KST = timezone(timedelta(hours=9))
@@ -87,10 +89,23 @@ def extract_item(li, page, idx):
     log.debug("[page %s][li %s] item=%r", page, idx, item)
     return item
 
+def find_list_items(html):
+    """리스트 HTML → 직계 li 목록 (리스트 UL이 없으면 None)"""
+    soup = BeautifulSoup(html, crawl_hooks.HTML_PARSER)
+    ul = soup.select_one("#content > div > ul.card-list")
+    if not ul:
+        return None
+    return ul.find_all("li", recursive=False)
+
 # ── crawler ───────────────────────────────────────────────────────────────────
 def crawl(output="eumc_mokdong.json", start_page=1, max_pages=200, save_html=False):
-    page = start_page
-    results = []
+    # 중단된 실행을 이어 하면 마지막으로 끝낸 페이지 다음부터 (그때까지 모은 항목은 체크포인트에서)
+    done_page, results = crawl_hooks.resume_point()
+    page = max(start_page, done_page + 1)
+    if done_page:
+        log.info("체크포인트에서 이어 함: page=%s까지 %d건", done_page, len(results))
+
+    seen = crawl_hooks.Seen()  # detail_url 기준
 
     session = requests.Session()
     session.headers.update(HEADERS)
@@ -99,7 +114,8 @@ def crawl(output="eumc_mokdong.json", start_page=1, max_pages=200, save_html=Fal
         url = LIST_TPL.format(page=page)
         log.info("요청: %s", url)
         try:
-            r = session.get(url, timeout=15)
+            with crawl_hooks.span("fetch", page=page):
+                r = session.get(url, timeout=15)
             log.debug("HTTP %s %s bytes", r.status_code, len(r.text))
             r.raise_for_status()
         except Exception as e:
@@ -110,25 +126,27 @@ def crawl(output="eumc_mokdong.json", start_page=1, max_pages=200, save_html=Fal
         html = r.text
         if save_html:
             snapshot(html, page, "list")
+        crawl_hooks.record(html, page=page, url=url)
 
-        soup = BeautifulSoup(html, "html.parser")
-        ul = soup.select_one("#content > div > ul.card-list")
-        if not ul:
+        with crawl_hooks.span("parse", page=page):
+            lis = find_list_items(html)
+        if lis is None:
             log.warning("리스트 UL 선택자 불일치(page=%s). selector 갱신 필요", page)
             if save_html:
                 snapshot(html, page, "no_ul")
             # 더 진행해봐야 의미 없음 → 중단
             break
 
-        # 직계 li만
-        lis = ul.find_all("li", recursive=False)
         log.info("page=%s li개수=%s", page, len(lis))
+        crawl_hooks.emit("page", page=page, items=len(lis),
+                         fetch_sec=round(r.elapsed.total_seconds(), 3), bytes=len(r.content))
 
         if not lis:
             # 더 이상 게시글이 없는 정상 종료 케이스로 간주
             log.info("더 이상 항목 없음. 종료.")
             break
 
+        before = len(results)
         for i, li in enumerate(lis, 1):
             try:
                 item = extract_item(li, page, i)
@@ -145,8 +163,14 @@ def crawl(output="eumc_mokdong.json", start_page=1, max_pages=200, save_html=Fal
                     except Exception:
                         pass
 
+        crawl_hooks.checkpoint(page, results[before:])
+        if seen.observe(results[before:]):
+            log.info("이미 본 공고 %d건 연속 → 중단하고 이전 결과와 합침.", seen.run)
+            break
         page += 1
 
+    results = seen.finish(results, output)
+
     try:
         with open(output, "w", encoding="utf-8") as f:
             json.dump(results, f, ensure_ascii=False, indent=2)
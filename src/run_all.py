@@ -1,6 +1,18 @@
 import os
+import sys
+import errno
+import json
+import time
+import signal
+import heapq
+import queue
+import threading
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import crawl_hooks
 
 # 현재 파일이 위치한 폴더 = src
 SRC_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -9,13 +21,23 @@ ROOT_DIR = os.path.dirname(SRC_DIR)
 OUT_DIR = os.path.join(ROOT_DIR, "json")
 os.makedirs(OUT_DIR, exist_ok=True)
 
+# 루트의 공유 상태 저장소(crawl_state) 사용
+sys.path.insert(0, ROOT_DIR)
+import crawl_state  # noqa: E402
+import metrics  # noqa: E402
+import tracing  # noqa: E402
+import profiling  # noqa: E402
+import publish  # noqa: E402
+import normalize_jobs  # noqa: E402
+
+# 결과 파일명(확장자 제외)이 곧 사이트 id (index.html SOURCES의 id, normalized/<id>.json)
 JOBS = [
     ("강북삼성병원", "gangbuk.py", "kbsmc.json"),
-    ("고려대학교의료원", "goryu.py", "goryu.json"),
+    ("고려대학교의료원", "goryu.py", "kumc.json"),
     ("건국대학교병원", "gunguk.py", "gunguk.json"),
-    ("경희의료원", "gyunghee.py", "gyunghee.json"),
-    ("한양대학교병원", "hanyang.py", "hanyang.json"),
-    ("중앙대학교병원", "jungang.py", "jungang.json"),
+    ("경희의료원", "gyunghee.py", "khmc.json"),
+    ("한양대학교병원", "hanyang.py", "hyumc.json"),
+    ("중앙대학교병원", "jungang.py", "caumc.json"),
     ("이대목동병원", "mokdong.py", "mokdong.json"),
     ("삼성서울병원", "samsung.py", "samsung.json"),
     ("세브란스병원", "sebrance.py", "sebrance.json"),
@@ -26,51 +48,555 @@ JOBS = [
     ("분당서울병원", "bundang.py", "snubh.json")
 ]
 
+def site_id(final_filename):
+    return os.path.splitext(final_filename)[0]
+
+def job_for(site):
+    """사이트 id → JOBS 항목 (없으면 None)"""
+    return next((job for job in JOBS if site_id(job[2]) == site), None)
+
+# 🔹 사이트별 시간 예산
+# 예산을 넘기면 스크립트에 SIGTERM(crawl_hooks가 Cancelled로 바꿔 driver.quit() 등 정리),
+# CANCEL_GRACE_SEC 안에 안 끝나면 프로세스 그룹(chromedriver, Chrome 포함)째 SIGKILL.
+# 스크립트에는 CRAWL_DEADLINE으로 마감을 알려 page/sleep 마다 스스로 멈추게 한다.
+DEFAULT_BUDGET_SEC = int(os.getenv("SITE_BUDGET_SEC", "120"))
+BROWSER_BUDGET_SEC = int(os.getenv("BROWSER_BUDGET_SEC", "240"))
+BROWSER_SITES = {"kbsmc", "kumc", "hyumc", "caumc", "sebrance", "cmcseoul", "snubh"}  # Selenium
+SITE_BUDGETS = {}  # 사이트별로 따로 줄 때 {site: 초}
+CANCEL_GRACE_SEC = 10
+MIN_SITE_SEC = 15  # 실행 마감(RUN_DEADLINE)까지 이보다 적게 남으면 사이트를 시작하지 않는다
+
+def budget_for(site):
+    return SITE_BUDGETS.get(site) or (BROWSER_BUDGET_SEC if site in BROWSER_SITES else DEFAULT_BUDGET_SEC)
+
+def run_deadline():
+    """전체 실행 마감(epoch 초, 서버가 RUN_DEADLINE으로 넘겨줌). 없으면 None"""
+    return float(os.getenv("RUN_DEADLINE") or 0) or None
+
+# 🔹 실행 순서 계획
+# 브라우저(Selenium) 사이트와 HTTP 사이트를 따로 정한 동시 실행 수만큼 나눠 돌린다.
+# 각자 지난 실행 기록(crawl_state.duration_stats)의 p90이 긴 사이트부터 시작해서 (LPT)
+# 오래 걸리는 사이트가 마지막에 혼자 도는 일이 없게 한다. 예상 완료 시간은 이동 평균으로 계산한다.
+BROWSER_WORKERS = int(os.getenv("BROWSER_WORKERS", "2"))  # Chrome 하나가 수백 MB
+HTTP_WORKERS = int(os.getenv("HTTP_WORKERS", "4"))
+
+def lane_for(site):
+    return "browser" if site in BROWSER_SITES else "http"
+
+def lane_workers(lane):
+    return max(1, BROWSER_WORKERS if lane == "browser" else HTTP_WORKERS)
+
+# 동시 실행 수는 이 프로세스 안(스레드 풀)뿐 아니라 다른 run_all.py(예약·수동 사이트 갱신)까지 합쳐서 지킨다:
+# 사이트를 시작하기 전에 crawl_state의 lane 슬롯을 잡고, 다 차 있으면 빌 때까지(최대 SLOT_WAIT_SEC) 기다린다.
+SLOT_WAIT_SEC = int(os.getenv("SLOT_WAIT_SEC", "600"))
+SLOT_POLL_SEC = 2
+
+def wait_slot(lane, deadline=None):
+    """lane 슬롯 fd. 시간 안에 못 잡거나 중단되면 None"""
+    give_up = time.time() + SLOT_WAIT_SEC
+    if deadline is not None:
+        give_up = min(give_up, deadline - CANCEL_GRACE_SEC - MIN_SITE_SEC)
+    while True:
+        fd = crawl_state.acquire_slot(lane, lane_workers(lane))
+        if fd is not None or STOP.is_set() or time.time() >= give_up:
+            return fd
+        time.sleep(SLOT_POLL_SEC)
+
+def expected_duration(site):
+    """(이동 평균, p90) 초. 기록이 없으면 둘 다 예산의 1/4로 가정"""
+    stats = crawl_state.duration_stats(site)
+    guess = budget_for(site) / 4
+    return stats["ewma"] or guess, stats["p90"] or stats["ewma"] or guess
+
+def plan(jobs):
+    """{lane: [(job, 예상 초), ...]} p90이 긴 순서 (같은 lane 안에서 이 순서대로 시작)"""
+    lanes = {}
+    for job in jobs:
+        ewma, p90 = expected_duration(site_id(job[2]))
+        lanes.setdefault(lane_for(site_id(job[2])), []).append((job, ewma, p90))
+    return {
+        lane: [(job, ewma) for job, ewma, _ in sorted(items, key=lambda x: x[2], reverse=True)]
+        for lane, items in lanes.items()
+    }
+
+def predict_makespan(lanes):
+    """계획대로 돌렸을 때 예상 전체 소요 시간(초): lane마다 빈 워커에 순서대로 넣어 본다"""
+    makespan = 0.0
+    for lane, items in lanes.items():
+        workers = [0.0] * lane_workers(lane)
+        for _, expected in items:
+            heapq.heappush(workers, heapq.heappop(workers) + expected)
+        makespan = max(makespan, max(workers))
+    return makespan
+
+def run_pool(jobs, publisher=None):
+    """lane별 스레드 풀에서 계획 순서대로 실행 → {site: run_one 결과}
+    publisher가 있으면 사이트가 끝날 때마다 결과 파일을 넘겨 바로 정규화·게시한다"""
+    lanes = plan(jobs)
+    results = {}
+    pools = []
+    for lane, items in lanes.items():
+        pool = ThreadPoolExecutor(max_workers=lane_workers(lane), thread_name_prefix=f"crawl-{lane}")
+        for job, _ in items:
+            results[site_id(job[2])] = pool.submit(crawl_site, job, publisher)
+        pools.append(pool)
+    for pool in pools:
+        pool.shutdown(wait=True)
+    return {site: future.result() for site, future in results.items()}
+
+def crawl_site(job, publisher=None):
+    name, script, output = job
+    ok = run_one(name, script, output)
+    out_target = os.path.join(OUT_DIR, output)
+    # 실패·차단된 사이트도 넘긴다 → 정규화가 마지막 정상 스냅샷을 stale로 표시해서 이어 간다
+    # (다른 곳에서 실행 중이거나 마감으로 건너뛴 사이트는 그쪽/다음 실행이 게시)
+    if publisher is not None and os.path.exists(out_target) and (
+            ok is not None or crawl_state.breaker_state(site_id(output)) == "open"):
+        publisher.put(out_target)
+    return ok
+
+# 🔹 사이트별 정규화·게시 파이프라인
+# 사이트 크롤링이 끝나는 대로 큐에 넣고, 게시 스레드가 그때까지 쌓인 사이트를 모아 정규화 → 새 버전으로 게시한다.
+# 전체가 끝날 때까지 기다리지 않으므로 먼저 끝난 병원의 공고부터 바로 보이고, 정규화가 크롤링과 겹쳐서 돈다.
+# PIPELINE_PUBLISH=0 이면 예전처럼 json/ 에만 쓰고 정규화는 따로 (python normalize_jobs.py ./json).
+PIPELINE_PUBLISH = os.getenv("PIPELINE_PUBLISH", "1") == "1"
+
+class Publisher:
+    """결과 파일 큐 → 게시 스레드 하나가 순서대로 정규화·게시"""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.published = []  # 게시한 사이트 id
+        self._thread = threading.Thread(target=self._run, name="publisher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def put(self, path):
+        self.queue.put(path)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            # 게시하는 동안 끝난 사이트는 다음 버전 하나로 모은다
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            files = sorted({path for path in batch if path is not None})
+            if files:
+                self._publish(files)
+            if None in batch:
+                return
+
+    def _publish(self, files):
+        sites = [site_id(os.path.basename(path)) for path in files]
+        try:
+            sources = normalize_jobs.publish_files(files)
+        except Exception as e:
+            print(f"❌ 게시 실패 ({', '.join(sites)}): {e}")
+            return
+        self.published.extend(sites)
+        crawl_hooks.emit("published", sites=sites, version=publish.current_version(),
+                         stale=[site for site, src in sources.items() if src.get("stale")])
+
+    def close(self):
+        """남은 파일까지 게시하고 끝낸다"""
+        self.queue.put(None)
+        self._thread.join()
+
+# 🔹 이전 결과 파일
+# 실행 전에 json/<site>.json 을 옮겨 둔다 → 스크립트가 아무것도 쓰지 않으면(0건이면 안 쓰는 스크래퍼, 셀렉터 고장)
+# 결과 파일이 없어서 실패로 잡힌다. 예전 파일이 새 결과처럼 게시되지 않는다.
+# 옮겨 둔 파일은 증분 수집(crawl_hooks.Seen)이 CRAWL_PREVIOUS로 읽고, 실패하면 다시 돌려놓아서
+# 정규화가 실패로 보고 마지막 정상 스냅샷을 stale로 이어 간다.
+PREVIOUS_DIR = os.path.join(crawl_state.STATE_DIR, "previous")
+
+def previous_output_path(site):
+    return os.path.join(PREVIOUS_DIR, f"{site}.json")
+
+def set_aside_output(site, out_target):
+    """이전 결과를 state/previous/<site>.json 으로 (결과가 없으면 전에 옮겨 둔 것을 그대로 둔다)"""
+    safe_move(out_target, previous_output_path(site))
+
+def restore_output(site, out_target):
+    """이번 실행이 결과를 남기지 못했으면 옮겨 둔 이전 결과를 되돌려 놓는다 (복사: 다음 실행도 다시 옮긴다)"""
+    prev = previous_output_path(site)
+    if not os.path.exists(out_target) and os.path.exists(prev):
+        shutil.copy2(prev, out_target)
+
+# 🔹 이어 하기 (체크포인트)
+# 전체 실행은 crawl_state의 "run" 상태에 실행 id/시작/끝 시각을, 끝난 사이트는 site:<id>의 done_run에 남긴다.
+# 컨테이너 재시작이나 타임아웃으로 끝(finished_at)을 못 남긴 실행은 --resume 으로 이어 한다:
+# 끝난 사이트는 건너뛰고, 끊긴 사이트는 스크립트가 남긴 페이지 체크포인트(crawl_hooks.checkpoint)부터.
+# RESUME_MAX_AGE_SEC보다 오래된 실행/체크포인트는 이어 하지 않고 처음부터 한다.
+RESUME_MAX_AGE_SEC = int(os.getenv("RESUME_MAX_AGE_SEC", "3600"))
+CHECKPOINT_DIR = os.path.join(crawl_state.STATE_DIR, "checkpoints")
+SEEN_DIR = os.path.join(crawl_state.STATE_DIR, "seen")
+RUN = {"id": None, "resume": False, "interrupted": False}  # 이번 실행 (run_one이 참고)
+
+def checkpoint_path(site):
+    return os.path.join(CHECKPOINT_DIR, f"{site}.ndjson")
+
+def resumable_run(now=None):
+    """이어 할 수 있는 이전 전체 실행 상태 (끝났거나 오래됐으면 None)"""
+    run = crawl_state.get_status("run")
+    if not run.get("run_id") or run.get("finished_at"):
+        return None
+    if (now or time.time()) - (run.get("started_at") or 0) > RESUME_MAX_AGE_SEC:
+        return None
+    return run
+
+def begin_run(run_id, resume):
+    """전체 실행 시작 기록 → (실행 id, 이전 실행에서 이미 끝난 사이트 집합)"""
+    prev = resumable_run() if resume else None
+    if prev:
+        done = {site for site, st in crawl_state.site_statuses().items() if st.get("done_run") == prev["run_id"]}
+        return prev["run_id"], done
+    crawl_state.update_status("run", run_id=run_id, started_at=time.time(), finished_at=None)
+    return run_id, set()
+
+def finish_run():
+    # 마감으로 못 돌린 사이트가 있으면 끝을 남기지 않는다 → 다음 --resume 이 그 사이트부터
+    if RUN["id"] and not RUN["interrupted"]:
+        crawl_state.update_status("run", finished_at=time.time())
+
+# 지금 돌고 있는 크롤러 pid (run_all.py가 SIGTERM을 받으면 같이 정리)
+RUNNING = set()
+STOP = threading.Event()  # SIGTERM 이후에는 대기 중인 사이트를 시작하지 않는다
+
+def _on_sigterm(signum, frame):
+    STOP.set()
+    for pid in list(RUNNING):
+        kill_tree(pid)
+    sys.exit(128 + signum)
+
+def kill_tree(pid):
+    """프로세스 그룹과 (미리 모은) 자손 전부 SIGKILL. 그룹을 벗어난 자손(Chrome 등)까지 정리"""
+    for target in profiling.tree_pids(pid) + [pid]:
+        try:
+            os.kill(target, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
 def safe_move(src_path, dst_path):
+    """src → dst 교체. 목적지를 먼저 지우지 않고 os.replace로 한 번에 바꾼다 (파일이 잠깐 없어지는 틈이 없게)"""
     if os.path.exists(src_path):
         os.makedirs(os.path.dirname(dst_path), exist_ok=True)
-        if os.path.exists(dst_path):
-            os.remove(dst_path)
-        shutil.move(src_path, dst_path)
+        try:
+            os.replace(src_path, dst_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # 다른 파일시스템: 옆에 복사해 두고 교체
+            tmp_path = dst_path + ".tmp"
+            shutil.copy2(src_path, tmp_path)
+            os.replace(tmp_path, dst_path)
+            os.remove(src_path)
+
+def count_items(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return len(data) if isinstance(data, list) else None
+    except Exception:
+        return None
+
+def record_page_metrics(site, ev):
+    """page 이벤트 → 페이지 수/요청 지연/바이트 메트릭 (fetch_sec, bytes는 보내는 스크립트만)"""
+    metrics.inc("crawl_pages_total", site=site)
+    if ev.get("fetch_sec") is not None:
+        metrics.observe("crawl_page_fetch_seconds", ev["fetch_sec"], site=site)
+    if ev.get("bytes") is not None:
+        metrics.inc("crawl_bytes_downloaded_total", ev["bytes"], site=site)
+
+# 사이트별 리소스 사용량 (실행이 끝나면 리포트로 저장)
+SITE_REPORTS = {}
+
+def record_site_metrics(site, duration, result, items=None, reason=None):
+    metrics.observe("crawl_site_duration_seconds", duration, site=site, result=result)
+    if items:
+        metrics.inc("crawl_items_parsed_total", items, site=site)
+    if reason:
+        metrics.inc("crawl_failures_total", site=site, reason=reason)
+
+def record_usage_metrics(site, usage):
+    if usage.get("peak_rss") is not None:
+        metrics.observe("crawl_site_peak_rss_bytes", usage["peak_rss"], site=site)
+    metrics.inc("crawl_site_cpu_seconds_total", usage["cpu_sec"], site=site)
 
 def run_one(name, script, final_filename):
+    """사이트 하나 크롤링. 성공 True, 실패 False, 다른 곳에서 실행 중이라 건너뛰면 None"""
+    if STOP.is_set():
+        return None
     print(f"\n=== [{name}] 실행 ===")
 
+    site = site_id(final_filename)
+    # 사이트별 락: 같은 사이트를 두 곳(전체 실행 / /api/update/<site>)에서 동시에 돌리지 않는다.
+    # 서버가 이미 락을 잡고 넘겨준 경우(HELD_SITE_LOCK)는 다시 잡지 않는다.
+    lock_fd = None
+    if os.getenv("HELD_SITE_LOCK") != site:
+        lock_fd = crawl_state.acquire_lock(f"site:{site}")
+        if lock_fd is None:
+            print(f"⏭️ [{name}] 다른 곳에서 실행 중 → 건너뜀")
+            crawl_hooks.emit("site_skipped", site=site, name=name)
+            return None
+
+    # 회로 차단기: 계속 실패하는 사이트는 예산을 쓰지 않고 바로 건너뛴다 (마지막 정상 스냅샷이 stale로 이어짐).
+    # 관리자가 사이트를 직접 갱신하면 서버가 BREAKER_BYPASS로 넘겨서 열려 있어도 시도한다.
+    breaker = crawl_state.breaker(site)
+    if breaker["state"] == "open" and os.getenv("BREAKER_BYPASS") != site:
+        retry_at = datetime.fromtimestamp(breaker["retry_at"]).strftime("%m-%d %H:%M")
+        print(f"🚫 [{name}] 연속 {breaker['failures']}회 실패로 차단 중 → 건너뜀 (다음 시도 {retry_at})")
+        crawl_state.release_lock(lock_fd)
+        metrics.inc("crawl_breaker_skips_total", site=site)
+        crawl_hooks.emit("site_skipped", site=site, name=name, reason="breaker", retry_at=breaker["retry_at"])
+        return None
+    if breaker["state"] != "closed":
+        print(f"🔌 [{name}] 차단 중인 사이트 → 한 번 시도")
+
+    # 전체 실행 마감이 있으면 남은 시간 안에서만 (부족하면 시작하지 않는다 → 끝난 사이트라도 게시되게)
+    budget = budget_for(site)
+    deadline = run_deadline()
+    if deadline is not None:
+        left = deadline - time.time() - CANCEL_GRACE_SEC
+        if left < MIN_SITE_SEC:
+            print(f"⏭️ [{name}] 실행 마감까지 시간이 부족함 → 건너뜀")
+            RUN["interrupted"] = True
+            crawl_state.release_lock(lock_fd)
+            crawl_hooks.emit("site_skipped", site=site, name=name, reason="deadline")
+            return None
+        budget = min(budget, int(left))
+
+    slot_fd = wait_slot(lane_for(site), deadline)
+    if slot_fd is None:
+        print(f"⏭️ [{name}] {lane_for(site)} 동시 실행 한도가 차서 시작하지 못함 → 건너뜀")
+        crawl_state.release_lock(lock_fd)
+        crawl_hooks.emit("site_skipped", site=site, name=name, reason="slots")
+        return None
+    if deadline is not None:
+        budget = min(budget, max(MIN_SITE_SEC, int(deadline - time.time() - CANCEL_GRACE_SEC)))  # 기다린 만큼 줄인다
+
+    started = time.time()
+    usage = {}
+    # 시작/끝을 남겨 두면 정규화(normalize_jobs.py)가 실패·중단된 사이트를 알고 이전 스냅샷을 유지한다
+    crawl_state.update_status(f"site:{site}", crawl_started_at=started)
+    try:
+        held = tuple(fd for fd in (lock_fd, slot_fd, inherited_lock_fd()) if fd is not None)
+        ok, error = _run_script(name, script, final_filename, site, usage, budget, held)
+        if not ok:
+            restore_output(site, os.path.join(OUT_DIR, final_filename))
+    finally:
+        crawl_state.release_lock(slot_fd)
+        crawl_state.release_lock(lock_fd)
+    duration = round(time.time() - started, 2)
+    tracing.record("site", started, duration, lane=site, cat="crawl",
+                   hospital=name, result="ok" if ok else "failed")
+    expected, _ = expected_duration(site)
+    crawl_state.record_duration(site, duration)
+    SITE_REPORTS[site] = {"name": name, "result": "ok" if ok else "failed", "error": error,
+                          "duration": duration, "expected": round(expected, 2), **usage}
+
+    finished = dict(crawl_finished_at=time.time(), crawl_ok=bool(ok), usage=usage)
+    if ok:
+        # 다 끝났으니 페이지 체크포인트는 필요 없다. 전체 실행 중이면 이어 하기에서 건너뛰도록 표시
+        if os.path.exists(checkpoint_path(site)):
+            os.remove(checkpoint_path(site))
+        if RUN["id"]:
+            finished["done_run"] = RUN["id"]
+        crawl_state.update_status(f"site:{site}", last_update=datetime.now().isoformat(), error=None, **finished)
+    else:
+        crawl_state.update_status(f"site:{site}", error=error, **finished)
+
+    after = crawl_state.record_breaker(site, ok)
+    if after["state"] != breaker["state"]:
+        metrics.inc("crawl_breaker_transitions_total", site=site, state=after["state"])
+        if after["state"] == "closed":
+            print(f"🔌 [{name}] 성공 → 차단 해제")
+        else:
+            retry_at = datetime.fromtimestamp(after["retry_at"]).strftime("%m-%d %H:%M")
+            print(f"🚫 [{name}] 연속 {after['failures']}회 실패 → 차단 (다음 시도 {retry_at})")
+    return ok
+
+def inherited_lock_fd():
+    """서버가 pass_fds로 넘겨준 락 fd (CRAWL_LOCK_FD), 없으면 None"""
+    try:
+        fd = int(os.getenv("CRAWL_LOCK_FD", ""))
+        os.fstat(fd)
+    except (ValueError, OSError):
+        return None
+    return fd
+
+def _run_script(name, script, final_filename, site, usage, budget, lock_fds=()):
+    """크롤러 실행 (budget초 안에). usage에 리소스 사용량(최대 RSS, CPU, 페이지 크기, 파이썬 메모리)을 채운다.
+    lock_fds(사이트 락, 슬롯, 서버의 락)는 스크립트에도 넘긴다 → run_all.py가 먼저 죽어도 스크립트가 끝날 때까지 락이 유지된다"""
     src_script = os.path.join(SRC_DIR, script)
     out_target = os.path.join(OUT_DIR, final_filename)
 
     if not os.path.exists(src_script):
         print(f"❌ 스크립트 없음: {os.path.relpath(src_script, ROOT_DIR)}")
-        return
+        metrics.inc("crawl_failures_total", site=site, reason="missing_script")
+        crawl_hooks.emit("site_failed", site=site, name=name, error="스크립트 없음", duration=0)
+        return False, "스크립트 없음"
 
     env = os.environ.copy()
     env["OUTPUT"] = out_target
+    env["CRAWL_SITE"] = site  # 페이지 기록(RECORD_DIR) 폴더 이름
+    # 스크립트는 src에서 실행되므로 상대 경로는 절대 경로로
+    if env.get("RECORD_DIR"):
+        env["RECORD_DIR"] = os.path.abspath(env["RECORD_DIR"])
+    if env.get("SITE_BASE_OVERRIDE", "").endswith(".json"):
+        env["SITE_BASE_OVERRIDE"] = os.path.abspath(env["SITE_BASE_OVERRIDE"])
     env.setdefault("HEADLESS", "1")
     env.setdefault("LOG_LEVEL", "INFO")
+    # 자식은 항상 진행 이벤트를 내보내고, 출력은 버퍼링 없이 바로 흘려보낸다.
+    env["CRAWL_EVENTS"] = "1"
+    env["PYTHONUNBUFFERED"] = "1"
+    # 페이지 체크포인트: 이어 하는 실행이고 최근 것만 넘기고, 아니면 지우고 처음부터
+    ckpt = checkpoint_path(site)
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    resume = RUN["resume"] and os.path.exists(ckpt) and time.time() - os.path.getmtime(ckpt) < RESUME_MAX_AGE_SEC
+    if not resume and os.path.exists(ckpt):
+        os.remove(ckpt)
+    env["CRAWL_CHECKPOINT"] = ckpt
+    env["CRAWL_RESUME"] = "1" if resume else "0"
+    # 이미 본 공고 id (증분 수집, crawl_hooks.Seen)
+    os.makedirs(SEEN_DIR, exist_ok=True)
+    env["CRAWL_SEEN"] = os.path.join(SEEN_DIR, f"{site}.json")
+    set_aside_output(site, out_target)
+    env["CRAWL_PREVIOUS"] = previous_output_path(site)
+
+    crawl_hooks.emit("site_started", site=site, name=name, budget=budget)
+    started = time.time()
+    env["CRAWL_DEADLINE"] = str(started + budget)
 
-    # src 폴더를 작업 디렉터리(cwd)로 고정
-    result = subprocess.run(
+    # src 폴더를 작업 디렉터리(cwd)로 고정, stderr(logging)도 같은 스트림으로 합쳐 순서대로 읽는다
+    # 새 세션(프로세스 그룹)으로 띄워서 chromedriver/Chrome까지 한 번에 정리할 수 있게 한다
+    proc = subprocess.Popen(
         ["python", src_script],
         cwd=SRC_DIR,
         env=env,
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
         text=True,
-        shell=False
+        bufsize=1,
+        shell=False,
+        start_new_session=True,
+        pass_fds=lock_fds
     )
+    RUNNING.add(proc.pid)
+    if STOP.is_set():
+        kill_tree(proc.pid)
+    sampler = profiling.TreeSampler(proc.pid).start()
+    cancelled = {}
+
+    def cancel():
+        # 협조적 취소: 스크립트만 SIGTERM → finally에서 브라우저를 닫을 시간을 준다
+        # (poll()은 프로세스를 회수해 버리므로 reap()이 남긴 returncode로만 확인)
+        if proc.returncode is not None:
+            return
+        cancelled["at"] = time.time()
+        print(f"⏱️ [{name}] 시간 예산 {budget}초 초과 → 취소")
+        try:
+            os.kill(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def force_kill():
+        cancelled["killed"] = True
+        print(f"🔪 [{name}] {CANCEL_GRACE_SEC}초 안에 안 끝남 → 강제 종료")
+        kill_tree(proc.pid)
+
+    def reap():
+        # wait4로 회수해서 이 스크립트(와 회수된 자손)만의 CPU 시간을 잰다 (여러 사이트가 동시에 돌아도 섞이지 않게)
+        _, status, ru = os.wait4(proc.pid, 0)
+        usage["cpu_sec"] = round(ru.ru_utime + ru.ru_stime, 2)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        # 스크립트가 끝나면 그룹에 남은 프로세스(quit 못 한 Chrome 등)를 정리한다.
+        # 남은 자손이 stdout을 쥐고 있으면 아래 읽기 루프가 끝나지 않으므로 기다리지 않고 바로.
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
 
-    if result.stdout:
-        print(result.stdout.strip())
-    if result.stderr:
-        print(result.stderr.strip())
+    cancel_timer = threading.Timer(budget, cancel)
+    kill_timer = threading.Timer(budget + CANCEL_GRACE_SEC, force_kill)
+    reaper = threading.Thread(target=reap)
+    for thread in (cancel_timer, kill_timer, reaper):
+        thread.daemon = True
+        thread.start()
+    usage.update(pages=0, bytes_total=0, max_page_bytes=0)
+    last_line = ""
+    page_mark = started  # 직전 페이지가 끝난 시각 → 다음 page 구간의 시작
+    for line in proc.stdout:
+        line = line.rstrip("\n")
+        ev = crawl_hooks.parse_event(line)
+        if ev is not None:
+            # 스크립트가 보낸 이벤트(page 등)에 사이트 id를 붙여 전달
+            event = ev.pop("event", "progress")
+            ts = ev.pop("ts", None) or time.time()
+            if event == "span":
+                # 구간 이벤트는 트레이스에만 기록 (진행 이벤트로는 내보내지 않는다)
+                tracing.record(ev.pop("span"), ev.pop("start"), ev.pop("dur"), lane=site, cat="crawler", **ev)
+                continue
+            if event == "incremental_stop":
+                print(f"⏹️ [{name}] 이미 본 공고 {ev.get('seen_run')}건 연속 → 나머지 페이지는 이전 결과로")
+            if event == "resumed":
+                print(f"⏩ [{name}] 체크포인트에서 이어 함: {ev.get('page')}페이지까지 {ev.get('items')}건")
+            if event == "memory":
+                usage["python_peak"] = ev.get("python_peak")
+                usage["top_allocs"] = ev.get("top")
+                continue
+            if event == "page":
+                record_page_metrics(site, ev)
+                usage["pages"] += 1
+                usage["bytes_total"] += ev.get("bytes") or 0
+                usage["max_page_bytes"] = max(usage["max_page_bytes"], ev.get("bytes") or 0)
+                tracing.record("page", page_mark, max(0, ts - page_mark), lane=site, cat="crawler",
+                               page=ev.get("page"), items=ev.get("items"))
+                page_mark = ts
+            crawl_hooks.emit(event, site=site, **ev)
+            continue
+        if line.strip():
+            print(f"[{site}] {line}")  # 여러 사이트가 동시에 돌므로 사이트 id를 붙인다
+            last_line = line.strip()
+    reaper.join()
+    proc.stdout.close()
+    returncode = proc.returncode
+    RUNNING.discard(proc.pid)
+    cancel_timer.cancel()
+    kill_timer.cancel()
+    duration = round(time.time() - started, 2)
+    usage["peak_rss"] = sampler.stop()
+    record_usage_metrics(site, usage)
 
-    if result.returncode != 0:
-        print(f"❌ [{name}] 실패 (returncode={result.returncode})")
-        return
+    if cancelled:
+        error = f"시간 예산 {budget}초 초과" + (" (강제 종료)" if cancelled.get("killed") else "")
+        print(f"❌ [{name}] {error}")
+        record_site_metrics(site, duration, "failed", reason="budget")
+        crawl_hooks.emit("site_failed", site=site, name=name, duration=duration, error=error)
+        return False, error
 
-    # 기대 경로에 생성됐으면 OK
+    if returncode != 0:
+        print(f"❌ [{name}] 실패 (returncode={returncode})")
+        error = f"returncode={returncode}: {last_line[:200]}"
+        record_site_metrics(site, duration, "failed", reason="exit_code")
+        crawl_hooks.emit("site_failed", site=site, name=name, duration=duration, error=error)
+        return False, error
+
+    # 기대 경로에 생성됐으면 OK (이전 결과는 시작 전에 옮겨 뒀으므로 있으면 이번 실행이 쓴 것)
     if os.path.exists(out_target):
         print(f"✅ [{name}] 완료 → {os.path.relpath(out_target, ROOT_DIR)}")
-        return
+        items = count_items(out_target)
+        record_site_metrics(site, duration, "ok", items=items)
+        crawl_hooks.emit("site_finished", site=site, name=name, duration=duration, items=items)
+        return True, None
 
     # 스크립트가 OUTPUT 무시했을 가능성 대비: src/나 루트에 기본 파일명이 생겼는지 확인 후 이동
     fallback_candidates = [
@@ -78,32 +604,108 @@ def run_one(name, script, final_filename):
         os.path.join(ROOT_DIR, final_filename),
     ]
     for cand in fallback_candidates:
-        if os.path.exists(cand):
+        if os.path.exists(cand) and os.path.getmtime(cand) >= started:  # 예전 실행이 남긴 파일은 안 된다
             safe_move(cand, out_target)
             print(f"🛈 [{name}] OUTPUT 미준수 → 강제 이동: {os.path.relpath(out_target, ROOT_DIR)}")
-            return
+            items = count_items(out_target)
+            record_site_metrics(site, duration, "ok", items=items)
+            crawl_hooks.emit("site_finished", site=site, name=name, duration=duration, items=items)
+            return True, None
 
     print(f"⚠️ [{name}] 실행 성공했는데 결과 파일을 못 찾음: 기대 경로 {os.path.relpath(out_target, ROOT_DIR)}")
+    record_site_metrics(site, duration, "failed", reason="no_output")
+    crawl_hooks.emit("site_failed", site=site, name=name, duration=duration, error="결과 파일 없음")
+    return False, "결과 파일 없음"
 
 def sweep_src_json_to_out():
-    """마지막 안전장치: src에 남아있는 모든 .json을 json/으로 이동(덮어쓰기)."""
-    moved = 0
+    """마지막 안전장치: src에 남아있는 모든 .json을 json/으로 이동(덮어쓰기). 옮긴 경로 목록 반환"""
+    moved = []
     for fname in os.listdir(SRC_DIR):
         if fname.lower().endswith(".json"):
             src_path = os.path.join(SRC_DIR, fname)
             dst_path = os.path.join(OUT_DIR, fname)
             safe_move(src_path, dst_path)
             print(f"🧹 stray json 이동: {os.path.relpath(dst_path, ROOT_DIR)}")
-            moved += 1
-    if moved == 0:
+            moved.append(dst_path)
+    if not moved:
         print("🧹 stray json 없음")
+    return moved
 
 if __name__ == "__main__":
-    print("🏥 병원별 크롤링 일괄 실행 시작")
-    for name, script, output in JOBS:
-        run_one(name, script, output)
+    # 사용법: python src/run_all.py            → 전체
+    #         python src/run_all.py amc kumc   → 지정한 사이트만 (실패가 있으면 종료코드 1)
+    #         RECORD_DIR=bench/fixtures python src/run_all.py → 받은 페이지를 fixture로 기록 (bench/replay.py)
+    #         SITE_BASE_OVERRIDE=state/fake_sites.json python src/run_all.py → 가짜 사이트 서버로 (bench/fake_sites.py)
+    #         BROWSER_WORKERS=1 HTTP_WORKERS=1 python src/run_all.py → 동시 실행 수 조절 (기본 브라우저 2, HTTP 4)
+    #         python src/run_all.py --resume → 중단된 실행 이어 하기 (끝난 사이트 건너뜀, 끊긴 사이트는 체크포인트부터)
+    #         CRAWL_TRACEMALLOC=1 python src/run_all.py → 파이썬 메모리 최대값·할당 위치까지 (tracemalloc, 느려짐)
+    targets = [a for a in sys.argv[1:] if a != "--resume"]
+    RUN["resume"] = "--resume" in sys.argv[1:]
+    signal.signal(signal.SIGTERM, _on_sigterm)
+    if targets:
+        unknown = [t for t in targets if job_for(t) is None]
+        if unknown:
+            print(f"❌ 알 수 없는 사이트: {', '.join(unknown)}")
+            sys.exit(2)
+        jobs = [job_for(t) for t in targets]
+        print(f"🏥 지정 사이트 크롤링 실행: {', '.join(targets)}")
+    else:
+        jobs = JOBS
+        print("🏥 병원별 크롤링 일괄 실행 시작")
+
+    # 게시(releases/, normalized/)는 프로젝트 루트 기준
+    os.chdir(ROOT_DIR)
+    publisher = Publisher().start() if PIPELINE_PUBLISH else None
+
+    trace_id = tracing.current_trace_id()
+    run_started = time.time()
+    resumed = []
+    if not targets:
+        RUN["id"], done = begin_run(trace_id, RUN["resume"])
+        resumed = [job for job in jobs if site_id(job[2]) in done]
+        if resumed:
+            jobs = [job for job in jobs if site_id(job[2]) not in done]
+            print(f"⏩ 이전 실행 이어 하기: {len(resumed)}개 사이트는 이미 끝남 → {len(jobs)}개만 실행")
+    predicted = round(predict_makespan(plan(jobs)), 1)
+    print(f"🗓️ 동시 실행: 브라우저 {lane_workers('browser')}, HTTP {lane_workers('http')} → 예상 {predicted}초")
+    crawl_hooks.emit("run_started", total=len(jobs), predicted=predicted,
+                     resumed=[site_id(job[2]) for job in resumed])
+    with tracing.span("crawl", sites=len(jobs), predicted=predicted):
+        results = list(run_pool(jobs, publisher).values())
 
-    # ✅ 마지막에 src에 남은 json 전부 json/로 이동
-    sweep_src_json_to_out()
+    # ✅ 마지막에 src에 남은 json 전부 json/로 이동 (전체 실행일 때만: 다른 사이트 실행과 겹치지 않게)
+    if not targets:
+        moved = sweep_src_json_to_out()
+        for path in moved if publisher else []:
+            publisher.put(path)
+    if publisher:
+        publisher.close()
+    finish_run()
+    actual = round(time.time() - run_started, 1)
 
+    crawl_hooks.emit("run_finished", duration=round(time.time() - run_started, 2), predicted=predicted)
     print("\n🎯 전체 완료 — 결과는 ./json 폴더 확인")
+    if publisher:
+        print(f"📦 사이트별 게시: {len(publisher.published)}개 (current → {publish.current_version()})")
+    print(f"🗓️ 전체 소요: 예상 {predicted}초 / 실제 {actual}초")
+
+    # 📊 사이트별 리소스 리포트 (관리자 페이지에서 /api/reports/latest 로 조회)
+    report_path = profiling.save_report(trace_id, SITE_REPORTS,
+                                        makespan={"predicted": predicted, "actual": actual})
+    print("\n📊 사이트별 리소스")
+    for site, r in SITE_REPORTS.items():
+        rss = f"{r['peak_rss'] / 1048576:.0f}MB" if r.get("peak_rss") else "-"
+        py = f"{r['python_peak'] / 1048576:.1f}MB" if r.get("python_peak") else "-"
+        print(f"  {site:<14} RSS {rss:>7}  CPU {r.get('cpu_sec', 0):>6.1f}s  파이썬 {py:>7}  페이지 {r.get('pages', 0)}")
+    print(f"📊 리포트: {os.path.relpath(report_path, ROOT_DIR)}")
+
+    # 🧭 구간별 소요 시간 요약 + 트레이스 파일 (chrome://tracing, ui.perfetto.dev)
+    trace_path = tracing.export(trace_id)
+    print("\n🧭 구간별 소요 시간")
+    for line in tracing.summary(tracing.load(trace_id)):
+        print(line)
+    print(f"🧭 트레이스: {os.path.relpath(trace_path, ROOT_DIR)}")
+
+    # 건너뛴 사이트(차단 중, 다른 곳에서 실행 중, 마감)는 실패로 치지 않는다
+    if targets and False in results:
+        sys.exit(1)
@@ -6,7 +6,9 @@ from urllib.parse import urlparse, urlunparse, parse_qs, urlencode, urljoin
 import requests
 from bs4 import BeautifulSoup
 
-BASE = "https://www.samsunghospital.com"
+import crawl_hooks
+
+BASE = crawl_hooks.site_url("https://www.samsunghospital.com")
 LIST_PATH = "/home/recruit/recruitInfo/recruitNotice.do"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 KST = timezone(timedelta(hours=9))
@@ -55,6 +57,68 @@ def parse_range(txt: str):
         edt = edt.replace(hour=23, minute=59)
     return sdt, edt
 
+# ---------- parse ----------
+def parse_list_page(html, today, end_past_skip=True):
+    """
+    리스트 페이지 HTML → (진행중 항목 목록, hard_stop)
+    - 테이블/행이 없으면 None (더 볼 페이지 없음)
+    - hard_stop: 진행중이 아닌 항목을 만남 → 다음 페이지는 볼 필요 없음
+    """
+    soup = BeautifulSoup(html, crawl_hooks.HTML_PARSER)
+
+    table = soup.select_one("#contents > table")
+    if not table:
+        log.warning("리스트 테이블을 못 찾음.")
+        return None
+
+    tbody = table.find("tbody")
+    rows = tbody.find_all("tr") if tbody else []
+    if not rows:
+        return None
+
+    items = []
+    hard_stop = False
+    for tr in rows:
+        tds = tr.find_all("td")
+        if len(tds) < 7:
+            continue
+
+        # 상태(td:nth-child(7))
+        status_text = tds[6].get_text(strip=True)
+
+        # 진행중만 수집, 진행중이 아니면 하드 스톱
+        if "진행중" not in status_text:
+            hard_stop = True
+            break
+
+        # 제목/링크
+        a = tr.select_one("td.text-left > a")
+        title = a.get_text(strip=True) if a else tds[2].get_text(strip=True)
+        detail_url = urljoin(BASE, a.get("href", "")) if a and a.has_attr("href") else None
+
+        # 접수기간(td:nth-child(5))
+        period_text = tds[4].get_text("\n", strip=True)
+        sdt, edt = parse_range(period_text)
+
+        # 마감일(td.deadline-today) - 값만 저장(필터엔 안 씀)
+        deadline_el = tr.select_one("td.deadline-today")
+        deadline_text = deadline_el.get_text(strip=True) if deadline_el else None
+
+        # 이미 지난 공고는 안전하게 스킵(옵션)
+        if end_past_skip and edt and edt.date() < today:
+            continue
+
+        items.append({
+            "title": title,
+            "period_text": period_text,
+            "start_dt": sdt.isoformat(timespec="seconds") if sdt else None,
+            "end_dt":   edt.isoformat(timespec="seconds") if edt else None,
+            "deadline_text": deadline_text,   # 예: 'D-6', '오늘마감' 등
+            "status": status_text,            # '진행중'
+            "detail_url": detail_url
+        })
+    return items, hard_stop
+
 # ---------- core ----------
 def crawl_samsung(output="samsung.json", start_page=1, max_pages=50, end_past_skip=True):
     """
@@ -73,69 +137,29 @@ def crawl_samsung(output="samsung.json", start_page=1, max_pages=50, end_past_sk
 
     results = []
     today = datetime.now(KST).date()
-    hard_stop = False
+    seen = crawl_hooks.Seen()  # detail_url 기준
 
     for page in range(start_page, start_page + max_pages):
         url = set_cpage(base_list_url, page)
         log.info("GET %s", url)
-        r = sess.get(url, timeout=15)
+        with crawl_hooks.span("fetch", page=page):
+            r = sess.get(url, timeout=15)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-
-        table = soup.select_one("#contents > table")
-        if not table:
-            log.warning("리스트 테이블을 못 찾음(page=%s). 중단.", page)
-            break
+        crawl_hooks.record(r.text, page=page, url=url)
 
-        tbody = table.find("tbody")
-        rows = tbody.find_all("tr") if tbody else []
-        if not rows:
-            log.info("더 이상 항목 없음(page=%s). 종료.", page)
+        with crawl_hooks.span("parse", page=page):
+            parsed = parse_list_page(r.text, today, end_past_skip)
+        if parsed is None:
+            log.info("리스트 없음(page=%s). 종료.", page)
             break
-
-        add_count = 0
-        for tr in rows:
-            tds = tr.find_all("td")
-            if len(tds) < 7:
-                continue
-
-            # 상태(td:nth-child(7))
-            status_text = tds[6].get_text(strip=True)
-
-            # 진행중만 수집, 진행중이 아니면 하드 스톱
-            if "진행중" not in status_text:
-                hard_stop = True
-                break
-
-            # 제목/링크
-            a = tr.select_one("td.text-left > a")
-            title = a.get_text(strip=True) if a else tds[2].get_text(strip=True)
-            detail_url = urljoin(BASE, a.get("href", "")) if a and a.has_attr("href") else None
-
-            # 접수기간(td:nth-child(5))
-            period_text = tds[4].get_text("\n", strip=True)
-            sdt, edt = parse_range(period_text)
-
-            # 마감일(td.deadline-today) - 값만 저장(필터엔 안 씀)
-            deadline_el = tr.select_one("td.deadline-today")
-            deadline_text = deadline_el.get_text(strip=True) if deadline_el else None
-
-            # 이미 지난 공고는 안전하게 스킵(옵션)
-            if end_past_skip and edt and edt.date() < today:
-                continue
-
-            results.append({
-                "title": title,
-                "period_text": period_text,
-                "start_dt": sdt.isoformat(timespec="seconds") if sdt else None,
-                "end_dt":   edt.isoformat(timespec="seconds") if edt else None,
-                "deadline_text": deadline_text,   # 예: 'D-6', '오늘마감' 등
-                "status": status_text,            # '진행중'
-                "detail_url": detail_url
-            })
-            add_count += 1
+        page_items, hard_stop = parsed
+        results.extend(page_items)
+        add_count = len(page_items)
+        seen_stop = seen.observe(page_items)
 
         log.info("page %d: %d건 수집 (누적 %d)", page, add_count, len(results))
+        crawl_hooks.emit("page", page=page, items=add_count,
+                         fetch_sec=round(r.elapsed.total_seconds(), 3), bytes=len(r.content))
 
         if hard_stop:
             log.info("진행중이 아닌 항목 발견 → 즉시 중단.")
@@ -143,7 +167,11 @@ def crawl_samsung(output="samsung.json", start_page=1, max_pages=50, end_past_sk
         if add_count == 0:
             log.info("page %d에서 신규 수집 0건 → 종료.", page)
             break
+        if seen_stop:
+            log.info("이미 본 공고 %d건 연속 → 중단하고 이전 결과와 합침.", seen.run)
+            break
 
+    results = seen.finish(results, output)
     with open(output, "w", encoding="utf-8") as f:
         json.dump(results, f, ensure_ascii=False, indent=2)
     log.info("저장 완료: %s (총 %d건)", output, len(results))
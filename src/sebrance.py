@@ -1,5 +1,5 @@
 # pip install selenium beautifulsoup4
-import json, os, time, logging, re
+import json, os, logging, re
 from datetime import datetime, timezone, timedelta
 from urllib.parse import urljoin
 
@@ -10,7 +10,9 @@ from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-BASE = "https://yuhs.recruiter.co.kr"
+import crawl_hooks
+
+BASE = crawl_hooks.site_url("https://yuhs.recruiter.co.kr")
 LIST_URL = BASE + "/app/jobnotice/list"
 KST = timezone(timedelta(hours=9))
 
@@ -85,7 +87,8 @@ def get_driver(headless=True):
     opts.add_argument("--no-sandbox")
     opts.add_argument("--window-size=1400,1200")
     # Selenium 4.6+ 는 크롬 자동 관리 지원(별도 드라이버 없이 동작)
-    driver = webdriver.Chrome(options=opts)
+    with crawl_hooks.span("driver_start"):
+        driver = webdriver.Chrome(options=opts)
     return driver
 
 def set_page_size_100(driver):
@@ -99,7 +102,7 @@ def set_page_size_100(driver):
         WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, "#divJobnoticeList > ul > li"))
         )
-        time.sleep(0.5)  # 잔여 렌더링 여유
+        crawl_hooks.sleep(0.5)  # 잔여 렌더링 여유
         log.info("페이지 사이즈를 100으로 설정 완료.")
         return True
     except TimeoutException:
@@ -107,7 +110,7 @@ def set_page_size_100(driver):
         return False
 
 def extract_from_dom(html):
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, crawl_hooks.HTML_PARSER)
     ul = soup.select_one("#divJobnoticeList > ul")
     if not ul:
         return [], False
@@ -167,9 +170,12 @@ def paginate_and_collect(driver, max_pages=5):
             break
 
         html = driver.page_source
-        items, stop = extract_from_dom(html)
+        crawl_hooks.record(html, page=p + 1, url=driver.current_url)
+        with crawl_hooks.span("parse", page=p + 1):
+            items, stop = extract_from_dom(html)
         all_items.extend(items)
         log.info("현재 페이지에서 %d건 수집 (누적 %d)", len(items), len(all_items))
+        crawl_hooks.emit("page", page=p + 1, items=len(items), bytes=len(html.encode("utf-8")))
         if stop:
             log.info("비접수 항목 발견 → 즉시 중단.")
             break
@@ -187,14 +193,15 @@ def paginate_and_collect(driver, max_pages=5):
             break
 
         driver.execute_script("arguments[0].click();", next_btn)
-        time.sleep(0.7)  # 페이지 전환 대기(사이트에 맞춰 필요시 조절)
+        crawl_hooks.sleep(0.7)  # 페이지 전환 대기(사이트에 맞춰 필요시 조절)
 
     return all_items
 
 def crawl_yuhs(output="yuhs.json", headless=True, max_pages=3):
     driver = get_driver(headless=headless)
     try:
-        driver.get(LIST_URL)
+        with crawl_hooks.span("page_load"):
+            driver.get(LIST_URL)
         # 페이지 사이즈 100 적용
         set_page_size_100(driver)
         results = paginate_and_collect(driver, max_pages=max_pages)
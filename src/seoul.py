@@ -5,7 +5,9 @@ from datetime import datetime, timezone, timedelta
 import requests
 from bs4 import BeautifulSoup
 
-BASE = "https://www.snuh.org"
+import crawl_hooks
+
+BASE = crawl_hooks.site_url("https://www.snuh.org")
 LIST_PATH = "/about/news/recruit/recruList.do"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 KST = timezone(timedelta(hours=9))
@@ -50,6 +52,52 @@ def parse_range(txt: str):
         edt = edt.replace(hour=23, minute=59)
     return sdt, edt
 
+def parse_list_page(html, today):
+    """리스트 페이지 HTML → 모집중 항목 목록 ('마감', 지난 공고 제외). 테이블/행이 없으면 None"""
+    soup = BeautifulSoup(html, crawl_hooks.HTML_PARSER)
+
+    table = soup.select_one("#content > div.boardTypeTbl > table")
+    if not table:
+        log.warning("리스트 테이블을 못 찾음.")
+        return None
+
+    tbody = table.find("tbody")
+    rows = tbody.find_all("tr") if tbody else []
+    if not rows:
+        return None
+
+    items = []
+    for tr in rows:
+        tds = tr.find_all("td")
+        if len(tds) < 5:
+            continue
+
+        a = tr.select_one("td.alignL > a")
+        title = a.get_text(strip=True) if a else tds[1].get_text(strip=True)
+        detail_url = urljoin(BASE, a.get("href", "")) if a and a.has_attr("href") else None
+
+        period_text = tds[2].get_text(" ", strip=True)
+        sdt, edt = parse_range(period_text)
+
+        status_text = tds[4].get_text(strip=True)
+
+        # 1) 상태가 '마감'이면 스킵
+        if "마감" in status_text:
+            continue
+        # 2) end_dt가 오늘보다 이전이면 스킵
+        if edt and edt.date() < today:
+            continue
+
+        items.append({
+            "title": title,
+            "period_text": period_text,
+            "start_dt": sdt.isoformat(timespec="seconds") if sdt else None,
+            "end_dt":   edt.isoformat(timespec="seconds") if edt else None,
+            "status": status_text,
+            "detail_url": detail_url
+        })
+    return items
+
 def crawl_snuh(output="snuh.json", start_page=1, max_pages=50):
     """
     - pageIndex로 페이지네이션
@@ -66,54 +114,22 @@ def crawl_snuh(output="snuh.json", start_page=1, max_pages=50):
     for page in range(start_page, start_page + max_pages):
         url = set_query(base_list_url, pageIndex=page, searchKey="", searchWord="")
         log.info("GET %s", url)
-        r = sess.get(url, timeout=15)
+        with crawl_hooks.span("fetch", page=page):
+            r = sess.get(url, timeout=15)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-
-        table = soup.select_one("#content > div.boardTypeTbl > table")
-        if not table:
-            log.warning("리스트 테이블을 못 찾음 (page=%s). 중단.", page)
-            break
+        crawl_hooks.record(r.text, page=page, url=url)
 
-        tbody = table.find("tbody")
-        rows = tbody.find_all("tr") if tbody else []
-        if not rows:
-            log.info("더 이상 항목 없음 (page=%s). 종료.", page)
+        with crawl_hooks.span("parse", page=page):
+            page_items = parse_list_page(r.text, today)
+        if page_items is None:
+            log.info("리스트 없음 (page=%s). 종료.", page)
             break
-
-        add_count = 0
-        for tr in rows:
-            tds = tr.find_all("td")
-            if len(tds) < 5:
-                continue
-
-            a = tr.select_one("td.alignL > a")
-            title = a.get_text(strip=True) if a else tds[1].get_text(strip=True)
-            detail_url = urljoin(BASE, a.get("href", "")) if a and a.has_attr("href") else None
-
-            period_text = tds[2].get_text(" ", strip=True)
-            sdt, edt = parse_range(period_text)
-
-            status_text = tds[4].get_text(strip=True)
-
-            # 1) 상태가 '마감'이면 스킵
-            if "마감" in status_text:
-                continue
-            # 2) end_dt가 오늘보다 이전이면 스킵
-            if edt and edt.date() < today:
-                continue
-
-            results.append({
-                "title": title,
-                "period_text": period_text,
-                "start_dt": sdt.isoformat(timespec="seconds") if sdt else None,
-                "end_dt":   edt.isoformat(timespec="seconds") if edt else None,
-                "status": status_text,
-                "detail_url": detail_url
-            })
-            add_count += 1
+        results.extend(page_items)
+        add_count = len(page_items)
 
         log.info("page %d: %d건 수집 (누적 %d)", page, add_count, len(results))
+        crawl_hooks.emit("page", page=page, items=add_count,
+                         fetch_sec=round(r.elapsed.total_seconds(), 3), bytes=len(r.content))
 
         # ✅ 0건이면 즉시 종료
         if add_count == 0:
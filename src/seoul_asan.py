@@ -1,3 +1,4 @@
+import os
 import re
 import json
 import time
@@ -8,7 +9,9 @@ from urllib.parse import urlencode
 import requests
 from bs4 import BeautifulSoup
 
-BASE_URL = "https://recruit.amc.seoul.kr/recruit/career/list.do"
+import crawl_hooks
+
+BASE_URL = crawl_hooks.site_url("https://recruit.amc.seoul.kr/recruit/career/list.do")
 DETAIL_URL_TMPL = "https://recruit.amc.seoul.kr/recruit/career/view.do?recuIdx={recu_idx}&announceSn={announce_sn}"
 
 DATE_RANGE_RE = re.compile(
@@ -34,13 +37,15 @@ def fetch_page_html(page_index: int) -> str:
         "searchKeyword": "",
     }
     url = f"{BASE_URL}?{urlencode(params)}"
-    r = requests.get(url, timeout=15)
+    with crawl_hooks.span("fetch", page=page_index):
+        r = requests.get(url, timeout=15)
     r.raise_for_status()
+    crawl_hooks.record(r.text, page=page_index, url=url)
     return r.text
 
 
 def parse_list_items(html: str, now_kst: datetime):
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, crawl_hooks.HTML_PARSER)
     lis = soup.select("ul.dayListBox > li")
     open_items = []
     total_items = 0
@@ -99,20 +104,27 @@ def parse_list_items(html: str, now_kst: datetime):
     return open_items, total_items
 
 
-def crawl_until_closed(max_pages: int = 100, delay_sec: float = 0.6):
+def crawl_until_closed(max_pages: int = 100, delay_sec: float = 0.6, previous_path=None):
     """
     pageIndex=1부터 시작해서 페이지마다 열린 공고만 수집.
     어떤 페이지에서든 '열린 공고가 0개'이면 더 이상 진행하지 않고 종료.
     - max_pages: 안전상한
     - delay_sec: 예의상 서버 부하 완화
+    - previous_path: 이전 결과 파일. 이미 본 공고가 연달아 나와 멈추면 나머지를 여기서 채운다
     """
     now = datetime.now(KST)
     all_results = []
     page = 1
+    seen = crawl_hooks.Seen(key=lambda it: crawl_hooks.posting_key(it, "recu_idx", "announce_sn"))
 
     while page <= max_pages:
+        fetch_started = time.perf_counter()
         html = fetch_page_html(page)
-        open_items, total_items = parse_list_items(html, now_kst=now)
+        fetch_sec = round(time.perf_counter() - fetch_started, 3)
+        with crawl_hooks.span("parse", page=page):
+            open_items, total_items = parse_list_items(html, now_kst=now)
+        crawl_hooks.emit("page", page=page, items=len(open_items),
+                         fetch_sec=fetch_sec, bytes=len(html.encode("utf-8")))
 
         # 페이지에 항목이 전혀 없으면 종료(리스트 끝)
         if total_items == 0:
@@ -123,21 +135,23 @@ def crawl_until_closed(max_pages: int = 100, delay_sec: float = 0.6):
             break
 
         all_results.extend(open_items)
+        if seen.observe(open_items):
+            break
 
         page += 1
         if delay_sec:
-            time.sleep(delay_sec)
+            crawl_hooks.sleep(delay_sec)
 
+    all_results = seen.finish(all_results, previous_path)
     # 종료일 가까운 순으로 정렬
     all_results.sort(key=lambda x: x["end_dt"])
     return all_results
 
 
 if __name__ == "__main__":
-    data = crawl_until_closed(max_pages=100, delay_sec=0.5)
+    # JSON 저장 (run_all.py가 OUTPUT으로 저장 경로를 넘겨준다)
+    filename = os.getenv("OUTPUT", "amc.json")
+    data = crawl_until_closed(max_pages=100, delay_sec=0.5, previous_path=filename)
 
-    # JSON 저장 (파일명에 날짜 포함)
-    today = datetime.now(KST).strftime("%Y-%m-%d")
-    filename = f"amc.json"
     with open(filename, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
@@ -6,7 +6,9 @@ from urllib.parse import urljoin
 import requests
 from bs4 import BeautifulSoup
 
-BASE = "https://seoul.eumc.ac.kr"
+import crawl_hooks
+
+BASE = crawl_hooks.site_url("https://seoul.eumc.ac.kr")
 LIST_PATH = "/intro/recrut/list.do"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 KST = timezone(timedelta(hours=9))
@@ -46,32 +48,16 @@ def parse_range(txt: str):
     return sdt, edt
 
 
-# ---------- core ----------
-def crawl_eumc(output="json/seoul_mokdong.json", end_past_skip=True):
-    """
-    서울의료원(이대서울병원) 채용공고 크롤링
-    - 목록: #content > div > ul.card-list > li
-    - 제목: div > strong
-    - 기간: div > div
-    - 링크: a[href]
-    """
-    sess = requests.Session()
-    sess.headers.update(HEADERS)
-
-    url = BASE + LIST_PATH
-    log.info("GET %s", url)
-    r = sess.get(url, timeout=15)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
+def parse_list_page(html, today, end_past_skip=True):
+    """리스트 HTML → 공고 목록 (end_past_skip이면 지난 공고 제외). 항목이 없으면 None"""
+    soup = BeautifulSoup(html, crawl_hooks.HTML_PARSER)
 
     cards = soup.select("#content > div > ul.card-list > li")
     if not cards:
         log.warning("공고 항목을 찾지 못했습니다.")
-        return []
+        return None
 
     results = []
-    today = datetime.now(KST).date()
-
     for li in cards:
         a = li.select_one("a")
         if not a:
@@ -98,6 +84,35 @@ def crawl_eumc(output="json/seoul_mokdong.json", end_past_skip=True):
             "detail_url": detail_url,
         })
 
+    return results
+
+# ---------- core ----------
+def crawl_eumc(output="json/seoul_mokdong.json", end_past_skip=True):
+    """
+    서울의료원(이대서울병원) 채용공고 크롤링
+    - 목록: #content > div > ul.card-list > li
+    - 제목: div > strong
+    - 기간: div > div
+    - 링크: a[href]
+    """
+    sess = requests.Session()
+    sess.headers.update(HEADERS)
+
+    url = BASE + LIST_PATH
+    log.info("GET %s", url)
+    with crawl_hooks.span("fetch"):
+        r = sess.get(url, timeout=15)
+    r.raise_for_status()
+    today = datetime.now(KST).date()
+    crawl_hooks.record(r.text, page=1, url=r.url)
+
+    with crawl_hooks.span("parse", page=1):
+        results = parse_list_page(r.text, today, end_past_skip)
+    if results is None:
+        return []
+
+    crawl_hooks.emit("page", page=1, items=len(results), fetch_sec=round(r.elapsed.total_seconds(), 3), bytes=len(r.content))
+
     # 🔥 출력 폴더 자동 생성
     os.makedirs(os.path.dirname(output), exist_ok=True)
 
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 # deps: pip install selenium webdriver-manager python-dateutil
-import json, re, time
+import os, json, re, time
 from urllib.parse import urljoin, urlparse
 from datetime import datetime, date, time as dtime
 from zoneinfo import ZoneInfo
@@ -13,8 +13,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-BASE_URL = "https://www.cmcseoul.or.kr"
-LIST_URL_TPL = "https://www.cmcseoul.or.kr/page/board/recruit?p={page}&s=12&q=%7B%7D"
+import crawl_hooks
+
+BASE_URL = crawl_hooks.site_url("https://www.cmcseoul.or.kr")
+LIST_URL_TPL = crawl_hooks.site_url("https://www.cmcseoul.or.kr/page/board/recruit?p={page}&s=12&q=%7B%7D")
 SEOUL = ZoneInfo("Asia/Seoul")
 
 # ---------------- 공통 유틸 ----------------
@@ -27,7 +29,8 @@ def get_driver(headless=True):
     opts.add_argument("--disable-dev-shm-usage")
     opts.add_argument("--window-size=1366,3000")
     opts.add_argument("--user-agent=Mozilla/5.0")
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
+    with crawl_hooks.span("driver_start"):
+        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=opts)
 
 def to_iso(dt):
     return dt.astimezone(SEOUL).isoformat(timespec="minutes") if dt else None
@@ -161,14 +164,19 @@ def crawl_cmcseoul_until_closed(output="cmcseoul_jobs.json", only_open=True):
 
     while not stop_flag:
         url = LIST_URL_TPL.format(page=page)
-        driver.get(url)
+        fetch_started = time.perf_counter()
+        with crawl_hooks.span("page_load", page=page):
+            driver.get(url)
 
         try:
             wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, LIST_UL_SEL)))
         except:
             break
 
+        fetch_sec = round(time.perf_counter() - fetch_started, 3)  # 페이지 로드 + 리스트 표시까지
+        crawl_hooks.record(lambda: driver.page_source, page=page, url=url)
         lis = driver.find_elements(By.CSS_SELECTOR, LI_SEL)
+        crawl_hooks.emit("page", page=page, items=len(lis), fetch_sec=fetch_sec)
         if not lis:
             break
 
@@ -184,7 +192,7 @@ def crawl_cmcseoul_until_closed(output="cmcseoul_jobs.json", only_open=True):
             break
 
         page += 1
-        time.sleep(0.8)
+        crawl_hooks.sleep(0.8)
 
     driver.quit()
 
@@ -194,4 +202,4 @@ def crawl_cmcseoul_until_closed(output="cmcseoul_jobs.json", only_open=True):
     print(f"저장 완료: {output} (총 {len(results)}건)")
 
 if __name__ == "__main__":
-    crawl_cmcseoul_until_closed(output="cmcseoul.json", only_open=True)
+    crawl_cmcseoul_until_closed(output=os.getenv("OUTPUT", "cmcseoul.json"), only_open=True)
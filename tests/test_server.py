@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""정적 파일 서빙(server.serve_file)이 런타임 상태·아카이브·숨김 파일을 내보내지 않는지"""
+import os, sys, tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# 상태 저장소는 임시 폴더에 (crawl_state는 불러올 때 STATE_DIR을 읽는다)
+_tmp = tempfile.mkdtemp()
+os.environ["STATE_DIR"] = os.path.join(_tmp, "state")
+os.environ["ARCHIVE_DIR"] = os.path.join(_tmp, "archive")
+
+import server  # noqa: E402
+
+client = server.app.test_client()
+
+
+def test_private_paths_are_not_served():
+    for path in ("state/crawl_state.db", "state/postings.db", "state/locks/all.lock",
+                 "archive/_state/amc.json", "releases/.lock", ".git/config", "json/../.git/config"):
+        assert server.is_private(path), path
+        assert client.get(f"/{path}").status_code == 404, path
+
+
+def test_configured_state_dir_is_private():
+    rel = os.path.relpath(os.path.join(server.crawl_state.STATE_DIR, "crawl_state.db"), server.app.root_path)
+    assert server.is_private(rel)
+
+
+def test_public_files_are_served():
+    assert not server.is_private("index.html")
+    resp = client.get("/index.html")
+    assert resp.status_code == 200
+    resp.close()
+
+
+def test_track_unpublished():
+    unpublished = set()
+    for ev in ({"event": "site_finished", "site": "amc"}, {"event": "site_finished", "site": "snubh"},
+               {"event": "site_failed", "site": "kumc"}, {"event": "published", "sites": ["amc"]}):
+        server.track_unpublished(unpublished, ev)
+    assert unpublished == {"snubh"}
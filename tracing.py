@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+크롤링 → 정규화 → 게시 파이프라인 구간(span) 트레이스.
+
+- 실행 하나에 트레이스 id 하나(TRACE_ID 환경변수). 서버가 만들어 run_all.py / normalize_jobs.py에
+  넘기고, 단독 실행이면 run_all.py가 새로 만든다. 자식 프로세스는 환경변수를 물려받는다.
+- 각 프로세스는 끝난 구간을 state/traces/<id>.jsonl 에 한 줄씩 덧붙인다.
+- export()가 이를 Chrome trace 형식(<id>.json)으로 변환 → chrome://tracing, ui.perfetto.dev 에서 열람.
+  lane(사이트 id 또는 "pipeline")마다 한 줄(tid)로 보여서, 시간이 겹치는 구간은 중첩으로 보인다.
+"""
+import os, json, time, uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+import crawl_state
+
+TRACE_DIR = os.path.join(crawl_state.STATE_DIR, "traces")
+KEEP_TRACES = 30
+PIPELINE = "pipeline"
+
+
+def new_trace_id():
+    return datetime.now().strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+
+def current_trace_id():
+    """이 실행의 트레이스 id (없으면 새로 만들고 자식 프로세스도 같은 id를 쓰게 환경변수에 넣는다)"""
+    trace_id = os.environ.get("TRACE_ID")
+    if not trace_id:
+        trace_id = os.environ["TRACE_ID"] = new_trace_id()
+    return trace_id
+
+
+def active():
+    """상위 실행(서버/run_all)이 트레이스 중인지 (단독 실행한 정규화 등은 기록하지 않는다)"""
+    return bool(os.environ.get("TRACE_ID"))
+
+
+def _path(trace_id, ext):
+    return os.path.join(TRACE_DIR, f"{trace_id}.{ext}")
+
+
+def record(name, start, dur, lane=PIPELINE, cat="pipeline", trace_id=None, **args):
+    """끝난 구간 하나 기록 (start: epoch 초, dur: 초)
+    - trace_id: 서버처럼 한 프로세스에서 여러 실행을 동시에 다룰 때 명시 (기본: TRACE_ID)"""
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    line = json.dumps({
+        "name": name, "cat": cat, "lane": lane,
+        "start": start, "dur": dur, "pid": os.getpid(), "args": args,
+    }, ensure_ascii=False)
+    # 줄 단위 append는 여러 프로세스가 같은 파일에 써도 섞이지 않는다
+    with open(_path(trace_id or current_trace_id(), "jsonl"), "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+
+@contextmanager
+def span(name, lane=PIPELINE, cat="pipeline", trace_id=None, **args):
+    start = time.time()
+    try:
+        yield args  # 구간 안에서 args에 결과(건수 등)를 추가할 수 있다
+    finally:
+        record(name, start, time.time() - start, lane=lane, cat=cat, trace_id=trace_id, **args)
+
+
+def load(trace_id):
+    spans = []
+    try:
+        with open(_path(trace_id, "jsonl"), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return spans
+
+
+def export(trace_id=None):
+    """Chrome trace JSON 파일로 변환 후 경로 반환"""
+    trace_id = trace_id or current_trace_id()
+    spans = load(trace_id)
+    lanes = [PIPELINE] + sorted({s["lane"] for s in spans} - {PIPELINE})
+    tids = {lane: i for i, lane in enumerate(lanes)}
+    events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"crawl {trace_id}"}}]
+    for lane, tid in tids.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": lane}})
+        events.append({"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": tid, "args": {"sort_index": tid}})
+    for s in spans:
+        events.append({
+            "name": s["name"], "cat": s["cat"], "ph": "X", "pid": 1, "tid": tids[s["lane"]],
+            "ts": int(s["start"] * 1e6), "dur": max(1, int(s["dur"] * 1e6)),
+            "args": {**s["args"], "os_pid": s["pid"]},
+        })
+    path = _path(trace_id, "json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+    cleanup()
+    return path
+
+
+def cleanup():
+    """오래된 트레이스는 KEEP_TRACES개만 남긴다"""
+    ids = sorted({os.path.splitext(f)[0] for f in os.listdir(TRACE_DIR) if f.endswith((".json", ".jsonl"))})
+    for old in ids[:-KEEP_TRACES]:
+        for ext in ("json", "jsonl"):
+            if os.path.exists(_path(old, ext)):
+                os.remove(_path(old, ext))
+
+
+def summary(spans, top=5):
+    """구간 이름별 횟수/합계/평균/최대 + 가장 오래 걸린 구간 표 (문자열 줄 목록)"""
+    by_name = {}
+    for s in spans:
+        by_name.setdefault(s["name"], []).append(s["dur"])
+    lines = [f"{'구간':<16}{'횟수':>6}{'합계(s)':>10}{'평균(s)':>10}{'최대(s)':>10}"]
+    for name, durs in sorted(by_name.items(), key=lambda kv: -sum(kv[1])):
+        lines.append(f"{name:<16}{len(durs):>6}{sum(durs):>10.2f}{sum(durs) / len(durs):>10.2f}{max(durs):>10.2f}")
+    # 크롤러 내부 구간(드라이버 시작, 페이지, 요청, 파싱, 대기) 중 가장 느린 것
+    slowest = sorted((s for s in spans if s["cat"] == "crawler"), key=lambda s: -s["dur"])[:top]
+    if slowest:
+        lines.append("")
+        lines.append("느린 구간 TOP")
+        for s in slowest:
+            extra = f" page={s['args']['page']}" if "page" in s["args"] else ""
+            lines.append(f"  {s['dur']:>8.2f}s  {s['lane']} / {s['name']}{extra}")
+    return lines